@@ -11,20 +11,36 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, List, Any, Optional
+import re
+import time
+from typing import AsyncIterator, Dict, FrozenSet, List, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
-from datetime import datetime
 
-# OpenAI
-try:
-    from openai import AsyncOpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from .tracing import current_span, span
+from .context_budget import ContextAssembler, messages_tokens
+from .conversation_store import ConversationStore
+from .embeddings import get_embedding_service
+from .mcp_client import ESCALATE_TOOL
+from .metrics import inc_tool_scope_escalation, inc_tool_tokens_saved
+from .model_tiers import ModelTierPolicy, TIER_LARGE, TIER_SMALL, TIER_TEMPLATE
+from .resource_cache import get_resource_cache
+from .semantic_cache import SemanticCache
+from .prompt_cache import get_prompt_cache, prompt_cache_key
+
+from .llm_pool import get_llm_pool
+from .llm_router import LLMRouter
 
 logger = logging.getLogger(__name__)
 
+# Resposta sem tool_calls dizendo que não consegue agir: com subconjunto de ferramentas, refaz com todas
+_UNABLE_PATTERN = re.compile(
+    r"\bn[ãa]o (tenho|possuo) (acesso|como|permiss[ãa]o|ferramenta)"
+    r"|\bn[ãa]o (consigo|posso) (acessar|executar|abrir|ler|criar|apagar|enviar|pesquisar|buscar|verificar|consultar)"
+    r"|\bI (can't|cannot|don't have access)",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class AIResponse:
@@ -35,6 +51,8 @@ class AIResponse:
     model: str = ""
     success: bool = True
     error: str = ""
+    tool_cycles: int = 0  # ciclos de ferramentas executados (respostas com ferramentas não vão pro cache)
+    cached: bool = False
 
 
 class JarvisAI:
@@ -45,6 +63,9 @@ class JarvisAI:
     selecionar e executar ferramentas automaticamente.
     """
     
+    # Máximo de ciclos de tool calls por mensagem
+    MAX_TOOL_CYCLES = 5
+    
     def __init__(self, mcp_client=None):
         """
         Inicializa o motor de IA
@@ -57,18 +78,45 @@ class JarvisAI:
         self.max_tokens = int(os.getenv('OPENAI_MAX_TOKENS', '2000'))
         self.temperature = float(os.getenv('OPENAI_TEMPERATURE', '0.7'))
         
-        # Histórico de conversas
-        self.conversation_history: List[Dict] = []
-        self.max_history = 20
+        # Histórico de conversas por usuário/JID (LRU entre usuários, AI_HISTORY_*)
+        self.conversations = ConversationStore.from_env()
+        self.max_history = self.conversations.max_turns
+        # Orçamento de tokens do contexto (CONTEXT_TOKEN_BUDGET)
+        self.context_assembler = ContextAssembler()
+        self.last_context_tokens = 0
         
-        # Inicializa cliente OpenAI
-        self.client = None
-        if OPENAI_AVAILABLE:
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                self.client = AsyncOpenAI(api_key=api_key)
-            else:
-                logger.warning("⚠️ OPENAI_API_KEY não configurada")
+        # Cliente OpenAI compartilhado (pool do processo: keep-alive + limites de concorrência)
+        self._llm_pool = get_llm_pool()
+        # Roteador entre provedores (LLM_ROUTES); hedge só para fontes interativas
+        self.router = LLMRouter.from_env(self.model, pool=self._llm_pool)
+        self.hedge_sources = {
+            s.strip() for s in os.getenv('LLM_HEDGE_SOURCES', 'cli,voice').split(',') if s.strip()
+        }
+        # Camadas: template / modelo pequeno (OPENAI_SMALL_MODEL, LLM_SMALL_ROUTES) / modelo padrão
+        self.tiers = ModelTierPolicy.from_env()
+        self.small_model = os.getenv('OPENAI_SMALL_MODEL', 'gpt-4o-mini').strip()
+        self.small_router = None
+        if self.small_model and (self.small_model != self.model or os.getenv('LLM_SMALL_ROUTES', '').strip()):
+            self.small_router = LLMRouter.from_env(self.small_model, pool=self._llm_pool, routes_env='LLM_SMALL_ROUTES')
+        self.client = self._llm_pool.get_client('openai')
+        if self.client is None and self.router.available():
+            self.client = self.router.client_for(self.router.targets[0])
+        if self.client is None:
+            logger.warning("⚠️ OPENAI_API_KEY não configurada")
+        
+        # Embeddings em lote com cache por conteúdo (EMBEDDING_*)
+        self.embeddings = get_embedding_service()
+        
+        # Cache semântico de respostas (perguntas repetidas não pagam outra chamada)
+        self.semantic_cache: Optional[SemanticCache] = None
+        cache_enabled = os.getenv('SEMANTIC_CACHE_ENABLED', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+        if cache_enabled and SemanticCache.available():
+            self.semantic_cache = SemanticCache(
+                embed=self.embeddings.embed,
+                threshold=float(os.getenv('CACHE_SIMILARITY_THRESHOLD', '0.92')),
+                ttl_hours=float(os.getenv('CACHE_DEFAULT_TTL', '24')),
+                min_chars=int(os.getenv('SEMANTIC_CACHE_MIN_CHARS', '12')),
+            )
     
     def set_mcp_client(self, mcp_client):
         """Define o cliente MCP"""
@@ -80,7 +128,7 @@ class JarvisAI:
         
         Args:
             message: Mensagem do usuário
-            user_id: ID do usuário
+            user_id: ID do usuário (padrão: JID do metadata ou origem); chave do histórico
             
         Returns:
             AIResponse com o resultado
@@ -93,32 +141,79 @@ class JarvisAI:
             )
         
         try:
+            started = time.perf_counter()
             source = (metadata or {}).get('source', 'cli')
+            history_key = self._history_key(user_id, metadata)
+            
+            # Cumprimentos e afins: resposta pronta, sem chamar a API
+            decision = self.tiers.decide(message, metadata)
+            if decision.tier == TIER_TEMPLATE:
+                self._update_history(history_key, message, decision.text)
+                self.tiers.record(TIER_TEMPLATE, time.perf_counter() - started)
+                return AIResponse(text=decision.text, model=TIER_TEMPLATE, success=True)
+            tier = decision.tier
+            
             # Monta mensagens
-            messages = self._build_messages(message, source=source)
+            messages = self._build_messages(
+                message, source=source, summary=(metadata or {}).get('conversation_summary'), history_key=history_key
+            )
             
-            # Pega ferramentas MCP
-            tools = []
-            if self.mcp_client:
-                tools = self.mcp_client.get_tools_for_openai()
+            # Cache semântico (escopo: origem + system prompt; follow-ups ficam de fora)
+            cache_vec = None
+            cache_scope = self._cache_scope(source, message)
+            if cache_scope:
+                cached, cache_vec = await self.semantic_cache.lookup(message, cache_scope)
+                if cached is not None:
+                    self._update_history(history_key, message, cached)
+                    return AIResponse(text=cached, model=self.model, success=True, cached=True)
+            
+            # Ferramentas MCP do escopo da intenção/origem
+            scope, scope_label = self._tool_scope(metadata, source)
+            tools = self._tools_for(scope, scope_label)
             
             # Primeira chamada à API
             logger.debug(f"🤖 Enviando para {self.model}...")
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            hedge = source in self.hedge_sources
+            response = await self._chat_completion(
                 messages=messages,
+                hedge=hedge,
+                tier=tier,
                 tools=tools if tools else None,
                 tool_choice="auto" if tools else None,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature
             )
             
+            # Subconjunto não bastou ("não tenho acesso..."): refaz com o catálogo completo
+            first = response.choices[0].message
+            if scope is not None and not first.tool_calls and _UNABLE_PATTERN.search(first.content or ''):
+                logger.info(f"🔧 Escopo {scope_label} insuficiente; refazendo com todas as ferramentas")
+                inc_tool_scope_escalation(scope_label, 'refusal')
+                scope = None
+                tools = self._tools_for(None, scope_label)
+                response = await self._chat_completion(
+                    messages=messages,
+                    hedge=hedge,
+                    tier=tier,
+                    tools=tools if tools else None,
+                    tool_choice="auto" if tools else None,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature
+                )
+            
             # Processa resposta
-            result = await self._process_response(response, messages)
+            result = await self._process_response(
+                response, messages, hedge=hedge, scope=scope, scope_label=scope_label, tier=tier
+            )
+            self.tiers.record(tier, time.perf_counter() - started, result.tokens_used)
             
             # Salva no histórico
-            self._update_history(message, result.text)
+            self._update_history(history_key, message, result.text)
+            
+            # Turnos com ferramentas dependem de dados do momento: não entram no cache
+            if cache_scope and result.success and not result.tool_cycles:
+                await self.semantic_cache.store(message, result.text, cache_scope, cache_vec)
             
             return result
             
@@ -130,39 +225,71 @@ class JarvisAI:
                 error=str(e)
             )
     
-    def _build_messages(self, message: str, source: str = 'cli') -> List[Dict]:
-        """Constrói lista de mensagens para a API"""
-        messages = []
-        
+    def _build_messages(
+        self, message: str, source: str = 'cli', summary: Optional[str] = None, history_key: str = 'default'
+    ) -> List[Dict]:
+        """
+        Constrói lista de mensagens para a API (dentro do orçamento de tokens).
+        summary = resumo da conversa; history_key = usuário/JID cujo histórico entra no prompt.
+        """
         # System prompt (WhatsApp usa prompt específico)
         system_prompt = self._get_system_prompt(source=source)
-        messages.append({
-            "role": "system",
-            "content": system_prompt
-        })
-        
-        # Histórico recente
-        for item in self.conversation_history[-self.max_history:]:
-            messages.append({"role": "user", "content": item['user']})
-            messages.append({"role": "assistant", "content": item['assistant']})
         
-        # Mensagem atual
-        messages.append({
-            "role": "user",
-            "content": message
-        })
+        # Histórico recente: pares user/assistant com tokens contados na inserção
+        history = [
+            (
+                [
+                    {"role": "user", "content": item['user']},
+                    {"role": "assistant", "content": item['assistant']}
+                ],
+                item.get('tokens') or self._history_tokens(item['user'], item['assistant'])
+            )
+            for item in self.conversations.get(history_key)
+        ]
         
-        return messages
+        context = self.context_assembler.assemble(
+            system_prompt, message, history=history, memory=summary, memory_header="=== RESUMO DA CONVERSA ==="
+        )
+        self.last_context_tokens = context.tokens
+        current = current_span()
+        if current is not None:
+            current.set(context_tokens=context.tokens, context_tokens_saved=context.tokens_saved or None)
+        return context.messages
+    
+    def _cache_scope(self, source: str, message: str) -> Optional[str]:
+        """
+        Escopo do cache semântico (origem + system prompt, compartilhado entre contatos),
+        ou None quando não deve ser usado: follow-ups ("e o segundo?") dependem da conversa.
+        """
+        if self.semantic_cache is None or SemanticCache.depends_on_conversation(message):
+            return None
+        return SemanticCache.scope_key(source, self._get_system_prompt(source=source))
+
+    @staticmethod
+    def _history_key(user_id: Optional[str], metadata: Optional[Dict]) -> str:
+        """Chave do histórico: user_id explícito, senão JID do contato, senão a origem"""
+        if user_id and user_id != 'default':
+            return user_id
+        metadata = metadata or {}
+        return metadata.get('jid') or metadata.get('source') or 'default'
+    
+    @staticmethod
+    def _history_tokens(user_message: str, assistant_message: str) -> int:
+        return messages_tokens([
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": assistant_message}
+        ])
     
     def _get_system_prompt(self, source: str = 'cli') -> str:
         """Retorna o system prompt. Para source=whatsapp usa prompt específico (UX + regras de ouro)."""
         if source == 'whatsapp':
             prompt_path = Path(__file__).resolve().parent.parent / 'config' / 'jarvis_system_prompt_whatsapp.txt'
-            if prompt_path.exists():
-                try:
-                    return prompt_path.read_text(encoding='utf-8').strip()
-                except Exception as e:
-                    logger.warning("Não foi possível carregar prompt WhatsApp: %s", e)
+            try:
+                prompt = get_resource_cache().read_text(prompt_path)
+                if prompt is not None:
+                    return prompt.strip()
+            except Exception as e:
+                logger.warning("Não foi possível carregar prompt WhatsApp: %s", e)
         if self.mcp_client:
             return self.mcp_client.get_system_prompt()
         
@@ -177,69 +304,96 @@ class JarvisAI:
 6. IMPORTANTE: Responda sempre ao conteúdo da mensagem. Se o usuário fizer pergunta, pedido (conta, informação, tarefa) ou pedir ajuda, responda de forma útil e concreta. NÃO responda apenas com um cumprimento genérico (ex: "Olá! Como posso ajudar?") a menos que a mensagem seja APENAS um cumprimento (oi, olá, bom dia). Para "me ajude com uma conta", "você só responde olá?", "oi Jarvis" etc., dê uma resposta útil ao que foi pedido.
 """
     
-    async def _process_response(self, response, messages: List[Dict]) -> AIResponse:
+    def _tool_scope(self, metadata: Optional[Dict], source: str) -> Tuple[Optional[FrozenSet[str]], str]:
+        """Escopo de ferramentas da requisição (intenção em metadata['intent'] + origem) e seu rótulo"""
+        intent = (metadata or {}).get('intent')
+        label = f"{intent or 'none'}/{source}"
+        if not self.mcp_client or not hasattr(self.mcp_client, 'tool_scope'):
+            return None, label
+        return self.mcp_client.tool_scope(intent, source), label
+
+    def _tools_for(self, scope: Optional[FrozenSet[str]], scope_label: str) -> List[Dict]:
+        """Schemas OpenAI do escopo; registra os tokens economizados frente ao catálogo completo"""
+        if not self.mcp_client:
+            return []
+        if scope is None:
+            return self.mcp_client.get_tools_for_openai()
+        tools = self.mcp_client.get_tools_for_openai(scope)
+        saved = self.mcp_client.catalog_tokens() - self.mcp_client.catalog_tokens(scope)
+        inc_tool_tokens_saved(scope_label, saved)
+        current = current_span()
+        if current is not None:
+            current.set(tool_scope=scope_label, tools=len(tools), tool_tokens_saved=saved)
+        return tools
+
+    def _router_for(self, tier: str) -> LLMRouter:
+        """Roteador da camada (modelo pequeno sem destino disponível usa o padrão)"""
+        if tier == TIER_SMALL and self.small_router is not None and self.small_router.available():
+            return self.small_router
+        return self.router
+
+    async def _chat_completion(self, messages: List[Dict], hedge: bool = False, tier: str = TIER_LARGE, **kwargs):
+        """Chamada de chat completion pelo roteador de provedores da camada (span com destino e tokens)"""
+        router = self._router_for(tier)
+        with span('ai.chat_completion', messages=len(messages), tier=tier) as s:
+            if not router.available():
+                raise RuntimeError("Nenhum provedor de IA configurado")
+            response, target = await router.chat(
+                'ai', hedge=hedge, model=self.model, messages=messages, **kwargs
+            )
+            s.set(provider=target.provider, model=target.model)
+            usage = getattr(response, 'usage', None)
+            if usage:
+                s.set(
+                    prompt_tokens=getattr(usage, 'prompt_tokens', None),
+                    completion_tokens=getattr(usage, 'completion_tokens', None),
+                    tokens=getattr(usage, 'total_tokens', None),
+                )
+            return response
+
+    async def _process_response(
+        self,
+        response,
+        messages: List[Dict],
+        hedge: bool = False,
+        scope: Optional[FrozenSet[str]] = None,
+        scope_label: str = '',
+        tier: str = TIER_LARGE,
+    ) -> AIResponse:
         """
         Processa resposta da API, executando tools se necessário
         
         Executa múltiplos ciclos de tool calls se a IA continuar chamando tools.
+        Se a IA chamar request_more_tools, os ciclos seguintes usam o catálogo completo.
         """
         message = response.choices[0].message
         total_tokens = response.usage.total_tokens if response.usage else 0
         
         # Máximo de ciclos para evitar loops infinitos
-        max_cycles = 5
+        max_cycles = self.MAX_TOOL_CYCLES
         cycle = 0
         
         while message.tool_calls and cycle < max_cycles:
             cycle += 1
             logger.info(f"🔧 Executando {len(message.tool_calls)} ferramenta(s) (ciclo {cycle})...")
             
-            # Adiciona a resposta do assistente com tool_calls
-            messages.append({
-                "role": "assistant",
-                "content": message.content or "",
-                "tool_calls": [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.function.name,
-                            "arguments": tc.function.arguments
-                        }
-                    }
-                    for tc in message.tool_calls
-                ]
-            })
-            
-            # Executa cada tool
-            for tc in message.tool_calls:
-                tool_name = tc.function.name
-                
-                try:
-                    arguments = json.loads(tc.function.arguments)
-                except:
-                    arguments = {}
-                
-                logger.info(f"  → {tool_name}({list(arguments.keys())})")
-                
-                if self.mcp_client:
-                    result = await self.mcp_client.call_tool(tool_name, arguments)
-                else:
-                    result = "Ferramentas não disponíveis"
-                
-                # Adiciona resultado
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tc.id,
-                    "content": str(result)
-                })
+            tool_calls = [
+                {"id": tc.id, "name": tc.function.name, "arguments": tc.function.arguments}
+                for tc in message.tool_calls
+            ]
+            # Adiciona a resposta do assistente com tool_calls + resultados
+            messages.append(self._assistant_tool_message(message.content, tool_calls))
+            results, scope = await self._run_tool_calls(tool_calls, scope, scope_label)
+            messages.extend(results)
             
             # Chama API novamente para IA processar resultados
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            tools = self._tools_for(scope, scope_label)
+            response = await self._chat_completion(
                 messages=messages,
-                tools=self.mcp_client.get_tools_for_openai() if self.mcp_client else None,
-                tool_choice="auto" if self.mcp_client else None,
+                hedge=hedge,
+                tier=tier,
+                tools=tools if tools else None,
+                tool_choice="auto" if tools else None,
                 max_tokens=self.max_tokens,
                 temperature=self.temperature
             )
@@ -261,29 +415,281 @@ class JarvisAI:
                 for tc in (message.tool_calls or [])
             ],
             tokens_used=total_tokens,
-            model=self.model,
-            success=True
+            model=getattr(response, 'model', None) or self.model,
+            success=True,
+            tool_cycles=cycle
         )
     
-    def _update_history(self, user_message: str, assistant_message: str):
-        """Atualiza histórico de conversa"""
-        self.conversation_history.append({
-            'user': user_message,
-            'assistant': assistant_message,
-            'timestamp': datetime.now().isoformat()
-        })
+    async def complete(
+        self,
+        messages: List[Dict],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Uma chamada direta (sem histórico nem ferramentas), para gerar textos.
+        cache_ttl (segundos) liga o cache exato: a mesma requisição não vai à API de novo nesse prazo.
+        Só vale para temperature=0; com amostragem, cachear fixaria uma única amostra.
+        """
+        if not self.client:
+            return None
+        temperature = self.temperature if temperature is None else temperature
+        max_tokens = max_tokens or self.max_tokens
+        
+        key = None
+        if cache_ttl and temperature == 0:
+            key = prompt_cache_key(self.model, messages, temperature, max_tokens=max_tokens)
+            cached = await get_prompt_cache().aget(key)
+            if cached is not None:
+                return cached
         
-        # Limita tamanho
-        if len(self.conversation_history) > self.max_history * 2:
-            self.conversation_history = self.conversation_history[-self.max_history:]
+        response = await self._chat_completion(
+            messages=messages, max_tokens=max_tokens, temperature=temperature
+        )
+        text = (response.choices[0].message.content or "").strip() or None
+        if key and text:
+            await get_prompt_cache().aset(key, text, ttl=cache_ttl)
+        return text
+
+    @staticmethod
+    def _assistant_tool_message(content: Optional[str], tool_calls: List[Dict]) -> Dict:
+        """Mensagem do assistente com tool_calls ({'id', 'name', 'arguments'}) no formato OpenAI"""
+        return {
+            "role": "assistant",
+            "content": content or "",
+            "tool_calls": [
+                {
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {"name": tc["name"], "arguments": tc["arguments"]}
+                }
+                for tc in tool_calls
+            ]
+        }
+
+    async def _run_tool_calls(
+        self, tool_calls: List[Dict], scope: Optional[FrozenSet[str]], scope_label: str
+    ) -> Tuple[List[Dict], Optional[FrozenSet[str]]]:
+        """
+        Executa as tool_calls de um ciclo. request_more_tools não vai ao MCP: libera o
+        catálogo completo (escopo None) para os próximos ciclos.
+        Retorna (mensagens role=tool na ordem das chamadas, escopo seguinte).
+        """
+        requested = [tc for tc in tool_calls if tc["name"] == ESCALATE_TOOL]
+        if not requested:
+            return await self._execute_tool_calls(tool_calls), scope
+        if scope is not None:
+            logger.info(f"🔧 IA pediu mais ferramentas (escopo {scope_label}); liberando catálogo completo")
+            inc_tool_scope_escalation(scope_label, 'requested')
+        others = [tc for tc in tool_calls if tc["name"] != ESCALATE_TOOL]
+        by_id = {r["tool_call_id"]: r for r in (await self._execute_tool_calls(others) if others else [])}
+        for tc in requested:
+            by_id[tc["id"]] = {
+                "role": "tool",
+                "tool_call_id": tc["id"],
+                "content": "Todas as ferramentas do JARVIS foram liberadas. Use a mais adequada ao pedido."
+            }
+        return [by_id[tc["id"]] for tc in tool_calls], None
+
+    async def _execute_tool_calls(self, tool_calls: List[Dict]) -> List[Dict]:
+        """Executa as ferramentas pedidas (em paralelo quando independentes) e retorna as mensagens role=tool"""
+        calls = []
+        for tc in tool_calls:
+            try:
+                arguments = json.loads(tc["arguments"] or "{}")
+            except Exception:
+                arguments = {}
+            
+            logger.info(f"  → {tc['name']}({list(arguments.keys())})")
+            calls.append((tc["id"], tc["name"], arguments))
+        
+        if not self.mcp_client:
+            return [
+                {"role": "tool", "tool_call_id": call_id, "content": "Ferramentas não disponíveis"}
+                for call_id, _, _ in calls
+            ]
+        
+        results = await self.mcp_client.execute_tool_calls(calls)
+        return [{**r, "content": str(r["content"])} for r in results]
+
+    async def stream(
+        self, message: str, user_id: str = "default", metadata: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        Versão em streaming de process(): produz deltas de texto conforme chegam.
+        Tool calls são montadas a partir dos deltas, executadas e o texto segue no ciclo seguinte.
+        O span ai.stream fica aberto até o último delta (duração real e tempo até o primeiro token).
+        """
+        started = time.perf_counter()
+        chars = 0
+        with span('ai.stream', source=(metadata or {}).get('source', 'cli')) as s:
+            async for delta in self._stream(message, user_id, metadata):
+                if not chars:
+                    s.set(first_token_ms=round((time.perf_counter() - started) * 1000, 1))
+                chars += len(delta)
+                yield delta
+            s.set(chars=chars)
+
+    async def _stream(
+        self, message: str, user_id: str = "default", metadata: Optional[Dict] = None
+    ) -> AsyncIterator[str]:
+        """Corpo de stream() (deltas de texto)"""
+        if not self.client:
+            yield "❌ OpenAI não configurada. Defina OPENAI_API_KEY no .env"
+            return
+        
+        parts: List[str] = []
+        try:
+            request_started = time.perf_counter()
+            source = (metadata or {}).get('source', 'cli')
+            history_key = self._history_key(user_id, metadata)
+            
+            decision = self.tiers.decide(message, metadata)
+            if decision.tier == TIER_TEMPLATE:
+                self._update_history(history_key, message, decision.text)
+                self.tiers.record(TIER_TEMPLATE, time.perf_counter() - request_started)
+                yield decision.text
+                return
+            tier = decision.tier
+            router = self._router_for(tier)
+            
+            messages = self._build_messages(
+                message, source=source, summary=(metadata or {}).get('conversation_summary'), history_key=history_key
+            )
+            
+            cache_vec = None
+            cache_scope = self._cache_scope(source, message)
+            if cache_scope:
+                cached, cache_vec = await self.semantic_cache.lookup(message, cache_scope)
+                if cached is not None:
+                    self._update_history(history_key, message, cached)
+                    yield cached
+                    return
+            
+            scope, scope_label = self._tool_scope(metadata, source)
+            tokens_used = 0
+            cycle = 0
+            while True:
+                tools = self._tools_for(scope, scope_label)
+                cycle_text: List[str] = []
+                tool_calls: Dict[int, Dict] = {}
+                
+                # Stream vai ao melhor destino (sem hedge: os deltas já estão saindo)
+                target = router.pick()
+                if target is None:
+                    raise RuntimeError("Nenhum provedor de IA configurado")
+                started = time.perf_counter()
+                
+                # Vaga no pool durante o stream inteiro (a conexão fica ocupada)
+                async with self._llm_pool.slot('ai'):
+                    with span('ai.chat_completion', provider=target.provider, model=target.model,
+                              messages=len(messages), stream=True, tier=tier) as s:
+                        try:
+                            stream = await router.client_for(target).chat.completions.create(
+                                model=target.model,
+                                messages=messages,
+                                tools=tools if tools else None,
+                                tool_choice="auto" if tools else None,
+                                max_tokens=self.max_tokens,
+                                temperature=self.temperature,
+                                stream=True,
+                                stream_options={"include_usage": True},
+                            )
+                            
+                            async for chunk in stream:
+                                usage = getattr(chunk, 'usage', None)
+                                if usage:
+                                    s.set(tokens=getattr(usage, 'total_tokens', None))
+                                    tokens_used += getattr(usage, 'total_tokens', None) or 0
+                                if not chunk.choices:
+                                    continue
+                                delta = chunk.choices[0].delta
+                                if delta.content:
+                                    cycle_text.append(delta.content)
+                                    parts.append(delta.content)
+                                    yield delta.content
+                                for tc in (delta.tool_calls or []):
+                                    entry = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                                    if tc.id:
+                                        entry["id"] = tc.id
+                                    if tc.function is not None:
+                                        entry["name"] += tc.function.name or ""
+                                        entry["arguments"] += tc.function.arguments or ""
+                        except Exception:
+                            router.record(target, None, ok=False)
+                            raise
+                        router.record(target, time.perf_counter() - started, ok=True)
+                
+                if not tool_calls:
+                    break
+                if cycle >= self.MAX_TOOL_CYCLES:
+                    logger.warning("⚠️ Máximo de ciclos de tools atingido")
+                    break
+                cycle += 1
+                
+                ordered = [tool_calls[i] for i in sorted(tool_calls)]
+                logger.info(f"🔧 Executando {len(ordered)} ferramenta(s) (ciclo {cycle})...")
+                messages.append(self._assistant_tool_message("".join(cycle_text), ordered))
+                results, scope = await self._run_tool_calls(ordered, scope, scope_label)
+                messages.extend(results)
+            
+            generated = bool(parts)
+            if not parts:
+                parts.append("Entendido.")
+                yield "Entendido."
+            
+            self._update_history(history_key, message, "".join(parts))
+            self.tiers.record(tier, time.perf_counter() - request_started, tokens_used)
+            if cache_scope and generated and not cycle:
+                await self.semantic_cache.store(message, "".join(parts), cache_scope, cache_vec)
+            
+        except Exception as e:
+            logger.error(f"❌ Erro AI (stream): {e}")
+            yield f"Desculpe, ocorreu um erro: {str(e)}"
+
+    def _update_history(self, history_key: str, user_message: str, assistant_message: str):
+        """Atualiza histórico de conversa do usuário/JID"""
+        self.conversations.append(
+            history_key, user_message, assistant_message,
+            tokens=self._history_tokens(user_message, assistant_message)
+        )
+    
+    def get_history(self, user_id: str = 'default') -> List[Dict]:
+        """Turnos guardados do usuário/JID"""
+        return self.conversations.get(user_id)
+    
+    def get_router_stats(self) -> Dict[str, Any]:
+        """Latência EWMA, taxa de erro e chamadas por provedor/modelo (modelo padrão e pequeno)"""
+        stats = self.small_router.stats() if self.small_router is not None else {}
+        return {**stats, **self.router.stats()}
     
-    def clear_history(self):
-        """Limpa histórico de conversas"""
-        self.conversation_history = []
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """Chamadas, latência e tokens por camada (template / small / large) e o que foi poupado"""
+        return self.tiers.stats()
+    
+    def get_embedding_stats(self) -> Dict[str, Any]:
+        """Hits do cache de embeddings, lotes enviados ao backend e vetores armazenados"""
+        return self.embeddings.stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses e taxa de acerto do cache semântico"""
+        if self.semantic_cache is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.semantic_cache.stats()}
+    
+    def clear_history(self, user_id: Optional[str] = None):
+        """Limpa histórico de conversas do usuário/JID (ou de todos)"""
+        self.conversations.clear(user_id)
+    
+    async def close(self):
+        """Espera gravações pendentes do histórico (chamar antes de encerrar)"""
+        await self.conversations.flush()
     
     async def get_embedding(self, text: str) -> List[float]:
         """
         Gera embedding para texto (útil para busca semântica)
+        Pedidos simultâneos vão em lote e textos já vistos vêm do armazenamento local.
         
         Args:
             text: Texto para gerar embedding
@@ -291,18 +697,10 @@ class JarvisAI:
         Returns:
             Lista de floats representando o embedding
         """
-        if not self.client:
-            return []
-        
-        try:
-            response = await self.client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=text
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            logger.error(f"Erro embedding: {e}")
+        vec = await self.embeddings.embed(text)
+        if vec is None:
             return []
+        return vec.tolist() if hasattr(vec, 'tolist') else list(vec)
 
 
 # === SINGLETON GLOBAL ===
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Async DB - Acesso assíncrono ao banco (SQLite ou MySQL) sem bloquear o event loop
+Memória (MemoryModule, MemoryServer) grava e lê fora do loop: pedidos do WhatsApp e
+ferramentas MCP no mesmo processo não esperam o disco.
+
+- SQLite: uma thread dedicada com a conexão (ordem das escritas preservada), WAL e
+  synchronous configuráveis (SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS), busy_timeout
+  e cache de statements preparados (SQLITE_STATEMENT_CACHE)
+- MySQL: pool pequeno de conexões (MYSQL_POOL_SIZE) com cursores preparados
+- SQL escrito com placeholders "?": convertidos para "%s" no MySQL ("?" dentro de literal fica)
+- Linhas sempre como dict (coluna -> valor), nos dois bancos
+
+Uso:
+    db = await AsyncDatabase.open(sqlite_path=Path('data/jarvis.db'))
+    await db.execute("INSERT INTO t (a) VALUES (?)", (1,))
+    rows = await db.fetchall("SELECT a FROM t WHERE a > ?", (0,))
+    db.close()
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+SQLITE_JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SQLITE_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# Literal entre aspas (grupo 1, mantido como está) ou placeholder "?"
+_PLACEHOLDER_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\?")
+
+
+class AsyncDatabase:
+    """
+    Conexão de banco servida por threads próprias
+
+    Cada execute/executemany é uma transação (commit ao final).
+    """
+
+    def __init__(self, dialect: str, executor: ThreadPoolExecutor, connect: Callable[[], Any]):
+        self.dialect = dialect
+        self._executor = executor
+        self._connect = connect
+        self._conn = None  # SQLite: conexão única, criada e usada só na thread do banco
+        self._closed = False
+
+    # ── abertura ──
+
+    @classmethod
+    async def open(cls, db_type: Optional[str] = None, sqlite_path: Optional[Path] = None) -> 'AsyncDatabase':
+        """DATABASE_TYPE (mysql | sqlite); MySQL indisponível cai para SQLite em sqlite_path"""
+        db_type = (db_type or os.getenv('DATABASE_TYPE', 'sqlite')).strip().lower()
+        if db_type == 'mysql':
+            try:
+                db = cls.mysql()
+                await db.run(lambda conn: None)  # valida a conexão
+                return db
+            except Exception as e:
+                logger.warning(f"⚠️ MySQL falhou: {e}, usando SQLite")
+        db = cls.sqlite(sqlite_path or Path(os.getenv('SQLITE_PATH', './data/jarvis.db')))
+        await db.run(lambda conn: None)
+        return db
+
+    @classmethod
+    def sqlite(cls, path: Path) -> 'AsyncDatabase':
+        import sqlite3
+
+        path = Path(path)
+        journal_mode = os.getenv('SQLITE_JOURNAL_MODE', 'WAL').strip().upper()
+        synchronous = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL').strip().upper()
+        if journal_mode not in SQLITE_JOURNAL_MODES:
+            logger.warning(f"⚠️ SQLITE_JOURNAL_MODE inválido: {journal_mode}; usando WAL")
+            journal_mode = 'WAL'
+        if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+            logger.warning(f"⚠️ SQLITE_SYNCHRONOUS inválido: {synchronous}; usando NORMAL")
+            synchronous = 'NORMAL'
+        busy_timeout = float(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')) / 1000
+        cached_statements = int(os.getenv('SQLITE_STATEMENT_CACHE', '128'))
+
+        def connect():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(path), timeout=busy_timeout, cached_statements=cached_statements)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.execute(f"PRAGMA synchronous={synchronous}")
+            logger.info(f"✅ SQLite: {path} (journal={journal_mode}, synchronous={synchronous})")
+            return conn
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-sqlite')
+        return cls('sqlite', executor, connect)
+
+    @classmethod
+    def mysql(cls) -> 'AsyncDatabase':
+        from mysql.connector import pooling
+
+        pool_size = max(1, int(os.getenv('MYSQL_POOL_SIZE', '4')))
+        pools: List[Any] = []
+        lock = threading.Lock()
+
+        def connect():
+            # Pool criado na primeira operação, já numa thread do banco
+            with lock:
+                if not pools:
+                    pools.append(pooling.MySQLConnectionPool(
+                        pool_name='jarvis',
+                        pool_size=pool_size,
+                        host=os.getenv('MYSQL_HOST', '127.0.0.1'),
+                        port=int(os.getenv('MYSQL_PORT', 3306)),
+                        user=os.getenv('MYSQL_USER', 'root'),
+                        password=os.getenv('MYSQL_PASSWORD', ''),
+                        database=os.getenv('MYSQL_DATABASE', 'jarvis_db'),
+                    ))
+                    logger.info(f"✅ MySQL conectado (pool de {pool_size})")
+            return pools[0].get_connection()
+
+        # Uma thread por conexão do pool: nunca espera conexão livre
+        executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='jarvis-mysql')
+        return cls('mysql', executor, connect)
+
+    # ── execução ──
+
+    def _sql(self, sql: str) -> str:
+        if self.dialect != 'mysql':
+            return sql
+        return _PLACEHOLDER_PATTERN.sub(lambda m: m.group(1) or '%s', sql)
+
+    def _cursor(self, conn):
+        return conn.cursor(prepared=True) if self.dialect == 'mysql' else conn.cursor()
+
+    def _call(self, fn: Callable[[Any], Any]):
+        """Roda fn(conexão) na thread do banco (SQLite: conexão fixa; MySQL: emprestada do pool)"""
+        if self.dialect == 'sqlite':
+            if self._conn is None:
+                self._conn = self._connect()
+            return fn(self._conn)
+        conn = self._connect()
+        try:
+            return fn(conn)
+        finally:
+            conn.close()  # devolve ao pool
+
+    async def run(self, fn: Callable[[Any], Any]):
+        """Executa fn(conexão) fora do event loop e devolve o resultado"""
+        if self._closed:
+            raise RuntimeError("Banco de dados fechado")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn)
+
+    @staticmethod
+    def _rows(cursor) -> List[Dict[str, Any]]:
+        columns = [c[0] for c in cursor.description or ()]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    async def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Executa um comando e faz commit; retorna linhas afetadas"""
+        sql = self._sql(sql)
+
+        def op(conn):
+            cursor = self._cursor(conn)
+            try:
+                cursor.execute(sql, tuple(params))
+                conn.commit()
+                return cursor.rowcount
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        return await self.run(op)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> int:
+        """Executa o comando para cada conjunto de parâmetros numa única transação"""
+        sql = self._sql(sql)
+        items = [tuple(p) for p in seq_of_params]
+        if not items:
+            return 0
+
+        def op(conn):
+            cursor = self._cursor(conn)
+            try:
+                cursor.executemany(sql, items)
+                conn.commit()
+                return cursor.rowcount
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
+
+        return await self.run(op)
+
+    async def executescript(self, statements: Sequence[str]):
+        """Executa vários comandos (DDL) numa transação"""
+        def op(conn):
+            cursor = conn.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+                conn.commit()
+            finally:
+                cursor.close()
+
+        await self.run(op)
+
+    async def fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Linhas da consulta como dicts"""
+        sql = self._sql(sql)
+
+        def op(conn):
+            cursor = self._cursor(conn)
+            try:
+                cursor.execute(sql, tuple(params))
+                return self._rows(cursor)
+            finally:
+                cursor.close()
+
+        return await self.run(op)
+
+    async def fetchone(self, sql: str, params: Sequence[Any] = ()) -> Optional[Dict[str, Any]]:
+        """Primeira linha da consulta (ou None)"""
+        rows = await self.fetchall(sql, params)
+        return rows[0] if rows else None
+
+    def close(self):
+        """Fecha a conexão depois das operações já enfileiradas (não bloqueia o loop)"""
+        if self._closed:
+            return
+        self._closed = True
+
+        def _close():
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        self._executor.submit(_close)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Bulkhead - Isolamento por módulo
+Limita chamadas simultâneas, fila de espera e tempo de execução de cada módulo,
+para que um módulo travado (ex.: busca DuckDuckGo) não segure todo o JARVIS.
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .exceptions import BulkheadRejectedException, BulkheadTimeoutException
+from .metrics import inc_module_rejection, inc_module_timeout
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkheadLimits:
+    """Limites de um módulo: timeout (s), chamadas simultâneas e tamanho da fila de espera."""
+    timeout: float = 20.0
+    max_in_flight: int = 4
+    max_queue: int = 16
+
+
+# Única fonte dos limites; a seção "bulkheads" do config.json só sobrescreve campos (opcional)
+DEFAULT_BULKHEAD_LIMITS: Dict[str, BulkheadLimits] = {
+    'ai': BulkheadLimits(timeout=25.0, max_in_flight=8, max_queue=32),
+    'search': BulkheadLimits(timeout=12.0, max_in_flight=4, max_queue=8),
+    'whatsapp': BulkheadLimits(timeout=15.0, max_in_flight=4, max_queue=16),
+    'tools': BulkheadLimits(timeout=20.0, max_in_flight=2, max_queue=4),
+    'calendar': BulkheadLimits(timeout=5.0, max_in_flight=4, max_queue=8),
+    'memory': BulkheadLimits(timeout=5.0, max_in_flight=4, max_queue=16),
+}
+
+
+@dataclass
+class BulkheadStats:
+    """Contadores de um bulkhead"""
+    calls: int = 0
+    rejected: int = 0
+    timeouts: int = 0
+    errors: int = 0
+
+
+class Bulkhead:
+    """
+    Compartimento de um módulo
+
+    - Até max_in_flight chamadas executando ao mesmo tempo
+    - Até max_queue chamadas aguardando vaga; além disso rejeita na hora
+    - timeout vale para espera + execução (prazo total da chamada); com side_effects=True
+      só a espera tem prazo: chamada que já começou (ex.: envio de WhatsApp) nunca é cancelada
+    """
+
+    def __init__(self, name: str, limits: BulkheadLimits):
+        self.name = name
+        self.limits = limits
+        self.stats = BulkheadStats()
+        self._semaphore = asyncio.Semaphore(max(1, limits.max_in_flight))
+        self._in_flight = 0
+        self._queued = 0
+
+    async def run(self, call: Callable[[], Awaitable[Any]], side_effects: bool = False) -> Any:
+        """
+        Executa call() dentro do bulkhead
+
+        Raises:
+            BulkheadRejectedException: fila cheia ou prazo esgotado na espera (call() não começou)
+            BulkheadTimeoutException: execução passou do prazo do bulkhead (nunca com side_effects=True).
+                TimeoutError levantado pelo próprio módulo (ex.: HTTP interno) sai como está
+        """
+        if self._in_flight + self._queued >= self.limits.max_in_flight + self.limits.max_queue:
+            self._reject('queue_full')
+
+        deadline = time.monotonic() + self.limits.timeout
+        self._queued += 1
+        try:
+            if self._semaphore.locked():
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=self.limits.timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self._reject('queue_timeout')
+        finally:
+            self._queued -= 1
+
+        self._in_flight += 1
+        self.stats.calls += 1
+        limit = None
+        try:
+            if side_effects:
+                return await call()
+            remaining = max(0.0, deadline - time.monotonic())
+            async with asyncio.timeout(remaining) as limit:
+                return await call()
+        except TimeoutError:
+            if limit is None or not limit.expired():
+                self.stats.errors += 1
+                raise
+            self.stats.timeouts += 1
+            inc_module_timeout(self.name)
+            logger.warning("⏱️ Módulo %s excedeu %.1fs", self.name, self.limits.timeout)
+            raise BulkheadTimeoutException(self.name, self.limits.timeout) from None
+        except Exception:
+            self.stats.errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def _reject(self, reason: str):
+        self.stats.rejected += 1
+        inc_module_rejection(self.name, reason)
+        logger.warning(
+            "🚧 Módulo %s rejeitou chamada (%s): %d em execução, %d na fila",
+            self.name, reason, self._in_flight, self._queued,
+        )
+        raise BulkheadRejectedException(self.name, self._in_flight, self._queued, reason)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna limites, ocupação atual e contadores"""
+        return {
+            **asdict(self.stats),
+            'in_flight': self._in_flight,
+            'queued': self._queued,
+            'limits': asdict(self.limits),
+        }
+
+
+def load_bulkhead_limits(name: str, overrides: Optional[Dict[str, Any]] = None) -> BulkheadLimits:
+    """
+    Limites do módulo: padrão do código (DEFAULT_BULKHEAD_LIMITS, ou BulkheadLimits() para módulos
+    sem entrada) com os campos que a seção "bulkheads" do config.json sobrescrever
+    (entrada do módulo > entrada "default", esta só para módulos sem padrão no código).
+    """
+    overrides = overrides or {}
+    if name in DEFAULT_BULKHEAD_LIMITS:
+        base = DEFAULT_BULKHEAD_LIMITS[name]
+    else:
+        base = BulkheadLimits()
+        overrides = {**overrides, name: {**(overrides.get('default') or {}), **(overrides.get(name) or {})}}
+    merged = {**asdict(base), **(overrides.get(name) or {})}
+    try:
+        return BulkheadLimits(
+            timeout=float(merged['timeout']),
+            max_in_flight=int(merged['max_in_flight']),
+            max_queue=int(merged['max_queue']),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning("Limites inválidos para bulkhead %s (%s); usando padrão", name, e)
+        return base
@@ -11,7 +11,6 @@ import os
 import json
 from pathlib import Path
 from typing import Any, Optional, Dict
-from dotenv import load_dotenv
 
 try:
     from pydantic import BaseModel, Field, validator
@@ -21,6 +20,7 @@ except ImportError:
 
 from .logger import get_logger
 from .exceptions import ConfigurationException
+from .resource_cache import get_resource_cache
 
 logger = get_logger(__name__)
 
@@ -95,7 +95,7 @@ class Config:
         env_path = self.base_dir / '.env'
         
         if env_path.exists():
-            load_dotenv(env_path)
+            get_resource_cache().load_dotenv(env_path)
             self._env_loaded = True
             logger.debug(f"✅ .env carregado de {env_path}")
         else:
@@ -110,9 +110,8 @@ class Config:
         
         if json_path.exists():
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    loaded_config = json.load(f)
-                    self._config.update(loaded_config)
+                loaded_config = get_resource_cache().read_json(json_path, {})
+                self._config.update(loaded_config)
                 logger.debug(f"✅ config.json carregado")
             except Exception as e:
                 logger.error(f"❌ Erro ao carregar config.json: {e}")
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Context Budget - Montagem do contexto da IA dentro de um orçamento de tokens
+Prioridade: system prompt > mensagem atual > memória > histórico (mais recente primeiro).
+Tokens de cada entrada são contados uma vez (na inserção ou memoizados por texto).
+
+Uso:
+    assembler = ContextAssembler(budget=6000)
+    ctx = assembler.assemble(system_prompt, message, history=[(msgs, tokens), ...], memory=mem)
+    ctx.messages, ctx.tokens, ctx.tokens_saved
+
+Autor: JARVIS Team
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# tiktoken é opcional: sem ele a contagem é estimada (~4 caracteres por token)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+# Overhead por mensagem do formato chat (role + separadores)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+HistoryEntry = Tuple[List[Dict], int]  # (mensagens, tokens)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding('o200k_base')
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Tokens de um texto (memoizado: o mesmo histórico não é recontado a cada turno)"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def message_tokens(message: Dict) -> int:
+    """Tokens de uma mensagem no formato chat"""
+    return count_tokens(str(message.get('content') or '')) + MESSAGE_OVERHEAD_TOKENS
+
+
+def messages_tokens(messages: Sequence[Dict]) -> int:
+    """Soma de tokens de várias mensagens"""
+    return sum(message_tokens(m) for m in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto para caber em max_tokens (mantém o começo)"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    return text[:max_tokens * 4]
+
+
+@dataclass
+class AssembledContext:
+    """Mensagens prontas para a API + contabilidade de tokens"""
+    messages: List[Dict]
+    tokens: int
+    tokens_saved: int = 0
+    history_kept: int = 0
+    history_dropped: int = 0
+    memory_truncated: bool = False
+
+
+class ContextAssembler:
+    """
+    Encaixa system prompt, memória, histórico e mensagem num orçamento de tokens
+
+    - System prompt e mensagem atual sempre entram
+    - Memória entra inteira se couber; senão truncada até memory_max_share do que sobrou
+    - Histórico entra do mais recente para o mais antigo, em blocos inteiros (pares user/assistant)
+    """
+
+    def __init__(self, budget: Optional[int] = None, memory_max_share: float = 0.5):
+        self.budget = budget or int(os.getenv('CONTEXT_TOKEN_BUDGET', '6000'))
+        self.memory_max_share = memory_max_share
+
+    def assemble(
+        self,
+        system_prompt: str,
+        message: str,
+        history: Sequence[HistoryEntry] = (),
+        memory: Optional[str] = None,
+        memory_header: str = "=== MEMÓRIA ===",
+    ) -> AssembledContext:
+        system_msg = {"role": "system", "content": system_prompt}
+        user_msg = {"role": "user", "content": message}
+        used = message_tokens(system_msg) + message_tokens(user_msg)
+        remaining = self.budget - used
+        saved = 0
+        memory_truncated = False
+
+        if memory:
+            memory_block = f"\n\n{memory_header}\n{memory}\n"
+            memory_cost = count_tokens(memory_block)
+            if memory_cost > remaining:
+                allowed = max(0, int(remaining * self.memory_max_share))
+                memory_block = truncate_to_tokens(memory_block, allowed)
+                memory_truncated = True
+                saved += memory_cost - count_tokens(memory_block)
+                memory_cost = count_tokens(memory_block)
+            if memory_block:
+                system_msg["content"] = system_prompt + memory_block
+                used += memory_cost
+                remaining -= memory_cost
+
+        kept: List[List[Dict]] = []
+        dropped = 0
+        for entry_messages, entry_tokens in reversed(list(history)):
+            if dropped or entry_tokens > remaining:
+                dropped += 1
+                saved += entry_tokens
+                continue
+            kept.append(entry_messages)
+            remaining -= entry_tokens
+            used += entry_tokens
+
+        messages = [system_msg]
+        for entry_messages in reversed(kept):
+            messages.extend(entry_messages)
+        messages.append(user_msg)
+
+        if saved:
+            logger.debug(
+                f"Contexto: {used} tokens (orçamento {self.budget}), "
+                f"{saved} economizados, {dropped} entradas de histórico fora"
+            )
+        return AssembledContext(
+            messages=messages,
+            tokens=used,
+            tokens_saved=saved,
+            history_kept=len(kept),
+            history_dropped=dropped,
+            memory_truncated=memory_truncated,
+        )
+
+
+def history_from_messages(messages: Sequence[Dict]) -> List[HistoryEntry]:
+    """Histórico em formato chat ({'role', 'content'}) -> entradas com tokens (uma por mensagem)"""
+    return [([m], message_tokens(m)) for m in messages if isinstance(m, dict) and m.get('content')]
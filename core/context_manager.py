@@ -7,6 +7,7 @@ Autor: JARVIS Team
 Versão: 3.0.0
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -16,6 +17,8 @@ from typing import Dict, List, Optional, Any
 from collections import deque, OrderedDict
 from dataclasses import dataclass, field
 
+from .llm_scheduler import PRIORITY_BACKGROUND, llm_work
+
 logger = logging.getLogger(__name__)
 
 # ── Storage path único: JARVIS_DATA_DIR (obrigatório para consistência com Node/WhatsApp) ──
@@ -110,6 +113,14 @@ class ContextManager:
         self._conversation_history_per_jid: Dict[str, List[Dict[str, str]]] = {}  # jid -> [{role, content}, ...]
         self._max_conversation_per_jid: int = 8  # últimas 8 mensagens (4 pares user/assistant)
         self._current_whatsapp_jid: Optional[str] = None  # JID da conversa atual (setado em run_jarvis_message)
+        # Resumo contínuo por JID: acima do limite, as mensagens antigas são dobradas no resumo (em segundo plano)
+        self._conversation_summary_per_jid: Dict[str, str] = {}
+        self._summary_threshold: int = max(
+            self._max_conversation_per_jid + 2, int(os.getenv('CONVERSATION_SUMMARY_THRESHOLD', '16'))
+        )
+        self._max_stored_per_jid: int = self._summary_threshold * 2  # teto se o resumo falhar
+        self._summarizer = None
+        self._summary_tasks: Dict[str, asyncio.Task] = {}
 
         # Flag: narrar ações enquanto executa (estilo Stark)
         self._explain_actions: bool = True
@@ -170,7 +181,11 @@ class ContextManager:
             # Histórico de conversa por JID (últimas N por contato)
             for jid, msgs in data.get("conversation_by_jid", {}).items():
                 if isinstance(msgs, list) and msgs:
-                    self._conversation_history_per_jid[jid] = msgs[-self._max_conversation_per_jid:]
+                    self._conversation_history_per_jid[jid] = msgs[-self._max_stored_per_jid:]
+            self._conversation_summary_per_jid = {
+                jid: text for jid, text in data.get("conversation_summary_by_jid", {}).items()
+                if isinstance(text, str) and text
+            }
             logger.info("context_state_read path=%s enabled_jids=%s", path, enabled_jids)
         except (json.JSONDecodeError, OSError) as e:
             logger.warning("Não foi possível carregar context_state path=%s: %s", path, e)
@@ -212,10 +227,13 @@ class ContextManager:
                 },
                 "conversation_by_jid": dict(
                     list({
-                        jid: list(msgs[-self._max_conversation_per_jid:])
+                        jid: list(msgs[-self._max_stored_per_jid:])
                         for jid, msgs in self._conversation_history_per_jid.items()
                     }.items())[-100:]  # mantém só os 100 JIDs mais recentes
                 ),
+                "conversation_summary_by_jid": dict(
+                    list(self._conversation_summary_per_jid.items())[-100:]
+                ),
             }
             self._persistence_file.write_text(
                 json.dumps(data, ensure_ascii=False, default=str),
@@ -242,7 +260,13 @@ class ContextManager:
             if jid:
                 self._conversation_history_per_jid.setdefault(jid, [])
                 self._conversation_history_per_jid[jid].append({'role': role, 'content': content})
-                self._conversation_history_per_jid[jid] = self._conversation_history_per_jid[jid][-self._max_conversation_per_jid:]
+                if self._summarizer is None:
+                    limit = self._max_conversation_per_jid
+                else:
+                    limit = self._max_stored_per_jid
+                    if len(self._conversation_history_per_jid[jid]) > self._summary_threshold:
+                        self._schedule_summary(jid)
+                self._conversation_history_per_jid[jid] = self._conversation_history_per_jid[jid][-limit:]
                 self._save_state()
 
         # Limpa contexto se passou muito tempo
@@ -263,6 +287,7 @@ class ContextManager:
             'active_target_name': self._active_target_name,
             'contact_jid_by_name': self._contact_jid_by_name.copy(),
             'autopilot_list': self.list_autopilot(),
+            'conversation_summary': self.get_conversation_summary(self._current_whatsapp_jid),
             'entities': self._entities.copy(),
             'session': self._session_context.copy(),
             'active_flows': list(self._active_flows.keys()),
@@ -279,13 +304,70 @@ class ContextManager:
         """
         if jid and self._conversation_history_per_jid.get(jid):
             msgs = self._conversation_history_per_jid[jid][-max_messages:]
-            return [{'role': m['role'], 'content': m['content']} for m in msgs]
+            history = [{'role': m['role'], 'content': m['content']} for m in msgs]
+            summary = self._conversation_summary_per_jid.get(jid)
+            if summary:
+                history.insert(0, {'role': 'system', 'content': f"Resumo da conversa anterior com este contato:\n{summary}"})
+            return history
         history = []
         messages = list(self.messages)[-max_messages:]
         for msg in messages:
             history.append({'role': msg.role, 'content': msg.content})
         return history
 
+    def set_summarizer(self, summarizer) -> None:
+        """Liga o resumo contínuo por JID (ConversationSummarizer; None desliga)"""
+        self._summarizer = summarizer
+
+    def get_conversation_summary(self, jid: Optional[str]) -> Optional[str]:
+        """Resumo persistido da conversa com o JID (None se ainda não houver)"""
+        return self._conversation_summary_per_jid.get(jid) if jid else None
+
+    def _schedule_summary(self, jid: str) -> None:
+        """Dobra as mensagens antigas do JID no resumo, em segundo plano (uma tarefa por JID)"""
+        running = self._summary_tasks.get(jid)
+        if running is not None and not running.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sem loop (uso síncrono): tenta na próxima mensagem
+        fold = list(self._conversation_history_per_jid[jid][:-self._max_conversation_per_jid])
+        if not fold:
+            return
+        task = loop.create_task(self._summarize_jid(jid, fold), name=f"summary_{jid[:20]}")
+        self._summary_tasks[jid] = task
+        task.add_done_callback(lambda t: self._summary_tasks.pop(jid, None) if self._summary_tasks.get(jid) is t else None)
+
+    async def _summarize_jid(self, jid: str, fold: List[Dict[str, str]]) -> None:
+        with llm_work(PRIORITY_BACKGROUND, key=jid):
+            summary = await self._summarizer.summarize(self._conversation_summary_per_jid.get(jid, ''), fold)
+        if not summary:
+            return
+        self._conversation_summary_per_jid[jid] = summary
+        # Remove do histórico o que foi dobrado (o início pode já ter caído pelo teto)
+        msgs = self._conversation_history_per_jid.get(jid, [])
+        for k in range(min(len(fold), len(msgs)), 0, -1):
+            if msgs[:k] == fold[-k:]:
+                del msgs[:k]
+                break
+        self._save_state()
+        logger.debug("Resumo da conversa atualizado (jid=%s, %s mensagens dobradas)", jid[:30], len(fold))
+
+    async def wait_summaries(self, timeout: float = 3.0) -> None:
+        """
+        Aguarda resumos em andamento (antes de fechar o pool de IA); os atrasados são cancelados.
+        Resumo cancelado não remove nada do histórico: a próxima mensagem do JID tenta de novo.
+        """
+        tasks = [t for t in self._summary_tasks.values() if not t.done()]
+        if not tasks:
+            return
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.debug("%s resumo(s) de conversa cancelado(s) no encerramento", len(pending))
+
     def set_current_whatsapp_jid(self, jid: Optional[str]) -> None:
         """Define o JID da conversa WhatsApp atual (para get_context usar histórico desse contato)."""
         self._current_whatsapp_jid = (jid or '').strip() or None
@@ -617,6 +699,7 @@ class ContextManager:
                 seen_jids.add(jid)
             result.append({
                 "contact": entry.get("display_name") or key,
+                "jid": jid,
                 "tone": entry.get("tone", "fofinho"),
                 "expires_at": expires,
             })
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Conversation Store - Histórico do JarvisAI por usuário/JID
+Cada chave (JID no WhatsApp, origem na CLI/voz) guarda só os seus últimos turnos:
+o prompt de um contato não leva a conversa dos outros.
+
+- Turnos por chave limitados (AI_HISTORY_MAX_TURNS)
+- Chaves em LRU (AI_HISTORY_MAX_USERS): o contato há mais tempo sem falar sai primeiro
+- Persistência opcional em JARVIS_DATA_DIR/ai_conversations.json (AI_HISTORY_PERSIST=1)
+- Gravação fora do event loop (thread dedicada, escritas seguidas agrupadas), atômica
+  (arquivo temporário + os.replace) e sob trava: relê o arquivo e mescla os turnos de
+  outros processos (run_jarvis_message concorrentes) antes de gravar
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from .file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+AI_CONVERSATIONS_FILENAME = 'ai_conversations.json'
+
+
+class ConversationStore:
+    """
+    Turnos user/assistant por chave, com LRU entre chaves
+
+    Turno: {'user', 'assistant', 'timestamp', 'tokens'}
+    """
+
+    def __init__(self, max_turns: int = 20, max_users: int = 500, path: Optional[Path] = None):
+        self.max_turns = max(1, max_turns)
+        self.max_users = max(1, max_users)
+        self.path = Path(path) if path else None
+        self.evicted = 0
+        self._turns: 'OrderedDict[str, Deque[Dict[str, Any]]]' = OrderedDict()
+        # Mudanças ainda não gravadas
+        self._dirty: Set[str] = set()
+        self._cleared: Set[str] = set()
+        self._cleared_all = False
+        self._io: Optional[ThreadPoolExecutor] = None
+        self._save_task: Optional[asyncio.Task] = None
+        if self.path is not None:
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> 'ConversationStore':
+        path = None
+        if os.getenv('AI_HISTORY_PERSIST', '0').strip().lower() in ('1', 'true', 'yes', 'on'):
+            data_dir = Path(os.getenv('JARVIS_DATA_DIR', '').strip() or str(_REPO_ROOT / 'data'))
+            path = data_dir.resolve() / AI_CONVERSATIONS_FILENAME
+        return cls(
+            max_turns=int(os.getenv('AI_HISTORY_MAX_TURNS', '20')),
+            max_users=int(os.getenv('AI_HISTORY_MAX_USERS', '500')),
+            path=path,
+        )
+
+    def get(self, key: str) -> List[Dict[str, Any]]:
+        """Turnos da chave, do mais antigo ao mais recente (marca a chave como usada)"""
+        turns = self._turns.get(key)
+        if turns is None:
+            return []
+        self._turns.move_to_end(key)
+        return list(turns)
+
+    def append(self, key: str, user_message: str, assistant_message: str, tokens: int = 0):
+        """Registra um turno na chave; descarta o turno mais antigo e a chave menos recente se passar dos limites"""
+        turns = self._turns.get(key)
+        if turns is None:
+            turns = deque(maxlen=self.max_turns)
+            self._turns[key] = turns
+        else:
+            self._turns.move_to_end(key)
+        turns.append({
+            'user': user_message,
+            'assistant': assistant_message,
+            'timestamp': datetime.now().isoformat(),
+            'tokens': tokens,
+        })
+        while len(self._turns) > self.max_users:
+            evicted, _ = self._turns.popitem(last=False)
+            self.evicted += 1
+            logger.debug(f"Histórico da IA descartado (LRU): {evicted}")
+        self._dirty.add(key)
+        self._schedule_save()
+
+    def clear(self, key: Optional[str] = None):
+        """Limpa o histórico da chave (ou de todas)"""
+        if key is None:
+            self._turns.clear()
+            self._dirty.clear()
+            self._cleared.clear()
+            self._cleared_all = True
+        else:
+            self._turns.pop(key, None)
+            self._dirty.discard(key)
+            self._cleared.add(key)
+        self._schedule_save()
+
+    async def flush(self):
+        """Espera a gravação pendente terminar (chamar antes de encerrar o processo)"""
+        while self._save_task is not None and not self._save_task.done():
+            await self._save_task
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def stats(self) -> Dict[str, Any]:
+        """Chaves ativas, turnos guardados e chaves descartadas por LRU"""
+        return {
+            'users': len(self._turns),
+            'turns': sum(len(t) for t in self._turns.values()),
+            'max_users': self.max_users,
+            'max_turns': self.max_turns,
+            'evicted': self.evicted,
+            'persistent': self.path is not None,
+        }
+
+    def _load(self):
+        for key, turns in list(self._read().items())[-self.max_users:]:
+            self._turns[key] = deque(turns, maxlen=self.max_turns)
+
+    def _read(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Arquivo guarda da chave menos recente para a mais recente"""
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning("Não foi possível carregar histórico da IA path=%s: %s", self.path, e)
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        result = {}
+        for key, turns in data.items():
+            if isinstance(turns, list):
+                valid = [t for t in turns if isinstance(t, dict) and 'user' in t and 'assistant' in t]
+                if valid:
+                    result[key] = valid
+        return result
+
+    def _schedule_save(self):
+        """Grava em segundo plano com loop rodando; sem loop (scripts, testes), grava na hora"""
+        if self.path is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._take_changes())
+            return
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._save_loop())
+
+    async def _save_loop(self):
+        # Turnos que chegam durante uma escrita saem juntos na próxima
+        loop = asyncio.get_running_loop()
+        if self._io is None:
+            self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-ai-history')
+        while self._dirty or self._cleared or self._cleared_all:
+            await loop.run_in_executor(self._io, self._write, self._take_changes())
+
+    def _take_changes(self) -> Dict[str, Any]:
+        changes = {
+            'turns': {k: list(self._turns[k]) for k in self._dirty if k in self._turns},
+            'cleared': set(self._cleared),
+            'cleared_all': self._cleared_all,
+        }
+        self._dirty.clear()
+        self._cleared.clear()
+        self._cleared_all = False
+        return changes
+
+    def _write(self, changes: Dict[str, Any]):
+        """Relê o arquivo sob trava, aplica as mudanças desta instância e troca o arquivo de uma vez"""
+        try:
+            with file_lock(self.path.with_suffix('.lock')):
+                data = {} if changes['cleared_all'] else self._read()
+                for key in changes['cleared']:
+                    data.pop(key, None)
+                for key, turns in changes['turns'].items():
+                    data[key] = self._merge(data.get(key, []), turns)
+                # LRU entre processos: chave com turno mais recente fica no fim
+                ordered = sorted(data.items(), key=lambda item: item[1][-1].get('timestamp', ''))
+                tmp = self.path.with_suffix('.tmp')
+                tmp.write_text(
+                    json.dumps(dict(ordered[-self.max_users:]), ensure_ascii=False),
+                    encoding='utf-8',
+                )
+                os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Não foi possível salvar histórico da IA path=%s: %s", self.path, e)
+
+    def _merge(self, on_disk: List[Dict[str, Any]], ours: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Turnos dos dois lados sem repetição, em ordem de horário, limitados a max_turns"""
+        seen = set()
+        merged = []
+        for turn in on_disk + ours:
+            ident = (turn.get('timestamp'), turn.get('user'), turn.get('assistant'))
+            if ident not in seen:
+                seen.add(ident)
+                merged.append(turn)
+        merged.sort(key=lambda t: t.get('timestamp', ''))
+        return merged[-self.max_turns:]
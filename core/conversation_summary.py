@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Conversation Summary - Resumo contínuo das conversas por JID
+Quando o histórico de um contato passa do limite, as mensagens mais antigas são dobradas
+num resumo persistido (ContextManager); o prompt leva resumo + últimas mensagens.
+
+O resumo roda em segundo plano (classe background do agendador de IA, modelo pequeno)
+e nunca bloqueia a resposta.
+
+Autor: JARVIS Team
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+from .context_budget import truncate_to_tokens
+from .llm_pool import get_llm_pool
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SYSTEM_PROMPT = (
+    "Você mantém o resumo contínuo de uma conversa de WhatsApp entre o contato e o dono do JARVIS. "
+    "Atualize o resumo anterior com as novas mensagens. Preserve fatos, combinados, datas, "
+    "pedidos pendentes, preferências e o tom da relação; descarte cumprimentos e conversa vazia. "
+    "Escreva em português, em tópicos curtos, no máximo {max_words} palavras. Responda só com o resumo."
+)
+
+
+class ConversationSummarizer:
+    """Gera o novo resumo de um contato a partir do resumo anterior + mensagens a dobrar"""
+
+    def __init__(self, model: str = 'gpt-4o-mini', max_tokens: int = 300, temperature: float = 0.2):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    @classmethod
+    def from_env(cls) -> Optional['ConversationSummarizer']:
+        """Resumidor configurado (None se desligado ou sem cliente de IA)"""
+        if os.getenv('CONVERSATION_SUMMARY_ENABLED', '1').strip().lower() in ('0', 'false', 'no', 'off'):
+            return None
+        if get_llm_pool().get_client('openai') is None:
+            return None
+        model = (
+            os.getenv('CONVERSATION_SUMMARY_MODEL', '').strip()
+            or os.getenv('OPENAI_SMALL_MODEL', '').strip()
+            or 'gpt-4o-mini'
+        )
+        return cls(model=model, max_tokens=int(os.getenv('CONVERSATION_SUMMARY_MAX_TOKENS', '300')))
+
+    @staticmethod
+    def _transcript(messages: List[Dict[str, str]]) -> str:
+        speaker = {'user': 'Contato', 'assistant': 'Eu'}
+        return "\n".join(
+            f"{speaker.get(m.get('role'), m.get('role'))}: {m.get('content', '')}"
+            for m in messages if m.get('content')
+        )
+
+    async def summarize(self, previous: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        """Resumo atualizado (None em erro: o histórico fica como está e tenta de novo depois)"""
+        if not messages:
+            return previous or None
+        prompt = (
+            f"Resumo anterior:\n{previous or '(vazio)'}\n\n"
+            f"Novas mensagens:\n{self._transcript(messages)}"
+        )
+        try:
+            response = await get_llm_pool().chat(
+                'summary',
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT.format(max_words=int(self.max_tokens * 0.6))},
+                    {"role": "user", "content": prompt},
+                ],
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Resumo da conversa falhou: {e}")
+            return None
+        text = (response.choices[0].message.content or "").strip()
+        return truncate_to_tokens(text, self.max_tokens) or None
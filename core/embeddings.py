@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Embeddings - Serviço de embeddings com lote, cache por conteúdo e armazenamento mapeado em memória
+Pedidos simultâneos viram uma única chamada (até EMBEDDING_BATCH_SIZE textos, janela de
+EMBEDDING_BATCH_WINDOW_MS); texto já visto não vai à API.
+
+- Backend: openai (EMBEDDING_MODEL) ou local (sentence-transformers, EMBEDDING_LOCAL_MODEL)
+- Vetores em data/cache/embeddings/<backend>_<modelo>.f32: registros fixos (hash 16 bytes + float32[dim])
+  abertos com np.memmap — carregar é mapear o arquivo, sem parse
+- Só acrescenta no fim do arquivo, sob trava de arquivo (<arquivo>.lock): vários processos
+  (run_jarvis_message) compartilham o mesmo cache; gravação fora do event loop
+
+Uso:
+    service = get_embedding_service()
+    vec = await service.embed("texto")              # np.ndarray float32 (None se falhar)
+    vecs = await service.embed_many(["a", "b"])
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .file_lock import file_lock
+from .llm_pool import LLMClientPool, get_llm_pool
+from .metrics import inc_cache_lookup, observe_embedding_batch
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    SentenceTransformer = None
+    HAS_SENTENCE_TRANSFORMERS = False
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "embeddings"
+DEFAULT_LOCAL_MODEL = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+
+def content_key(model: str, text: str) -> bytes:
+    """Id do vetor: hash (16 bytes) do modelo + texto"""
+    return hashlib.blake2b(f"{model}\n{text}".encode('utf-8'), digest_size=16).digest()
+
+
+class VectorStore:
+    """
+    Vetores float32 por id em arquivo de registros fixos, mapeado em memória
+
+    Dimensão fica em <arquivo>.json. Registro parcial no fim (escrita interrompida) é ignorado
+    na leitura e cortado antes da próxima gravação (senão desalinharia os registros seguintes).
+    put_many faz I/O de disco: chame fora do event loop.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta_path = self.path.with_suffix('.json')
+        self.lock_path = self.path.with_suffix('.lock')
+        self.dim: Optional[int] = None
+        self._records = None  # np.memmap estruturado (id, vec)
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0  # registros já indexados
+        self._load_meta()
+        self._remap()
+
+    def _dtype(self):
+        return np.dtype([('id', 'V16'), ('vec', '<f4', (self.dim,))])  # V16: bytes brutos (S16 cortaria \x00 final)
+
+    def _load_meta(self):
+        try:
+            self.dim = int(json.loads(self.meta_path.read_text(encoding='utf-8'))['dim'])
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, OSError) as e:
+            logger.warning("Metadados do armazenamento de embeddings inválidos path=%s: %s", self.meta_path, e)
+
+    def _remap(self):
+        """Mapeia o arquivo e indexa os registros novos (inclusive os gravados por outro processo)"""
+        if self.dim is None or not self.path.exists():
+            return
+        dtype = self._dtype()
+        rows = self.path.stat().st_size // dtype.itemsize
+        if rows <= self._rows:
+            return
+        # Registros antes do índice: get() nunca vê linha fora do mapa atual
+        self._records = np.memmap(self.path, dtype=dtype, mode='r', shape=(rows,))
+        ids = self._records['id']
+        for row in range(self._rows, rows):
+            self._index.setdefault(bytes(ids[row]), row)
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, key: bytes):
+        """Vetor do id (visão somente leitura sobre o arquivo) ou None"""
+        row = self._index.get(key)
+        if row is None:
+            return None
+        return self._records['vec'][row]
+
+    def put_many(self, items: Sequence[Tuple[bytes, Any]]):
+        """Acrescenta vetores novos ao fim do arquivo (sob trava: outros processos gravam o mesmo arquivo)"""
+        items = [(k, v) for k, v in items if k not in self._index]
+        if not items:
+            return
+        dim = len(items[0][1])
+        with file_lock(self.lock_path):
+            if self.dim is None:
+                self._load_meta()  # outro processo pode ter criado o armazenamento
+            if self.dim is None:
+                self.dim = dim
+                self.meta_path.write_text(json.dumps({'dim': dim}), encoding='utf-8')
+            if dim != self.dim:
+                logger.warning(f"⚠️ Embedding com dimensão {dim} (esperado {self.dim}); não armazenado")
+                return
+            self._remap()
+            items = [(k, v) for k, v in items if k not in self._index]
+            if not items:
+                return
+            records = np.zeros(len(items), dtype=self._dtype())
+            for i, (key, vec) in enumerate(items):
+                records[i] = (key, vec)
+            itemsize = records.dtype.itemsize
+            with open(self.path, 'ab') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % itemsize:
+                    logger.warning("Registro parcial no fim de %s descartado (%d bytes)", self.path, size % itemsize)
+                    f.truncate(size - size % itemsize)
+                f.write(records.tobytes())
+            self._remap()
+
+
+class OpenAIEmbeddingBackend:
+    """Embeddings pela API (cliente compartilhado do pool, vaga 'embeddings')"""
+
+    name = 'openai'
+
+    def __init__(self, model: str = 'text-embedding-ada-002', pool: Optional[LLMClientPool] = None):
+        self.model = model
+        self.pool = pool or get_llm_pool()
+
+    def available(self) -> bool:
+        return self.pool.get_client('openai') is not None
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        client = self.pool.get_client('openai')
+        if client is None:
+            raise RuntimeError("OPENAI_API_KEY não configurada")
+        async with self.pool.slot('embeddings'):
+            response = await client.embeddings.create(model=self.model, input=texts)
+        return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+
+class LocalEmbeddingBackend:
+    """Embeddings com sentence-transformers (modelo carregado na primeira chamada, fora do loop)"""
+
+    name = 'local'
+
+    def __init__(self, model: str = DEFAULT_LOCAL_MODEL):
+        self.model = model
+        self._model = None
+
+    @staticmethod
+    def available() -> bool:
+        return HAS_SENTENCE_TRANSFORMERS
+
+    async def embed(self, texts: List[str]):
+        loop = asyncio.get_running_loop()
+        if self._model is None:
+            logger.info(f"📥 Carregando modelo de embeddings local: {self.model}")
+            self._model = await loop.run_in_executor(None, SentenceTransformer, self.model)
+        return await loop.run_in_executor(
+            None, lambda: self._model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+        )
+
+
+class EmbeddingService:
+    """
+    Embeddings em lote com cache por conteúdo
+
+    Pedidos que chegam dentro da janela vão juntos numa chamada; texto repetido (no lote
+    ou já armazenado) não gera outra. Erro do backend é repassado a todos do lote.
+    """
+
+    def __init__(
+        self,
+        backend,
+        store: Optional[VectorStore] = None,
+        max_batch: int = 64,
+        batch_window: float = 0.005,
+    ):
+        self.backend = backend
+        self.store = store
+        self.max_batch = max(1, max_batch)
+        self.batch_window = batch_window
+        self._queue: List[Tuple[bytes, str]] = []
+        self._pending: Dict[bytes, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        # Gravações no armazenamento: uma thread, na ordem dos lotes
+        self._io: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.embedded = 0
+
+    @property
+    def model(self) -> str:
+        return f"{self.backend.name}:{self.backend.model}"
+
+    async def embed(self, text: str):
+        """Vetor do texto (np.ndarray float32; None se vazio ou em erro)"""
+        try:
+            return (await self.embed_many([text]))[0]
+        except Exception as e:
+            logger.error(f"Erro embedding: {e}")
+            return None
+
+    async def embed_many(self, texts: Sequence[str]) -> List[Any]:
+        """Vetores na ordem dos textos (None para texto vazio); levanta a exceção do backend"""
+        futures: List[Optional[asyncio.Future]] = []
+        for text in texts:
+            if not text or not text.strip():
+                futures.append(None)
+                continue
+            key = content_key(self.model, text)
+            stored = self.store.get(key) if self.store is not None else None
+            if stored is not None:
+                self._record(True)
+                future = asyncio.get_running_loop().create_future()
+                future.set_result(stored)
+            else:
+                future = self._pending.get(key)
+                if future is None:
+                    self._record(False)
+                    future = self._enqueue(key, text)
+                else:
+                    self._record(True)
+            futures.append(future)
+        waiting = [f for f in futures if f is not None]
+        if waiting:
+            # shield: futures são compartilhados; cancelar um chamador não cancela os outros
+            await asyncio.gather(*(asyncio.shield(f) for f in waiting))
+        return [f.result() if f is not None else None for f in futures]
+
+    def _record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        inc_cache_lookup('embedding', 'hit' if hit else 'miss')
+
+    def _enqueue(self, key: bytes, text: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = future
+        self._queue.append((key, text))
+        if len(self._queue) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window, self._start_flush)
+        return future
+
+    def _start_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue:
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            task = asyncio.ensure_future(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[bytes, str]]):
+        try:
+            values = await self.backend.embed([text for _, text in batch])
+            vectors = [np.asarray(v, dtype='float32').reshape(-1) for v in values] if HAS_NUMPY else list(values)
+            if len(vectors) != len(batch):
+                raise RuntimeError(f"Backend de embeddings devolveu {len(vectors)} vetores para {len(batch)} textos")
+        except Exception as e:
+            for key, _ in batch:
+                future = self._pending.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.embedded += len(batch)
+        observe_embedding_batch(self.backend.name, len(batch))
+        for (key, _), vec in zip(batch, vectors):
+            future = self._pending.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(vec)
+        if self.store is not None:
+            if self._io is None:
+                self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-embeddings')
+            items = [(key, vec) for (key, _), vec in zip(batch, vectors)]
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._io, self.store.put_many, items)
+            except Exception as e:
+                logger.warning(f"⚠️ Não foi possível armazenar embeddings: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits/misses do cache, chamadas (lotes) ao backend e vetores armazenados"""
+        total = self.hits + self.misses
+        return {
+            'model': self.model,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'batches': self.batches,
+            'avg_batch': round(self.embedded / self.batches, 1) if self.batches else 0.0,
+            'stored': len(self.store) if self.store is not None else 0,
+        }
+
+
+def _backend_from_env(pool: Optional[LLMClientPool] = None):
+    """EMBEDDING_BACKEND: openai | local | auto (openai com chave, senão local se instalado)"""
+    choice = os.getenv('EMBEDDING_BACKEND', 'auto').strip().lower()
+    openai_backend = OpenAIEmbeddingBackend(os.getenv('EMBEDDING_MODEL', 'text-embedding-ada-002').strip(), pool)
+    local_backend = LocalEmbeddingBackend(os.getenv('EMBEDDING_LOCAL_MODEL', DEFAULT_LOCAL_MODEL).strip())
+    if choice == 'local':
+        if not local_backend.available():
+            logger.warning("⚠️ EMBEDDING_BACKEND=local sem sentence-transformers: pip install sentence-transformers")
+        return local_backend
+    if choice == 'auto' and not openai_backend.available() and local_backend.available():
+        return local_backend
+    return openai_backend
+
+
+# Instância global
+_embedding_service: Optional[EmbeddingService] = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Retorna instância global do serviço de embeddings"""
+    global _embedding_service
+    if _embedding_service is None:
+        backend = _backend_from_env()
+        store = None
+        store_enabled = os.getenv('EMBEDDING_STORE', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+        if store_enabled and HAS_NUMPY:
+            slug = re.sub(r'[^\w.-]', '_', f"{backend.name}_{backend.model}")
+            store = VectorStore(DEFAULT_STORE_DIR / f"{slug}.f32")
+        _embedding_service = EmbeddingService(
+            backend,
+            store=store,
+            max_batch=int(os.getenv('EMBEDDING_BATCH_SIZE', '64')),
+            batch_window=float(os.getenv('EMBEDDING_BATCH_WINDOW_MS', '5')) / 1000,
+        )
+    return _embedding_service
@@ -52,6 +52,8 @@ class EventType(Enum):
     # Proativo
     PROACTIVE_SUGGESTION = "proactive_suggestion"
     REMINDER_TRIGGERED = "reminder_triggered"
+    PROACTIVE_DEADLINE = "proactive_deadline"  # data: {'module', 'deadline': datetime | None}
+    PROACTIVE_READY = "proactive_ready"        # data: {'module'}
 
 
 @dataclass
@@ -228,3 +228,39 @@ class CircuitBreakerOpenException(JarvisException):
         )
         self.resource = resource
         self.retry_after = retry_after
+
+
+class BulkheadRejectedException(JarvisException):
+    """Erro quando o bulkhead de um módulo está lotado (em execução + fila)"""
+    
+    def __init__(self, resource: str, in_flight: int, queued: int, reason: str = 'queue_full'):
+        message = f"Bulkhead lotado para {resource} ({in_flight} em execução, {queued} na fila)"
+        super().__init__(
+            message=message,
+            error_code='BULKHEAD_REJECTED',
+            details={
+                'resource': resource,
+                'in_flight': in_flight,
+                'queued': queued,
+                'reason': reason
+            },
+            module=resource
+        )
+        self.resource = resource
+        self.reason = reason
+
+
+class BulkheadTimeoutException(JarvisException):
+    """Erro quando a chamada passa do prazo do bulkhead do módulo (TimeoutError interno do módulo não vira este)"""
+    
+    def __init__(self, resource: str, timeout: float):
+        message = f"Bulkhead de {resource} excedeu {timeout:.1f}s"
+        super().__init__(
+            message=message,
+            error_code='BULKHEAD_TIMEOUT',
+            details={'resource': resource, 'timeout': timeout, 'reason': 'timeout'},
+            module=resource
+        )
+        self.resource = resource
+        self.timeout = timeout
+        self.reason = 'timeout'
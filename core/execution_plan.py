@@ -6,6 +6,7 @@ Evita loop de confirmação e fixa o contato alvo.
 Autor: JARVIS Team
 """
 
+import asyncio
 import uuid
 import logging
 from dataclasses import dataclass, field
@@ -30,6 +31,9 @@ class ExecutionPlan:
     tone: str = ""  # romantic | professional | informal | formal
     relationship: str = ""  # girlfriend | boyfriend | friend | colleague | etc.
     formality: str = ""  # informal | formal
+    # Rascunho especulativo (composição iniciada ao guardar o plano); não serializado
+    draft: Optional["asyncio.Task"] = field(default=None, repr=False, compare=False)
+    draft_expiry: Optional["asyncio.TimerHandle"] = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialização para incluir no contexto (dict)."""
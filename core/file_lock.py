@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+File Lock - Trava exclusiva entre processos para arquivos compartilhados
+Vários run_jarvis_message rodam ao mesmo tempo sobre o mesmo data/: quem grava
+(armazenamento de embeddings, histórico da IA) segura <arquivo>.lock durante a escrita.
+
+- fcntl.flock no Linux/macOS; msvcrt.locking no Windows
+- Chamadas bloqueiam a thread: use fora do event loop
+
+Uso:
+    with file_lock(path.with_suffix('.lock')):
+        ...
+
+Autor: JARVIS Team
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows
+    fcntl = None
+    HAS_FCNTL = False
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Trava exclusiva sobre o arquivo de trava (criado se não existir)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a+b') as f:
+        if HAS_FCNTL:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -12,6 +12,8 @@ import logging
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 
+from .tracing import span
+
 logger = logging.getLogger(__name__)
 
 
@@ -294,6 +296,13 @@ class IntentClassifier:
         Returns:
             Intent com tipo e confiança
         """
+        with span('intent.classify') as s:
+            intent = await self._classify(message, context)
+            s.set(intent=intent.type, confidence=intent.confidence)
+            return intent
+
+    async def _classify(self, message: str, context: Dict = None) -> Intent:
+        """Regras de classificação (ver classify)"""
         message = message.strip()
         context = context or {}
         
@@ -11,12 +11,19 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, AsyncIterator
 from pathlib import Path
 
 from .orchestrator import Orchestrator
+from .proactive_engine import ProactiveEngine
 from .context_manager import ContextManager
 from .config import Config
+from .tracing import span
+from .resource_cache import get_resource_cache
+from .streaming import stream_call, StreamResult
+from .llm_pool import get_llm_pool
+from .llm_scheduler import llm_work, priority_for_source
+from .conversation_summary import ConversationSummarizer
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +42,8 @@ class Jarvis:
         self.config = Config(config_path)
         self.orchestrator = Orchestrator(self.config)
         self.context = ContextManager()
+        # Resumo contínuo por JID (histórico longo do WhatsApp sem inflar o prompt)
+        self.context.set_summarizer(ConversationSummarizer.from_env())
         
         self._running = False
         self._start_time: Optional[datetime] = None
@@ -50,8 +59,12 @@ class Jarvis:
         self.wake_word = self.config.get('JARVIS_WAKE_WORD', 'jarvis')
         self.language = self.config.get('JARVIS_LANGUAGE', 'pt-BR')
         
-        # Task do loop de autonomia (cancelada explicitamente em stop())
-        self._autonomy_task: Optional[asyncio.Task] = None
+        # Motor proativo: acorda só em prazos/sinais publicados pelos módulos
+        self.proactive = ProactiveEngine(
+            self.orchestrator.modules,
+            dispatch=self._on_proactive_action,
+            check_timeout=float(self.config.get('PROACTIVE_CHECK_TIMEOUT', 5)),
+        )
         
         logger.info(f"🤖 {self.name} inicializado")
     
@@ -65,17 +78,20 @@ class Jarvis:
         self._start_time = datetime.now()
         self._running = True
         
+        # Prompts/docs/configs: com watchdog, edições invalidam o cache sem os.stat por leitura
+        if self.config.get('RESOURCE_CACHE_WATCH', False):
+            base_dir = Path(__file__).resolve().parent.parent
+            for folder in ('config', 'docs'):
+                get_resource_cache().watch(base_dir / folder)
+        
         # Inicializa o orquestrador (carrega todos os módulos)
         await self.orchestrator.start()
+        # Tarefas agendadas chegam no horário exato (sem esperar o loop de autonomia)
+        self.orchestrator.set_proactive_handler(self._on_proactive_action)
+        await self.orchestrator.flush_pending_proactive()
         
-        # Inicia loop de autonomia (ações proativas); evita duplicata se start() chamado 2x
-        existing = getattr(self, '_autonomy_task', None)
-        if existing is not None and not existing.done():
-            logger.warning("Loop de autonomia já em execução, não criando outra task")
-        else:
-            self._autonomy_task = asyncio.create_task(
-                self._autonomy_loop(), name="jarvis_autonomy_loop"
-            )
+        # Inicia motor proativo (idempotente se start() chamado 2x)
+        await self.proactive.start()
         
         logger.info(f"✅ {self.name} pronto!")
         return self
@@ -88,18 +104,17 @@ class Jarvis:
         logger.info(f"🛑 Parando {self.name}...")
         self._running = False
         
-        # Cancelar e aguardar task de autonomia com timeout para shutdown determinístico
-        task = getattr(self, '_autonomy_task', None)
-        if task is not None:
-            task.cancel()
-            try:
-                await asyncio.wait_for(asyncio.shield(task), timeout=2.0)
-            except asyncio.CancelledError:
-                pass
-            except asyncio.TimeoutError:
-                logger.warning("Timeout aguardando _autonomy_loop encerrar (2s)")
+        # Parar motor proativo com timeout para shutdown determinístico
+        try:
+            await asyncio.wait_for(self.proactive.stop(), timeout=2.0)
+        except asyncio.TimeoutError:
+            logger.warning("Timeout aguardando motor proativo encerrar (2s)")
         
         await self.orchestrator.stop()
+        # Resumos de conversa em andamento precisam do pool aberto. run_jarvis_message já emitiu
+        # a resposta: a espera não atrasa o WhatsApp, então o prazo pode cobrir um resumo inteiro
+        await self.context.wait_summaries(float(self.config.get('CONVERSATION_SUMMARY_FLUSH_TIMEOUT', 10)))
+        await get_llm_pool().close()
         
         # Diagnóstico opcional: tasks pendentes no loop (JARVIS_DIAG=1)
         if os.getenv('JARVIS_DIAG', '').strip().lower() in ('1', 'true', 'yes'):
@@ -209,7 +224,42 @@ class Jarvis:
             return "⚠️ JARVIS não está ativo. Use jarvis.start() primeiro."
         
         metadata = metadata or {}
-        
+        # Chamadas à IA desta mensagem: classe pela origem, justiça por contato
+        with llm_work(priority_for_source(source), key=metadata.get('jid') or source), \
+                span('jarvis.process', source=source, chars=len(message or '')):
+            return await self._process(message, source, metadata)
+
+    async def process_stream(
+        self, message: str, source: str = "cli", metadata: Dict = None
+    ) -> AsyncIterator[str]:
+        """
+        Como process(), mas produz a resposta em deltas conforme a IA gera.
+        Respostas que não vêm da IA (módulos, planos, comandos compostos) saem num único delta.
+        """
+        streamed = []
+        async for item in stream_call(lambda: self.process(message, source, metadata)):
+            if isinstance(item, StreamResult):
+                response = item.value
+                if response and not isinstance(response, str):
+                    response = str(response)
+                sent = "".join(streamed)
+                if not response or response == sent:
+                    return
+                if response.startswith(sent):
+                    # Pós-processamento só acrescentou texto: manda o restante
+                    yield response[len(sent):]
+                elif not sent:
+                    yield response
+                else:
+                    # Timeout após saída parcial, fallback ou texto reescrito: a resposta final vale
+                    logger.info("Resposta final difere do texto transmitido; enviando versão final")
+                    yield f"\n\n───\n{response}"
+                return
+            streamed.append(item)
+            yield item
+
+    async def _process(self, message: str, source: str, metadata: Dict) -> str:
+        """Pipeline de process() (contexto, rascunho pendente, orquestrador)"""
         # Notifica callbacks
         await self._emit('on_message', message, source, metadata)
         
@@ -323,26 +373,10 @@ class Jarvis:
         ]
         return msg in confirms
 
-    async def _autonomy_loop(self):
-        """Loop para ações proativas (sugestões, lembretes, etc)"""
-        while self._running:
-            try:
-                # Verifica a cada 60 segundos por ações proativas
-                await asyncio.sleep(60)
-                
-                if not self._running:
-                    break
-                
-                # Pede ao orquestrador para verificar ações proativas
-                proactive = await self.orchestrator.check_proactive()
-                
-                if proactive:
-                    await self._emit('on_proactive', proactive)
-                    
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Erro no loop de autonomia: {e}")
+    async def _on_proactive_action(self, action: Dict):
+        """Recebe ação proativa assim que vence (tarefas agendadas, lembretes, módulos)"""
+        if self._running:
+            await self._emit('on_proactive', action)
     
     def on(self, event: str, callback: Callable):
         """
@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+LLM Pool - Registro único de clientes de IA por provedor
+Um AsyncOpenAI por (provedor, chave, base_url) no processo inteiro: conexões HTTP
+ficam vivas entre chamadas (sem handshake TLS por requisição) e nada passa por thread.
+
+- Vagas globais (LLM_MAX_CONCURRENCY) e por chamador (LLM_MAX_CONCURRENCY_PER_CALLER) distribuídas
+  pelo LLMScheduler: prioridade interactive > autopilot > background e justiça por JID
+- Timeout e retries padrão (LLM_TIMEOUT_SECONDS, LLM_MAX_RETRIES)
+- Singleflight: chamadas idênticas simultâneas compartilham uma única requisição
+  (sem stream; temperatura até LLM_SINGLEFLIGHT_MAX_TEMPERATURE, padrão 0 = só chamadas determinísticas;
+  com tools só se LLM_SINGLEFLIGHT_TOOLS=1)
+
+Uso:
+    pool = get_llm_pool()
+    response = await pool.chat('translation', model='gpt-4o-mini', messages=[...])
+    response = await pool.create_chat('ai', client, model=..., messages=[...])  # cliente já obtido
+
+    async with pool.slot('ai'):
+        stream = await pool.get_client().chat.completions.create(..., stream=True)
+        async for chunk in stream: ...
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from .llm_scheduler import LLMScheduler
+from .prompt_cache import prompt_cache_key
+
+logger = logging.getLogger(__name__)
+
+try:
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    AsyncOpenAI = None
+    OPENAI_AVAILABLE = False
+
+
+class LLMClientPool:
+    """
+    Clientes compartilhados + limites de concorrência
+
+    Provedores são compatíveis com a API OpenAI; cada um define de quais
+    variáveis de ambiente vêm a chave e a base_url.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_caller: int = 4,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        singleflight: bool = True,
+        singleflight_max_temperature: float = 0.0,
+        singleflight_tools: bool = False,
+        aging: float = 10.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_caller = per_caller
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.singleflight = singleflight
+        self.singleflight_max_temperature = singleflight_max_temperature
+        self.singleflight_tools = singleflight_tools
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+        self._providers: Dict[str, Dict[str, Optional[str]]] = {
+            'openai': {'api_key_env': 'OPENAI_API_KEY', 'base_url_env': 'OPENAI_BASE_URL', 'base_url': None},
+        }
+        self._clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+        self.scheduler = LLMScheduler(max_concurrency, per_caller=per_caller, aging=aging)
+
+    def register_provider(
+        self,
+        name: str,
+        api_key_env: str,
+        base_url: Optional[str] = None,
+        base_url_env: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ):
+        """Registra provedor compatível com OpenAI (chave e base_url via env ou fixas)"""
+        self._providers[name] = {
+            'api_key_env': api_key_env, 'base_url_env': base_url_env, 'base_url': base_url, 'api_key': api_key,
+        }
+
+    def providers(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Provedores registrados"""
+        return dict(self._providers)
+
+    def get_client(self, provider: str = 'openai', api_key: Optional[str] = None):
+        """Cliente compartilhado do provedor (None se não houver chave ou SDK)"""
+        if not OPENAI_AVAILABLE:
+            return None
+        spec = self._providers.get(provider)
+        if spec is None:
+            raise KeyError(f"Provedor de IA não registrado: {provider}")
+        api_key = api_key or os.getenv(spec['api_key_env'] or '') or spec.get('api_key')
+        if not api_key:
+            return None
+        base_url = spec['base_url'] or (os.getenv(spec['base_url_env']) if spec['base_url_env'] else None) or None
+        key = (provider, api_key, base_url)
+        client = self._clients.get(key)
+        if client is None:
+            kwargs = {'api_key': api_key, 'timeout': self.timeout, 'max_retries': self.max_retries}
+            if base_url:
+                kwargs['base_url'] = base_url
+            client = AsyncOpenAI(**kwargs)
+            self._clients[key] = client
+            logger.debug(f"Cliente de IA criado: {provider}{f' ({base_url})' if base_url else ''}")
+        return client
+
+    @asynccontextmanager
+    async def slot(self, caller: str = 'default') -> AsyncIterator[None]:
+        """
+        Reserva uma vaga (por chamador e global) durante a chamada ou o stream.
+        A ordem de atendimento segue a classe/chave do contexto (llm_work).
+        """
+        async with self.scheduler.acquire(caller):
+            yield
+
+    @property
+    def in_flight(self) -> int:
+        return self.scheduler.running
+
+    async def chat(self, caller: str, provider: str = 'openai', api_key: Optional[str] = None, **kwargs):
+        """chat.completions.create com o cliente compartilhado e dentro dos limites"""
+        client = self.get_client(provider, api_key)
+        if client is None:
+            raise RuntimeError(f"Provedor de IA '{provider}' sem chave configurada")
+        return await self.create_chat(caller, client, **kwargs)
+
+    async def create_chat(self, caller: str, client, coalesce: bool = True, **kwargs):
+        """
+        chat.completions.create dentro dos limites do pool.
+        Requisições idênticas em andamento são coalescidas: todos recebem a mesma resposta
+        (objeto compartilhado: não mutar). coalesce=False para chamadas que podem ser
+        canceladas de propósito (hedge): o cancelamento aborta o HTTP e libera a vaga.
+        """
+        key = self._flight_key(client, kwargs) if coalesce else None
+        if key is None:
+            async with self.slot(caller):
+                return await client.chat.completions.create(**kwargs)
+
+        flight = self._inflight.get(key)
+        if flight is None:
+            async def _call():
+                async with self.slot(caller):
+                    return await client.chat.completions.create(**kwargs)
+
+            flight = asyncio.ensure_future(_call())
+            self._inflight[key] = flight
+            flight.add_done_callback(lambda f: self._land(key, f))
+        else:
+            self.coalesced += 1
+            logger.debug(f"Singleflight: chamada idêntica em andamento reaproveitada ({caller})")
+        # shield: cancelar um chamador não derruba a chamada dos outros
+        return await asyncio.shield(flight)
+
+    def _flight_key(self, client, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Hash da requisição, ou None quando ela não pode ser compartilhada"""
+        if not self.singleflight or kwargs.get('stream'):
+            return None
+        temperature = kwargs.get('temperature')
+        if (1.0 if temperature is None else temperature) > self.singleflight_max_temperature:
+            return None
+        if kwargs.get('tools') and not self.singleflight_tools:
+            return None
+        extras = {k: v for k, v in kwargs.items() if k not in ('model', 'messages', 'temperature', 'tools')}
+        digest = prompt_cache_key(
+            kwargs.get('model'), kwargs.get('messages') or [], temperature, kwargs.get('tools'), **extras
+        )
+        return f"{id(client)}:{digest}"
+
+    def _land(self, key: str, flight: asyncio.Future):
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not flight.cancelled():
+            flight.exception()  # marca como lida mesmo se todos os chamadores desistiram
+
+    def stats(self) -> Dict[str, Any]:
+        """Clientes abertos e chamadas em andamento"""
+        return {
+            'clients': len(self._clients),
+            'in_flight': self.in_flight,
+            'max_concurrency': self.max_concurrency,
+            'per_caller': self.per_caller,
+            'coalesced': self.coalesced,
+            'scheduler': self.scheduler.stats(),
+        }
+
+    async def close(self):
+        """Fecha as conexões de todos os clientes"""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.debug(f"Erro ao fechar cliente de IA: {e}")
+
+
+# Instância global
+_llm_pool: Optional[LLMClientPool] = None
+
+
+def get_llm_pool() -> LLMClientPool:
+    """Retorna instância global do pool de clientes de IA"""
+    global _llm_pool
+    if _llm_pool is None:
+        _llm_pool = LLMClientPool(
+            max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '8')),
+            per_caller=int(os.getenv('LLM_MAX_CONCURRENCY_PER_CALLER', '4')),
+            timeout=float(os.getenv('LLM_TIMEOUT_SECONDS', '60')),
+            max_retries=int(os.getenv('LLM_MAX_RETRIES', '2')),
+            singleflight=os.getenv('LLM_SINGLEFLIGHT', '1').strip().lower() not in ('0', 'false', 'no', 'off'),
+            singleflight_max_temperature=float(os.getenv('LLM_SINGLEFLIGHT_MAX_TEMPERATURE', '0')),
+            singleflight_tools=os.getenv('LLM_SINGLEFLIGHT_TOOLS', '0').strip().lower() in ('1', 'true', 'yes', 'on'),
+            aging=float(os.getenv('LLM_SCHEDULER_AGING_SECONDS', '10')),
+        )
+    return _llm_pool
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+LLM Router - Roteamento por latência entre provedores/modelos, com failover e hedge
+Cada destino (provedor + modelo) mantém EWMA de latência e de taxa de erro; a requisição
+vai para o destino saudável mais rápido. Erro -> tenta o próximo. Para fontes interativas,
+se o primeiro não respondeu em LLM_HEDGE_DELAY_MS, dispara o segundo e fica com quem chegar antes.
+
+Destinos vêm de LLM_ROUTES ("openai:gpt-4o-mini,anthropic:claude-3-5-haiku-latest"); todos
+falam a API de chat da OpenAI via pool (Anthropic pelo endpoint compatível). Em testes, passe
+ProviderTarget(client=...) com um cliente local.
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .llm_pool import LLMClientPool, get_llm_pool
+
+logger = logging.getLogger(__name__)
+
+
+def _known_provider(name: str) -> Optional[Dict[str, Any]]:
+    """Endpoints compatíveis com a API OpenAI conhecidos pelo roteador"""
+    if name == 'anthropic':
+        return {'api_key_env': 'ANTHROPIC_API_KEY', 'base_url': 'https://api.anthropic.com/v1/'}
+    if name == 'ollama':
+        host = os.getenv('OLLAMA_HOST', 'http://localhost:11434').rstrip('/')
+        # Ollama local não exige chave
+        return {'api_key_env': 'OLLAMA_API_KEY', 'base_url': f"{host}/v1", 'api_key': 'ollama'}
+    return None
+
+
+@dataclass
+class ProviderTarget:
+    """Destino de roteamento (provedor + modelo) e suas estatísticas"""
+    provider: str
+    model: str
+    client: Any = field(default=None, repr=False)  # cliente fixo (testes); senão vem do pool
+    ewma_latency: Optional[float] = None  # segundos
+    ewma_error: float = 0.0
+    calls: int = 0
+    errors: int = 0
+    hedges_won: int = 0
+    censored: int = 0  # perdedores de hedge cancelados (sem resultado)
+    cooldown_until: float = 0.0
+    last_used: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    def healthy(self, error_threshold: float, now: float) -> bool:
+        return now >= self.cooldown_until and self.ewma_error < error_threshold
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'provider': self.provider,
+            'model': self.model,
+            'latency_ms': round(self.ewma_latency * 1000, 1) if self.ewma_latency is not None else None,
+            'error_rate': round(self.ewma_error, 3),
+            'calls': self.calls,
+            'errors': self.errors,
+            'hedges_won': self.hedges_won,
+            'censored': self.censored,
+            'cooling_down': time.monotonic() < self.cooldown_until,
+        }
+
+
+class LLMRouter:
+    """
+    Escolhe o destino de cada chamada de chat
+
+    - rank(): saudáveis primeiro, por latência EWMA (sem histórico recente = explora primeiro)
+    - chat(): failover em erro; hedge opcional após hedge_delay segundos
+    - Destino com erro seguido entra em cooldown
+    """
+
+    def __init__(
+        self,
+        targets: List[ProviderTarget],
+        pool: Optional[LLMClientPool] = None,
+        alpha: float = 0.3,
+        hedge_delay: float = 0.8,
+        error_threshold: float = 0.5,
+        cooldown: float = 30.0,
+        probe_after: float = 60.0,
+    ):
+        self.targets = targets
+        self.pool = pool or get_llm_pool()
+        self.alpha = alpha
+        self.hedge_delay = hedge_delay
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        # Destino sem uso há probe_after segundos volta a ser testado (latência antiga não vale)
+        self.probe_after = probe_after
+
+    @classmethod
+    def from_env(
+        cls, default_model: str, pool: Optional[LLMClientPool] = None, routes_env: str = 'LLM_ROUTES'
+    ) -> 'LLMRouter':
+        """Destinos de routes_env (padrão: openai com o modelo padrão); ignora os sem chave"""
+        pool = pool or get_llm_pool()
+        routes = os.getenv(routes_env, '').strip() or f"openai:{default_model}"
+        targets = []
+        for route in routes.split(','):
+            provider, _, model = route.strip().partition(':')
+            if not provider:
+                continue
+            known = _known_provider(provider)
+            if provider not in pool.providers() and known:
+                pool.register_provider(provider, **known)
+            try:
+                if pool.get_client(provider) is None:
+                    logger.debug(f"Rota {route} ignorada: sem chave")
+                    continue
+            except KeyError:
+                logger.warning(f"⚠️ Provedor de IA desconhecido em {routes_env}: {provider}")
+                continue
+            targets.append(ProviderTarget(provider=provider, model=model or default_model))
+        return cls(
+            targets,
+            pool=pool,
+            hedge_delay=float(os.getenv('LLM_HEDGE_DELAY_MS', '800')) / 1000,
+            error_threshold=float(os.getenv('LLM_ROUTE_ERROR_THRESHOLD', '0.5')),
+            cooldown=float(os.getenv('LLM_ROUTE_COOLDOWN_SECONDS', '30')),
+            probe_after=float(os.getenv('LLM_ROUTE_PROBE_SECONDS', '60')),
+        )
+
+    def available(self) -> bool:
+        return bool(self.targets)
+
+    def client_for(self, target: ProviderTarget):
+        return target.client if target.client is not None else self.pool.get_client(target.provider)
+
+    def rank(self) -> List[ProviderTarget]:
+        """Destinos em ordem de preferência"""
+        now = time.monotonic()
+
+        def score(t: ProviderTarget) -> Tuple[int, float]:
+            stale = now - t.last_used > self.probe_after
+            latency = t.ewma_latency if t.ewma_latency is not None and not stale else 0.0
+            return (0 if t.healthy(self.error_threshold, now) else 1, latency * (1 + t.ewma_error))
+
+        return sorted(self.targets, key=score)
+
+    def pick(self) -> Optional[ProviderTarget]:
+        """Melhor destino agora (None se não houver)"""
+        ranked = self.rank()
+        return ranked[0] if ranked else None
+
+    def record(self, target: ProviderTarget, latency: Optional[float], ok: bool):
+        """Atualiza EWMA do destino após uma chamada"""
+        target.calls += 1
+        target.last_used = time.monotonic()
+        target.ewma_error = (1 - self.alpha) * target.ewma_error + self.alpha * (0.0 if ok else 1.0)
+        if ok and latency is not None:
+            target.ewma_latency = latency if target.ewma_latency is None else (
+                (1 - self.alpha) * target.ewma_latency + self.alpha * latency
+            )
+        if not ok:
+            target.errors += 1
+            if target.ewma_error >= self.error_threshold:
+                target.cooldown_until = time.monotonic() + self.cooldown
+                logger.warning(f"⚠️ {target.name} em cooldown ({self.cooldown:.0f}s)")
+
+    def record_censored(self, target: ProviderTarget, elapsed: float):
+        """
+        Chamada cancelada antes de responder (perdedor de hedge): não é sucesso nem erro.
+        A latência real é no mínimo elapsed, então o EWMA só pode subir.
+        """
+        target.censored += 1
+        target.last_used = time.monotonic()
+        if target.ewma_latency is None:
+            target.ewma_latency = elapsed
+        elif elapsed > target.ewma_latency:
+            target.ewma_latency = (1 - self.alpha) * target.ewma_latency + self.alpha * elapsed
+
+    async def _call(self, caller: str, target: ProviderTarget, kwargs: Dict, coalesce: bool = True):
+        start = time.perf_counter()
+        try:
+            response = await self.pool.create_chat(
+                caller, self.client_for(target), coalesce=coalesce, **{**kwargs, 'model': target.model}
+            )
+        except asyncio.CancelledError:
+            self.record_censored(target, time.perf_counter() - start)
+            raise
+        except Exception:
+            self.record(target, None, ok=False)
+            raise
+        self.record(target, time.perf_counter() - start, ok=True)
+        return response
+
+    async def chat(self, caller: str, hedge: bool = False, **kwargs) -> Tuple[Any, ProviderTarget]:
+        """
+        chat.completions.create no melhor destino. Retorna (resposta, destino usado).
+        Levanta a última exceção se todos falharem.
+        """
+        ranked = self.rank()
+        if not ranked:
+            raise RuntimeError("Nenhum provedor de IA configurado")
+        last_error: Optional[BaseException] = None
+        index = 0
+        while index < len(ranked):
+            primary = ranked[index]
+            backup = ranked[index + 1] if hedge and self.hedge_delay > 0 and index + 1 < len(ranked) else None
+            try:
+                if backup is None:
+                    return await self._call(caller, primary, kwargs), primary
+                return await self._hedged(caller, primary, backup, kwargs)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"⚠️ {primary.name} falhou ({type(e).__name__}); tentando próximo provedor")
+                index += 2 if backup is not None else 1
+        raise last_error
+
+    async def _hedged(self, caller: str, primary: ProviderTarget, backup: ProviderTarget, kwargs: Dict):
+        """
+        Dispara backup se o primário passar de hedge_delay; fica com a primeira resposta boa.
+        Tentativas fora do singleflight: cancelar o perdedor aborta a requisição de verdade.
+        """
+        tasks = {asyncio.ensure_future(self._call(caller, primary, kwargs, coalesce=False)): primary}
+        done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+        hedged = not done
+        if hedged:
+            logger.debug(f"Hedge: {primary.name} lento, disparando {backup.name}")
+            tasks[asyncio.ensure_future(self._call(caller, backup, kwargs, coalesce=False))] = backup
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        target = tasks[task]
+                        if target is backup and hedged:
+                            backup.hedges_won += 1
+                        return task.result(), target
+                    error = task.exception()
+                    if tasks[task] is primary and backup not in tasks.values():
+                        # Primário falhou antes do hedge: backup vira failover imediato
+                        tasks[asyncio.ensure_future(self._call(caller, backup, kwargs, coalesce=False))] = backup
+                        pending = {t for t in tasks if not t.done()}
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas por destino, na ordem de preferência atual"""
+        return {t.name: t.to_dict() for t in self.rank()}
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+LLM Scheduler - Fila global de chamadas à IA com prioridade e justiça por contato
+Fica sob o pool de clientes (LLMClientPool.slot): JarvisAI, AIModule, tradução e voz
+disputam as mesmas vagas (LLM_MAX_CONCURRENCY).
+
+- Classes: interactive (CLI/voz) > autopilot (WhatsApp) > background (resumos, trabalho especulativo)
+- Dentro da classe: round-robin por chave (JID), um contato falante não segura os outros
+- Limite por chamador (LLM_MAX_CONCURRENCY_PER_CALLER) respeitado na própria fila
+- Envelhecimento: quem espera mais que LLM_SCHEDULER_AGING_SECONDS é atendido antes (sem inanição)
+
+A classe e a chave viajam por contextvar, definidas na entrada da requisição:
+    with llm_work(priority_for_source(source), key=jid):
+        await jarvis._process(...)
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional, Tuple
+
+from .metrics import observe_llm_queue_wait
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_AUTOPILOT = 'autopilot'
+PRIORITY_BACKGROUND = 'background'
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_AUTOPILOT, PRIORITY_BACKGROUND)
+
+# Origem da requisição -> classe (desconhecidas contam como interativas)
+SOURCE_PRIORITIES = {
+    'cli': PRIORITY_INTERACTIVE,
+    'voice': PRIORITY_INTERACTIVE,
+    'whatsapp': PRIORITY_AUTOPILOT,
+}
+
+_llm_work: ContextVar[Tuple[str, str]] = ContextVar(
+    'jarvis_llm_work', default=(PRIORITY_INTERACTIVE, 'default')
+)
+
+
+def priority_for_source(source: Optional[str]) -> str:
+    """Classe de prioridade da origem (cli, voice, whatsapp...)"""
+    return SOURCE_PRIORITIES.get(source or '', PRIORITY_INTERACTIVE)
+
+
+def current_llm_work() -> Tuple[str, str]:
+    """(classe, chave) das chamadas à IA feitas neste contexto"""
+    return _llm_work.get()
+
+
+@contextmanager
+def llm_work(priority: str, key: Optional[str] = None) -> Iterator[None]:
+    """Marca as chamadas à IA deste contexto (e das tasks criadas nele) com classe e chave de justiça"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Classe de prioridade desconhecida: {priority}")
+    token = _llm_work.set((priority, key or priority))
+    try:
+        yield
+    finally:
+        _llm_work.reset(token)
+
+
+@dataclass
+class _Waiter:
+    caller: str
+    priority: str
+    key: str
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class _ClassStats:
+    def __init__(self):
+        self.granted = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class LLMScheduler:
+    """
+    Vagas de chamada à IA distribuídas por prioridade, justiça por chave e limite por chamador
+
+    Uso:
+        async with scheduler.acquire('ai'):
+            await client.chat.completions.create(...)
+    """
+
+    def __init__(self, max_concurrency: int = 8, per_caller: int = 4, aging: float = 10.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_caller = max(1, per_caller)
+        self.aging = aging
+        self.running = 0
+        self._running_by_caller: Dict[str, int] = {}
+        # classe -> chave -> fila FIFO (a ordem das chaves é o round-robin)
+        self._queues: Dict[str, 'OrderedDict[str, Deque[_Waiter]]'] = {p: OrderedDict() for p in PRIORITIES}
+        self._stats: Dict[str, _ClassStats] = {p: _ClassStats() for p in PRIORITIES}
+
+    def queued(self) -> int:
+        return sum(len(q) for queues in self._queues.values() for q in queues.values())
+
+    @asynccontextmanager
+    async def acquire(
+        self, caller: str = 'default', priority: Optional[str] = None, key: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Espera a vez (classe/chave do contexto se não informadas) e segura a vaga no bloco"""
+        if priority is None or key is None:
+            ctx_priority, ctx_key = current_llm_work()
+            priority = priority or ctx_priority
+            key = key or ctx_key
+        if priority not in self._queues:
+            priority = PRIORITY_INTERACTIVE
+        await self._wait_turn(caller, priority, key)
+        try:
+            yield
+        finally:
+            self._release(caller)
+
+    async def _wait_turn(self, caller: str, priority: str, key: str):
+        if not self.queued() and self._has_capacity(caller):
+            self._grant(caller, priority, 0.0)
+            return
+        waiter = _Waiter(caller, priority, key, asyncio.get_running_loop().create_future())
+        self._queues[priority].setdefault(key, deque()).append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Vaga concedida no mesmo instante do cancelamento: devolve
+                self._release(caller)
+            else:
+                self._remove(waiter)
+            raise
+
+    def _has_capacity(self, caller: str) -> bool:
+        return self.running < self.max_concurrency and self._running_by_caller.get(caller, 0) < self.per_caller
+
+    def _grant(self, caller: str, priority: str, waited: float):
+        self.running += 1
+        self._running_by_caller[caller] = self._running_by_caller.get(caller, 0) + 1
+        stats = self._stats[priority]
+        stats.granted += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        observe_llm_queue_wait(priority, waited)
+
+    def _release(self, caller: str):
+        self.running -= 1
+        remaining = self._running_by_caller.get(caller, 1) - 1
+        if remaining > 0:
+            self._running_by_caller[caller] = remaining
+        else:
+            self._running_by_caller.pop(caller, None)
+        self._dispatch()
+
+    def _remove(self, waiter: _Waiter):
+        queues = self._queues[waiter.priority]
+        queue = queues.get(waiter.key)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del queues[waiter.key]
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Próximo a atender: envelhecido mais antigo, senão maior classe em round-robin por chave"""
+        now = time.monotonic()
+        eligible = [
+            (priority, key, queue[0])
+            for priority in PRIORITIES
+            for key, queue in self._queues[priority].items()
+            if self._running_by_caller.get(queue[0].caller, 0) < self.per_caller
+        ]
+        if not eligible:
+            return None
+        aged = [e for e in eligible if now - e[2].enqueued >= self.aging]
+        if aged:
+            priority, key, _ = min(aged, key=lambda e: e[2].enqueued)
+        else:
+            priority, key, _ = eligible[0]
+        queues = self._queues[priority]
+        queue = queues[key]
+        waiter = queue.popleft()
+        del queues[key]
+        if queue:
+            queues[key] = queue  # volta para o fim da roda
+        return waiter
+
+    def _dispatch(self):
+        while self.running < self.max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                continue
+            self._grant(waiter.caller, waiter.priority, time.monotonic() - waiter.enqueued)
+            waiter.future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Vagas em uso e, por classe, fila atual e espera média/máxima (ms)"""
+        classes = {}
+        for priority in PRIORITIES:
+            stats = self._stats[priority]
+            classes[priority] = {
+                'queued': sum(len(q) for q in self._queues[priority].values()),
+                'granted': stats.granted,
+                'avg_wait_ms': round(stats.wait_total / stats.granted * 1000, 1) if stats.granted else 0.0,
+                'max_wait_ms': round(stats.wait_max * 1000, 1),
+            }
+        return {'running': self.running, 'max_concurrency': self.max_concurrency, 'classes': classes}
@@ -8,14 +8,66 @@ Versão: 3.0.0
 """
 
 import asyncio
+import contextvars
+import functools
 import json
 import logging
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, List, Any, Optional, Tuple
 from pathlib import Path
 
+from .tracing import span
+from .context_budget import count_tokens
+from .resource_cache import get_resource_cache
+
 logger = logging.getLogger(__name__)
 
+# Ferramentas enviadas por intenção/origem (nomes de servers ou de ferramentas).
+# Chave ausente = catálogo completo; lista vazia = nenhuma ferramenta.
+# Com intenção e origem definidas, vale a interseção (ex.: search pelo WhatsApp = só search).
+DEFAULT_TOOL_SCOPES: Dict[str, List[str]] = {
+    'intent:greeting': [],
+    'intent:thanks': [],
+    'intent:farewell': [],
+    'intent:search': ['search'],
+    'intent:weather': ['search'],
+    'intent:news': ['search'],
+    'intent:wiki': ['search'],
+    'intent:file_operation': ['tools'],
+    'intent:system_command': ['tools'],
+    'intent:system_info': ['tools'],
+    'intent:app_control': ['tools'],
+    'intent:whatsapp_send': ['whatsapp', 'jarvis_actions', 'memory'],
+    'intent:whatsapp_reply': ['whatsapp', 'jarvis_actions', 'memory'],
+    'intent:whatsapp_check': ['whatsapp', 'jarvis_actions', 'memory'],
+    'intent:whatsapp_read': ['whatsapp', 'jarvis_actions', 'memory'],
+    # Autopilot/WhatsApp: sem arquivos, comandos e processos da máquina
+    'source:whatsapp': ['memory', 'search', 'whatsapp', 'jarvis_actions'],
+}
+
+# Ferramenta sentinela dos subconjuntos: a IA pede o catálogo completo quando o que tem não basta
+ESCALATE_TOOL = 'request_more_tools'
+ESCALATE_TOOL_SCHEMA = {
+    "type": "function",
+    "function": {
+        "name": ESCALATE_TOOL,
+        "description": "Use somente se nenhuma das ferramentas disponíveis servir para o pedido; "
+                       "libera todas as ferramentas do JARVIS.",
+        "parameters": {"type": "object", "properties": {}, "required": []}
+    }
+}
+
+
+def parse_tool_scopes(spec: str) -> Dict[str, List[str]]:
+    """'intent:search=search;source:whatsapp=memory,search' -> {'intent:search': ['search'], ...}"""
+    scopes = {}
+    for entry in (spec or '').split(';'):
+        key, sep, names = entry.partition('=')
+        if not sep or not key.strip():
+            continue
+        scopes[key.strip()] = [n.strip() for n in names.split(',') if n.strip()]
+    return scopes
+
 
 class JarvisMCPClient:
     """
@@ -31,11 +83,27 @@ class JarvisMCPClient:
         self.servers = {}
         self.all_tools = {}
         self._running = False
+        # Execução de tool_calls de um mesmo turno
+        self.max_parallel_tools = int(os.getenv('MCP_MAX_PARALLEL_TOOLS', '4'))
+        self.tool_timeout = float(os.getenv('MCP_TOOL_TIMEOUT', '30'))
+        # Ferramentas com side_effects que passaram do timeout e seguem rodando
+        self._detached_calls: set = set()
+        # Catálogo de schemas por provedor (montado quando servers/ferramentas mudam)
+        self._tool_catalog: Dict[str, List[Dict]] = {}
+        self._scoped_catalog: Dict[Tuple[str, FrozenSet[str]], List[Dict]] = {}
+        self._catalog_tokens: Dict[Tuple[str, Optional[FrozenSet[str]]], int] = {}
+        self.tools_version = 0
+        # Subconjuntos por intenção/origem (config 'tool_scopes' e TOOL_SCOPES sobrescrevem os padrões)
+        self.tool_scoping = os.getenv('TOOL_SCOPING', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+        self.tool_scopes: Dict[str, List[str]] = {
+            **DEFAULT_TOOL_SCOPES,
+            **self.config.get('tool_scopes', {}),
+            **parse_tool_scopes(os.getenv('TOOL_SCOPES', '')),
+        }
 
         # Carrega .env
         try:
-            from dotenv import load_dotenv
-            load_dotenv(Path(__file__).parent.parent / '.env')
+            get_resource_cache().load_dotenv(Path(__file__).parent.parent / '.env')
         except Exception:
             pass
 
@@ -84,6 +152,7 @@ class JarvisMCPClient:
                     'handler': server.handlers[tool_name]
                 }
 
+            self.invalidate_tool_catalog()
             logger.info(f"  ✅ {name}: {len(server.tools)} ferramentas")
 
         except Exception as e:
@@ -94,57 +163,115 @@ class JarvisMCPClient:
         for name, server in self.servers.items():
             server.stop()
         self._running = False
+        self.invalidate_tool_catalog()
     
     def _tool_names_to_hide_when_jarvis(self) -> set:
         """Quando jarvis está presente, envio/resposta WhatsApp passam pelo Orchestrator (whatsapp_send)."""
         return {'send_whatsapp', 'reply_whatsapp'}
 
-    def get_tools_for_openai(self) -> List[Dict]:
-        """
-        Retorna ferramentas no formato OpenAI Function Calling.
-        Com jarvis injetado, esconde send_whatsapp/reply_whatsapp para usar apenas whatsapp_send (Orchestrator).
-        """
-        tools = []
+    def invalidate_tool_catalog(self):
+        """Descarta os schemas montados (chamar quando servers ou ferramentas mudarem)"""
+        self._tool_catalog = {}
+        self._scoped_catalog = {}
+        self._catalog_tokens = {}
+        self.tools_version += 1
+
+    def _build_tool_catalog(self) -> Dict[str, List[Dict]]:
+        """Monta os schemas OpenAI e Anthropic uma vez por versão do catálogo"""
+        openai_tools, anthropic_tools = [], []
         hide = self._tool_names_to_hide_when_jarvis() if self.jarvis else set()
         for tool_name, info in self.all_tools.items():
             if tool_name in hide:
                 continue
             tool = info['tool']
-            tools.append({
+            schema = {
+                "type": "object",
+                "properties": tool.parameters,
+                "required": tool.required
+            }
+            openai_tools.append({
                 "type": "function",
                 "function": {
                     "name": tool_name,
                     "description": tool.description,
-                    "parameters": {
-                        "type": "object",
-                        "properties": tool.parameters,
-                        "required": tool.required
-                    }
+                    "parameters": schema
                 }
             })
-        return tools
+            anthropic_tools.append({
+                "name": tool_name,
+                "description": tool.description,
+                "input_schema": schema
+            })
+        self._tool_catalog = {'openai': openai_tools, 'anthropic': anthropic_tools}
+        logger.debug(f"Catálogo de ferramentas v{self.tools_version}: {len(openai_tools)} schemas")
+        return self._tool_catalog
+
+    def _get_catalog(self, provider: str, scope: Optional[FrozenSet[str]] = None) -> List[Dict]:
+        catalog = self._tool_catalog or self._build_tool_catalog()
+        if scope is None:
+            return catalog[provider]
+        key = (provider, scope)
+        scoped = self._scoped_catalog.get(key)
+        if scoped is None:
+            name_of = (lambda t: t['function']['name']) if provider == 'openai' else (lambda t: t['name'])
+            scoped = [t for t in catalog[provider] if name_of(t) in scope]
+            self._scoped_catalog[key] = scoped
+        return scoped
+
+    def tool_scope(self, intent: Optional[str] = None, source: Optional[str] = None) -> Optional[FrozenSet[str]]:
+        """
+        Ferramentas liberadas para a requisição (None = catálogo completo).
+        Intenção e origem configuradas ao mesmo tempo: interseção das duas listas.
+        """
+        if not self.tool_scoping:
+            return None
+        scopes = [
+            self.tool_scopes[key]
+            for key in (f"intent:{intent}", f"source:{source}")
+            if key in self.tool_scopes
+        ]
+        if not scopes:
+            return None
+        allowed = [
+            {name for name, info in self.all_tools.items() if name in scope or info['server'] in scope}
+            for scope in scopes
+        ]
+        return frozenset(set.intersection(*allowed))
+
+    def catalog_tokens(self, scope: Optional[FrozenSet[str]] = None) -> int:
+        """Tokens dos schemas OpenAI enviados com esse escopo (medido uma vez por versão)"""
+        key = ('openai', scope)
+        tokens = self._catalog_tokens.get(key)
+        if tokens is None:
+            tools = self.get_tools_for_openai(scope)
+            tokens = count_tokens(json.dumps(tools, ensure_ascii=False)) if tools else 0
+            self._catalog_tokens[key] = tokens
+        return tokens
+
+    def get_tools_for_openai(self, scope: Optional[FrozenSet[str]] = None) -> List[Dict]:
+        """
+        Retorna ferramentas no formato OpenAI Function Calling.
+        Com jarvis injetado, esconde send_whatsapp/reply_whatsapp para usar apenas whatsapp_send (Orchestrator).
+        scope (de tool_scope()) restringe às ferramentas listadas; todo subconjunto leva a
+        ferramenta request_more_tools para a IA pedir o catálogo completo.
+        A lista é compartilhada entre chamadas (mesmos bytes a cada turno): não mutar.
+        """
+        tools = self._get_catalog('openai', scope)
+        if scope is None or not self._get_catalog('openai'):
+            return tools
+        key = ('openai+escalate', scope)
+        with_escalate = self._scoped_catalog.get(key)
+        if with_escalate is None:
+            with_escalate = self._scoped_catalog[key] = tools + [ESCALATE_TOOL_SCHEMA]
+        return with_escalate
     
-    def get_tools_for_anthropic(self) -> List[Dict]:
+    def get_tools_for_anthropic(self, scope: Optional[FrozenSet[str]] = None) -> List[Dict]:
         """
         Retorna ferramentas no formato Anthropic Claude.
         Com jarvis injetado, esconde send_whatsapp/reply_whatsapp.
+        A lista é compartilhada entre chamadas: não mutar.
         """
-        tools = []
-        hide = self._tool_names_to_hide_when_jarvis() if self.jarvis else set()
-        for tool_name, info in self.all_tools.items():
-            if tool_name in hide:
-                continue
-            tool = info['tool']
-            tools.append({
-                "name": tool_name,
-                "description": tool.description,
-                "input_schema": {
-                    "type": "object",
-                    "properties": tool.parameters,
-                    "required": tool.required
-                }
-            })
-        return tools
+        return self._get_catalog('anthropic', scope)
     
     async def call_tool(self, tool_name: str, arguments: Dict) -> str:
         """
@@ -163,18 +290,97 @@ class JarvisMCPClient:
         info = self.all_tools[tool_name]
         handler = info['handler']
         
-        try:
-            if asyncio.iscoroutinefunction(handler):
-                result = await handler(**arguments)
+        with span('mcp.call_tool', tool=tool_name) as s:
+            try:
+                if asyncio.iscoroutinefunction(handler):
+                    result = await handler(**arguments)
+                else:
+                    # Handler síncrono roda numa thread (com o contexto do span): não trava o loop
+                    call = functools.partial(contextvars.copy_context().run, handler, **arguments)
+                    result = await asyncio.get_running_loop().run_in_executor(None, call)
+                
+                logger.debug(f"🔧 {tool_name}: OK")
+                return str(result)
+                
+            except Exception as e:
+                logger.error(f"🔧 {tool_name}: {e}")
+                s.set(ok=False)
+                return f"❌ Erro ao executar {tool_name}: {str(e)}"
+    
+    async def execute_tool_calls(self, calls: List[Tuple[str, str, Dict]]) -> List[Dict]:
+        """
+        Executa as chamadas de um turno: [(tool_call_id, nome, argumentos), ...]
+        
+        - Independentes rodam em paralelo (até max_parallel_tools)
+        - Ferramentas com side_effects rodam uma por vez, na ordem pedida
+        - Cada chamada tem timeout (Tool.timeout ou tool_timeout); ferramentas com side_effects
+          não são canceladas no timeout: seguem rodando e a IA recebe "resultado desconhecido,
+          não repita" (evita mensagem enviada duas vezes)
+        
+        Returns:
+            Mensagens role=tool na mesma ordem das chamadas
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_tools))
+        serial = asyncio.Lock()
+        
+        async def _run(tool_call_id: str, tool_name: str, arguments: Dict) -> Dict:
+            info = self.all_tools.get(tool_name)
+            tool = info['tool'] if info else None
+            timeout = (tool.timeout if tool and tool.timeout else None) or self.tool_timeout
+            if tool is not None and tool.side_effects:
+                async with serial, semaphore:
+                    result = await self._call_with_timeout(tool_name, arguments, timeout, side_effects=True)
             else:
-                result = handler(**arguments)
-            
-            logger.debug(f"🔧 {tool_name}: OK")
-            return str(result)
-            
-        except Exception as e:
-            logger.error(f"🔧 {tool_name}: {e}")
-            return f"❌ Erro ao executar {tool_name}: {str(e)}"
+                async with semaphore:
+                    result = await self._call_with_timeout(tool_name, arguments, timeout)
+            return {
+                "tool_call_id": tool_call_id,
+                "role": "tool",
+                "content": result
+            }
+        
+        if len(calls) == 1:
+            return [await _run(*calls[0])]
+        return list(await asyncio.gather(*(_run(*call) for call in calls)))
+    
+    async def _call_with_timeout(
+        self, tool_name: str, arguments: Dict, timeout: float, side_effects: bool = False
+    ) -> str:
+        if not side_effects:
+            try:
+                return await asyncio.wait_for(self.call_tool(tool_name, arguments), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"🔧 {tool_name}: timeout ({timeout:g}s)")
+                return f"❌ Tempo esgotado ao executar {tool_name} ({timeout:g}s)"
+        
+        # Efeito colateral: cancelar no meio deixa o efeito incerto e a IA tentaria de novo
+        call = asyncio.ensure_future(self.call_tool(tool_name, arguments))
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), timeout=timeout)
+        except asyncio.CancelledError:
+            self._detach(tool_name, call)
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"🔧 {tool_name}: sem resposta em {timeout:g}s; segue em execução")
+            self._detach(tool_name, call)
+            return (
+                f"⚠️ {tool_name} ainda em execução após {timeout:g}s: resultado desconhecido. "
+                f"NÃO repita esta chamada; informe ao usuário que a ação pode já ter sido feita."
+            )
+    
+    def _detach(self, tool_name: str, call: asyncio.Future):
+        """Mantém a chamada viva até terminar e registra o resultado no log"""
+        self._detached_calls.add(call)
+        call.add_done_callback(functools.partial(self._on_detached_call_done, tool_name))
+    
+    def _on_detached_call_done(self, tool_name: str, call: asyncio.Future):
+        self._detached_calls.discard(call)
+        if call.cancelled():
+            logger.warning(f"🔧 {tool_name}: cancelado após o timeout")
+        elif call.exception() is not None:
+            logger.error(f"🔧 {tool_name}: falhou após o timeout: {call.exception()}")
+        else:
+            logger.info(f"🔧 {tool_name}: concluído após o timeout: {str(call.result())[:200]}")
     
     async def process_tool_calls(self, tool_calls: List[Dict]) -> List[Dict]:
         """
@@ -184,9 +390,9 @@ class JarvisMCPClient:
             tool_calls: Lista de tool_calls do OpenAI
             
         Returns:
-            Lista de resultados
+            Lista de resultados (na ordem de tool_calls)
         """
-        results = []
+        calls = []
         
         for tc in tool_calls:
             tool_name = tc.get('function', {}).get('name', '')
@@ -196,15 +402,9 @@ class JarvisMCPClient:
             except:
                 arguments = {}
             
-            result = await self.call_tool(tool_name, arguments)
-            
-            results.append({
-                "tool_call_id": tc.get('id', ''),
-                "role": "tool",
-                "content": result
-            })
+            calls.append((tc.get('id', ''), tool_name, arguments))
         
-        return results
+        return await self.execute_tool_calls(calls)
     
     def list_tools(self) -> str:
         """Lista todas as ferramentas disponíveis"""
@@ -20,10 +20,22 @@ _metrics_available = False
 messages_sent = None
 message_latency = None
 active_monitors = None
+module_rejections = None
+module_timeouts = None
+cache_lookups = None
+tool_tokens_saved = None
+tool_scope_escalations = None
+ai_tier_latency = None
+ai_tier_tokens = None
+llm_queue_wait = None
+embedding_batch_size = None
 
 
 def _init_metrics() -> None:
     global _metrics_available, messages_sent, message_latency, active_monitors
+    global module_rejections, module_timeouts, cache_lookups
+    global tool_tokens_saved, tool_scope_escalations, ai_tier_latency, ai_tier_tokens, llm_queue_wait
+    global embedding_batch_size
     if _metrics_available:
         return
     try:
@@ -41,6 +53,54 @@ def _init_metrics() -> None:
             "jarvis_active_monitors",
             "Número de contatos em monitoramento ativo",
         )
+        module_rejections = Counter(
+            "jarvis_module_rejections_total",
+            "Requisições rejeitadas pelo bulkhead do módulo",
+            ["module", "reason"],
+        )
+        module_timeouts = Counter(
+            "jarvis_module_timeouts_total",
+            "Chamadas a módulos que estouraram o timeout",
+            ["module"],
+        )
+        cache_lookups = Counter(
+            "jarvis_cache_lookups_total",
+            "Consultas a caches de respostas da IA",
+            ["cache", "result"],
+        )
+        tool_tokens_saved = Counter(
+            "jarvis_tool_schema_tokens_saved_total",
+            "Tokens de schemas de ferramentas não enviados graças ao escopo por intenção/origem",
+            ["scope"],
+        )
+        tool_scope_escalations = Counter(
+            "jarvis_tool_scope_escalations_total",
+            "Requisições refeitas com o catálogo completo de ferramentas",
+            ["scope", "reason"],
+        )
+        ai_tier_latency = Histogram(
+            "jarvis_ai_tier_latency_seconds",
+            "Latência das respostas da IA por camada (template | small | large)",
+            ["tier"],
+            buckets=(0.01, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+        )
+        ai_tier_tokens = Counter(
+            "jarvis_ai_tier_tokens_total",
+            "Tokens consumidos pela IA por camada",
+            ["tier"],
+        )
+        llm_queue_wait = Histogram(
+            "jarvis_llm_queue_wait_seconds",
+            "Espera na fila do agendador até a vaga de chamada à IA, por classe de prioridade",
+            ["priority"],
+            buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+        )
+        embedding_batch_size = Histogram(
+            "jarvis_embedding_batch_size",
+            "Textos por chamada ao backend de embeddings",
+            ["backend"],
+            buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+        )
         _metrics_available = True
     except ImportError:
         logger.debug("prometheus_client não instalado; métricas desativadas")
@@ -67,6 +127,64 @@ def set_active_monitors(value: int) -> None:
         active_monitors.set(value)
 
 
+def inc_module_rejection(module: str, reason: str = "queue_full") -> None:
+    """Incrementa rejeições do bulkhead de um módulo (queue_full | queue_timeout)."""
+    _init_metrics()
+    if module_rejections is not None:
+        module_rejections.labels(module=module, reason=reason).inc()
+
+
+def inc_module_timeout(module: str) -> None:
+    """Incrementa timeouts de execução de um módulo."""
+    _init_metrics()
+    if module_timeouts is not None:
+        module_timeouts.labels(module=module).inc()
+
+
+def inc_cache_lookup(cache: str, result: str) -> None:
+    """Incrementa consultas a um cache de IA (result: hit | miss)."""
+    _init_metrics()
+    if cache_lookups is not None:
+        cache_lookups.labels(cache=cache, result=result).inc()
+
+
+def inc_tool_tokens_saved(scope: str, tokens: int) -> None:
+    """Soma tokens de schemas de ferramentas economizados por um escopo (ex.: intent:search)."""
+    _init_metrics()
+    if tool_tokens_saved is not None and tokens > 0:
+        tool_tokens_saved.labels(scope=scope).inc(tokens)
+
+
+def inc_tool_scope_escalation(scope: str, reason: str) -> None:
+    """Incrementa escaladas para o catálogo completo (reason: requested | refusal)."""
+    _init_metrics()
+    if tool_scope_escalations is not None:
+        tool_scope_escalations.labels(scope=scope, reason=reason).inc()
+
+
+def observe_ai_tier(tier: str, seconds: float, tokens: int = 0) -> None:
+    """Registra latência e tokens de uma resposta da IA na camada (template | small | large)."""
+    _init_metrics()
+    if ai_tier_latency is not None:
+        ai_tier_latency.labels(tier=tier).observe(seconds)
+    if ai_tier_tokens is not None and tokens > 0:
+        ai_tier_tokens.labels(tier=tier).inc(tokens)
+
+
+def observe_llm_queue_wait(priority: str, seconds: float) -> None:
+    """Registra a espera na fila de chamadas à IA (priority: interactive | autopilot | background)."""
+    _init_metrics()
+    if llm_queue_wait is not None:
+        llm_queue_wait.labels(priority=priority).observe(seconds)
+
+
+def observe_embedding_batch(backend: str, size: int) -> None:
+    """Registra o tamanho de um lote enviado ao backend de embeddings (openai | local)."""
+    _init_metrics()
+    if embedding_batch_size is not None:
+        embedding_batch_size.labels(backend=backend).observe(size)
+
+
 @contextmanager
 def time_message_processing():
     """
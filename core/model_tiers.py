@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Model Tiers - Política de camadas de modelo por intenção
+Cumprimentos e afins não precisam do modelo grande:
+
+- template: resposta pronta de config/response_templates.json (tom do autopilot do contato)
+- small: modelo pequeno/rápido (OPENAI_SMALL_MODEL, rotas em LLM_SMALL_ROUTES)
+- large: modelo padrão, reservado para perguntas abertas
+
+Template só vale com intenção de alta confiança e mensagem curta; senão cai para o modelo pequeno.
+Latência e tokens por camada ficam em stats() e nas métricas Prometheus.
+
+Autor: JARVIS Team
+"""
+
+import logging
+import os
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .metrics import observe_ai_tier
+from .resource_cache import get_resource_cache
+
+logger = logging.getLogger(__name__)
+
+TIER_TEMPLATE = 'template'
+TIER_SMALL = 'small'
+TIER_LARGE = 'large'
+
+DEFAULT_TEMPLATES_PATH = Path(__file__).resolve().parent.parent / 'config' / 'response_templates.json'
+DEFAULT_TEMPLATE_INTENTS = 'greeting,thanks,farewell,whatsapp_autopilot_status'
+DEFAULT_SMALL_INTENTS = (
+    'greeting,thanks,farewell,search,weather,news,wiki,system_info,translation,sentiment,'
+    'whatsapp_check,whatsapp_autopilot_status,whatsapp_monitor_status'
+)
+
+
+def _csv(value: str) -> List[str]:
+    return [v.strip() for v in (value or '').split(',') if v.strip()]
+
+
+@dataclass
+class TierDecision:
+    """Camada escolhida para a requisição (text preenchido no tier template)"""
+    tier: str
+    intent: Optional[str] = None
+    text: Optional[str] = None
+
+
+class _TierStats:
+    """Acumulado de uma camada"""
+
+    def __init__(self):
+        self.calls = 0
+        self.latency = 0.0
+        self.tokens = 0
+
+    def avg_latency(self) -> Optional[float]:
+        return self.latency / self.calls if self.calls else None
+
+    def avg_tokens(self) -> Optional[float]:
+        return self.tokens / self.calls if self.calls else None
+
+
+class ModelTierPolicy:
+    """
+    Decide a camada (template, small, large) de cada requisição da IA
+
+    metadata esperado: intent, intent_confidence, tone (autopilot do contato), pushName,
+    autopilot_list (só para whatsapp_autopilot_status).
+    """
+
+    def __init__(
+        self,
+        template_intents: Iterable[str] = (),
+        small_intents: Iterable[str] = (),
+        min_confidence: float = 0.85,
+        template_max_words: int = 4,
+        templates_path: Path = DEFAULT_TEMPLATES_PATH,
+        enabled: bool = True,
+    ):
+        self.template_intents = set(template_intents)
+        self.small_intents = set(small_intents)
+        self.min_confidence = min_confidence
+        self.template_max_words = template_max_words
+        self.templates_path = Path(templates_path)
+        self.enabled = enabled
+        self._stats: Dict[str, _TierStats] = defaultdict(_TierStats)
+
+    @classmethod
+    def from_env(cls) -> 'ModelTierPolicy':
+        return cls(
+            template_intents=_csv(os.getenv('MODEL_TIER_TEMPLATE_INTENTS', DEFAULT_TEMPLATE_INTENTS)),
+            small_intents=_csv(os.getenv('MODEL_TIER_SMALL_INTENTS', DEFAULT_SMALL_INTENTS)),
+            min_confidence=float(os.getenv('MODEL_TIER_MIN_CONFIDENCE', '0.85')),
+            template_max_words=int(os.getenv('MODEL_TIER_TEMPLATE_MAX_WORDS', '4')),
+            enabled=os.getenv('MODEL_TIERING', '1').strip().lower() not in ('0', 'false', 'no', 'off'),
+        )
+
+    def decide(self, message: str, metadata: Optional[Dict] = None) -> TierDecision:
+        """Camada da requisição; no tier template a resposta já vem pronta"""
+        metadata = metadata or {}
+        intent = metadata.get('intent')
+        if not self.enabled or not intent:
+            return TierDecision(TIER_LARGE, intent)
+        confident = (metadata.get('intent_confidence') or 0.0) >= self.min_confidence
+        if confident and intent in self.template_intents and self._short(message, intent):
+            text = self.render_template(intent, metadata)
+            if text:
+                return TierDecision(TIER_TEMPLATE, intent, text)
+        if confident and intent in self.small_intents:
+            return TierDecision(TIER_SMALL, intent)
+        return TierDecision(TIER_LARGE, intent)
+
+    def _short(self, message: str, intent: str) -> bool:
+        # Status do autopilot é comando, não conversa: o tamanho não importa
+        return intent == 'whatsapp_autopilot_status' or len((message or '').split()) <= self.template_max_words
+
+    def render_template(self, intent: str, metadata: Dict) -> Optional[str]:
+        """Resposta pronta no tom do contato (ou padrão); None sem template para a intenção"""
+        templates = get_resource_cache().read_json(self.templates_path, {}) or {}
+        by_tone = templates.get(intent)
+        if not isinstance(by_tone, dict):
+            return None
+        values = {'name': '', 'vocative': '', 'autopilot_lines': ''}
+        name = (metadata.get('pushName') or '').strip()
+        if name:
+            values.update(name=name, vocative=f", {name.split()[0]}")
+        tone = (metadata.get('tone') or 'default').lower()
+        if intent == 'whatsapp_autopilot_status':
+            autopilot_list = metadata.get('autopilot_list') or []
+            tone = 'default' if autopilot_list else 'empty'
+            values['autopilot_lines'] = "\n".join(
+                f"• **{item.get('contact', '?')}** — tom {item.get('tone', 'fofinho')} "
+                f"(expira {str(item.get('expires_at'))[:19] if item.get('expires_at') else '?'})"
+                for item in autopilot_list
+            )
+        variants = by_tone.get(tone) or by_tone.get('default')
+        if not variants:
+            return None
+        try:
+            return random.choice(variants).format(**values)
+        except (KeyError, IndexError, ValueError) as e:
+            logger.warning(f"⚠️ Template inválido para {intent}/{tone}: {e}")
+            return None
+
+    def record(self, tier: str, latency: float, tokens: int = 0):
+        """Registra latência (s) e tokens de uma resposta da camada"""
+        stats = self._stats[tier]
+        stats.calls += 1
+        stats.latency += latency
+        stats.tokens += tokens or 0
+        observe_ai_tier(tier, latency, tokens or 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Por camada: chamadas, latência e tokens médios. Para template/small, estimativa do que
+        foi poupado frente à média do modelo grande (tokens do modelo grande evitados e latência).
+        """
+        large = self._stats.get(TIER_LARGE)
+        large_latency = large.avg_latency() if large else None
+        large_tokens = large.avg_tokens() if large else None
+        out = {}
+        for tier, stats in self._stats.items():
+            avg_latency = stats.avg_latency()
+            entry = {
+                'calls': stats.calls,
+                'avg_latency_ms': round(avg_latency * 1000, 1) if avg_latency is not None else None,
+                'avg_tokens': round(stats.avg_tokens(), 1) if stats.calls else None,
+            }
+            if tier != TIER_LARGE:
+                entry['large_tokens_avoided'] = (
+                    round(large_tokens * stats.calls) if large_tokens is not None else None
+                )
+                entry['latency_saved_ms'] = (
+                    round((large_latency - avg_latency) * stats.calls * 1000, 1)
+                    if large_latency is not None and avg_latency is not None else None
+                )
+            out[tier] = entry
+        return out
@@ -11,14 +11,30 @@ import asyncio
 import os
 import re
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
 from datetime import datetime
 
 from .intent_classifier import IntentClassifier, Intent
 from .execution_plan import ExecutionPlan
+from .bulkhead import Bulkhead, load_bulkhead_limits
+from .scheduler import TaskScheduler, ScheduledTask
+from .exceptions import BulkheadRejectedException, BulkheadTimeoutException
+from .tracing import span
+from .llm_scheduler import PRIORITY_BACKGROUND, llm_work
+from .resource_cache import get_resource_cache
+from .streaming import get_stream_sink, stream_to
 
 logger = logging.getLogger(__name__)
 
+# Intenções que agem no mundo (envio, lembrete, comando): sem prazo de execução no bulkhead
+# e sem fallback para a IA em falha — repetir pode duplicar a ação
+SIDE_EFFECT_INTENTS = frozenset({
+    'whatsapp_send', 'whatsapp_reply', 'whatsapp_autoreply_enable', 'whatsapp_autoreply_disable',
+    'whatsapp_autopilot_set_tone', 'whatsapp_monitor', 'whatsapp_monitor_disable',
+    'reminder', 'alarm', 'schedule', 'file_operation', 'system_command', 'app_control',
+    'backup', 'automation',
+})
+
 
 class Orchestrator:
     """
@@ -40,11 +56,32 @@ class Orchestrator:
         # Fila de tarefas pendentes
         self._task_queue: asyncio.Queue = asyncio.Queue()
         
-        # Registro de ações proativas agendadas
-        self._scheduled_tasks: List[Dict] = []
+        # Ações proativas agendadas (min-heap; dispara no prazo exato)
+        self._scheduler = TaskScheduler(on_due=self._dispatch_scheduled)
+        # Handler de ações proativas (registrado pelo Jarvis); sem ele, ficam em _pending_proactive
+        self._proactive_handler: Optional[Callable[[Dict], Awaitable[None]]] = None
+        self._pending_proactive: List[Dict] = []
         
         # Task do worker (cancelada explicitamente em stop())
         self._worker_task: Optional[asyncio.Task] = None
+
+        # Fila limitada de escritas de memória (aprendizado + conversas), drenada em lotes
+        self._memory_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=int(self.config.get('MEMORY_WRITE_QUEUE_SIZE', 256) or 256)
+        )
+        self._memory_batch_size = int(self.config.get('MEMORY_WRITE_BATCH_SIZE', 32) or 32)
+        self._memory_writer_task: Optional[asyncio.Task] = None
+
+        # Bulkheads por módulo (timeout, chamadas simultâneas e fila), criados sob demanda
+        self._bulkheads: Dict[str, Bulkhead] = {}
+
+        # Rascunhos especulativos de planos aguardando confirmação (plan_id -> plano com task de composição)
+        # Desligado no modo de uma mensagem (run_jarvis_message): o "sim" chega em outro processo
+        self._plan_drafts: Dict[str, ExecutionPlan] = {}
+        self._plan_drafts_enabled = bool(self.config.get('PLAN_DRAFT_ENABLED', True))
+        self._plan_draft_ttl = float(self.config.get('PLAN_DRAFT_TTL_SECONDS', 600) or 600)
+        # Cache exato das mensagens compostas (0 desliga)
+        self._compose_cache_ttl = float(self.config.get('COMPOSE_CACHE_TTL_SECONDS', 3600) or 0)
     
     async def start(self):
         """Inicializa todos os módulos"""
@@ -62,6 +99,14 @@ class Orchestrator:
             self._worker_task = asyncio.create_task(
                 self._task_worker(), name="orchestrator_task_worker"
             )
+
+        self._scheduler.start()
+
+        existing = self._memory_writer_task
+        if existing is None or existing.done():
+            self._memory_writer_task = asyncio.create_task(
+                self._memory_writer(), name="orchestrator_memory_writer"
+            )
         
         logger.info(f"✅ Orquestrador pronto - {len(self.modules)} módulos carregados")
     
@@ -79,6 +124,23 @@ class Orchestrator:
                 pass
             except asyncio.TimeoutError:
                 logger.warning("Timeout aguardando _task_worker encerrar (2s)")
+
+        await self._scheduler.stop()
+
+        for plan_id in list(self._plan_drafts):
+            self._discard_plan_draft(plan_id)
+
+        # Escritor de memória: sentinela encerra o loop após drenar a fila; o que sobrar é gravado aqui
+        writer = self._memory_writer_task
+        self._memory_writer_task = None
+        if writer is not None and not writer.done():
+            try:
+                await asyncio.wait_for(self._memory_queue.put(None), timeout=2.0)
+                await asyncio.wait_for(asyncio.shield(writer), timeout=5.0)
+            except asyncio.TimeoutError:
+                logger.warning("Timeout aguardando _memory_writer encerrar; cancelando")
+                writer.cancel()
+        await self._flush_memory_queue()
         
         for name, module in self.modules.items():
             try:
@@ -134,6 +196,8 @@ class Orchestrator:
                 async def process(self, message, intent, context, metadata):
                     r = await self._engine.process(message)
                     return r.text if hasattr(r, 'text') else str(r)
+                async def stop(self):
+                    await self._engine.close()
             self.modules['ai'] = _AIFallback(engine)
             logger.info("  ✅ ai (fallback core.ai_engine) carregado")
         except Exception as e:
@@ -157,6 +221,7 @@ class Orchestrator:
                     out_meta["clear_pending_plan"] = True
                     return response, out_meta
                 if self._user_cancelled_plan(msg):
+                    self._discard_plan_draft(plan.plan_id)
                     return "Tarefa cancelada.", {"clear_pending_plan": True}
                 return "Posso prosseguir? (Responda sim ou não.)", {}
 
@@ -171,6 +236,7 @@ class Orchestrator:
                 plan = self._create_send_compose_plan(contact, f"mensagem {tone}")
                 plan.formality = "informal"
                 plan.tone = "romantic" if tone in ("fofinha", "fofinho", "amorosa") else ""
+                self._start_plan_draft(plan)
                 return (
                     plan.summary + " Posso prosseguir?",
                     {"pending_plan": plan.to_dict(), "clear_suggested_send": True},
@@ -183,31 +249,132 @@ class Orchestrator:
             return "Entendido. Parando.", {"clear_suggested_send": True}
 
         # 1. Comandos compostos: "mande mensagem para X e monitore a conversa"
-        parts = self.intent_classifier.split_compound(message)
+        parts = [p.strip() for p in self.intent_classifier.split_compound(message) if p and p.strip()]
         if len(parts) > 1:
-            responses = []
+            results = await self._process_compound(parts, context, source, metadata)
+            responses = [resp for resp, _ in results]
+            # Merge determinístico: ordem original das partes; a parte posterior vence em conflito
             out_meta = {}
-            for part in parts:
-                part = part.strip()
-                if not part:
-                    continue
-                resp, meta = await self._process_one(part, context, source, metadata)
-                responses.append(resp)
+            for _, meta in results:
                 if meta:
                     out_meta.update(meta)
-            combined = "\n\n".join(responses)
-            if 'memory' in self.modules:
-                await self.modules['memory'].save_conversation(message, combined, "compound")
+            combined = "\n\n".join(str(r) for r in responses if r is not None)
+            await self._enqueue_memory_write(('conversation', (message, combined, "compound")))
             return combined, out_meta
 
         return await self._process_one(message, context, source, metadata)
 
+    # Palavras que indicam que a parte usa o resultado da parte anterior ("monitore a conversa", "resuma isso")
+    COMPOUND_REFERENCE_WORDS = frozenset({
+        "ela", "ele", "dela", "dele", "nela", "nele", "isso", "isto", "disso", "nisso",
+        "conversa", "resultado", "resposta", "mesmo", "mesma", "depois", "então", "entao",
+    })
+
+    async def _compound_dependency_groups(
+        self, parts: List[str], context: Dict
+    ) -> Tuple[List[List[int]], List[Optional[Intent]]]:
+        """
+        Agrupa as partes de um comando composto em cadeias dependentes.
+        Parte que referencia o resultado anterior (pronome/"a conversa") ou que compartilha contato
+        com outra fica na mesma cadeia (ordem preservada); cadeias distintas são independentes.
+        Retorna (cadeias, intenção de cada parte) para não classificar de novo (None se falhou).
+        """
+        contacts: List[str] = []
+        intents: List[Optional[Intent]] = []
+        for part in parts:
+            try:
+                intent = await self.intent_classifier.classify(part, context)
+                contact = ((intent.entities or {}).get("contact") or "").strip()
+            except Exception:
+                intent, contact = None, ""
+            intents.append(intent)
+            contacts.append((self._strip_article_from_contact(contact) or contact).lower())
+
+        group_of = list(range(len(parts)))
+
+        def find(i: int) -> int:
+            while group_of[i] != i:
+                group_of[i] = group_of[group_of[i]]
+                i = group_of[i]
+            return i
+
+        def union(a: int, b: int) -> None:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                group_of[max(ra, rb)] = min(ra, rb)
+
+        for j in range(1, len(parts)):
+            words = {w.strip(".,!?;:").lower() for w in parts[j].split()}
+            if words & self.COMPOUND_REFERENCE_WORDS:
+                union(j - 1, j)
+            for i in range(j):
+                if contacts[j] and contacts[j] == contacts[i]:
+                    union(i, j)
+
+        groups: Dict[int, List[int]] = {}
+        for idx in range(len(parts)):
+            groups.setdefault(find(idx), []).append(idx)
+        return [groups[root] for root in sorted(groups)], intents
+
+    async def _process_compound(
+        self, parts: List[str], context: Dict, source: str, metadata: Dict
+    ) -> List[tuple]:
+        """
+        Executa as partes de um comando composto: cadeias independentes em paralelo,
+        partes dependentes em sequência. Retorna [(resposta, meta)] na ordem original das partes.
+        """
+        groups, intents = await self._compound_dependency_groups(parts, context)
+        results: List[Optional[tuple]] = [None] * len(parts)
+
+        async def run_chain(indices: List[int]) -> None:
+            chain_context = context
+            for idx in indices:
+                # Intenção já classificada vale enquanto o contexto for o mesmo da classificação
+                intent = intents[idx] if chain_context is context else None
+                try:
+                    resp, meta = await self._process_one(
+                        parts[idx], chain_context, source, metadata, intent=intent
+                    )
+                except Exception as e:
+                    logger.error("Erro na parte %d do comando composto: %s", idx, e)
+                    resp, meta = f"Desculpe, ocorreu um erro ao processar: {str(e)}", {}
+                results[idx] = (resp, meta or {})
+                # Parte seguinte da cadeia enxerga o contato usado pela anterior
+                if meta and meta.get("last_contact"):
+                    chain_context = {**chain_context, "last_contact": meta["last_contact"]}
+
+        if len(groups) > 1:
+            logger.info("🔀 Comando composto: %d partes em %d cadeias paralelas", len(parts), len(groups))
+        # Partes rodam em paralelo: deltas intercalados não fazem sentido, resposta sai combinada
+        with stream_to(None):
+            await asyncio.gather(*(run_chain(g) for g in groups))
+        return [r if r is not None else ("", {}) for r in results]
+
     async def _process_one(
-        self, message: str, context: Dict, source: str, metadata: Dict
+        self, message: str, context: Dict, source: str, metadata: Dict,
+        intent: Optional[Intent] = None,
+    ) -> tuple:
+        """Processa uma única mensagem (intent: já classificada, ex.: parte de comando composto). Retorna (resposta, metadata)."""
+        # Contexto de memória é buscado em paralelo com a classificação
+        memory_task = None
+        memory = self.modules.get('memory')
+        if memory is not None and hasattr(memory, 'get_context_for_ai'):
+            memory_task = asyncio.create_task(memory.get_context_for_ai())
+        try:
+            return await self._process_one_classified(message, context, source, metadata, memory_task, intent)
+        finally:
+            if memory_task is not None and not memory_task.done():
+                memory_task.cancel()
+
+    async def _process_one_classified(
+        self, message: str, context: Dict, source: str, metadata: Dict,
+        memory_task: Optional[asyncio.Task] = None,
+        intent: Optional[Intent] = None,
     ) -> tuple:
-        """Processa uma única mensagem. Retorna (resposta, metadata)."""
-        # 1. Classificar intenção
-        intent = await self.intent_classifier.classify(message, context)
+        """Classifica e executa uma única mensagem (memory_task: contexto de memória já em andamento)."""
+        # 1. Classificar intenção (a menos que já venha classificada)
+        if intent is None:
+            intent = await self.intent_classifier.classify(message, context)
         logger.info(f"📋 Intenção: {intent.type} (confiança: {intent.confidence:.2f})")
 
         # 1b. Envio com mensagem composta → criar plano (uma confirmação, contato travado)
@@ -225,6 +392,7 @@ class Orchestrator:
                         f"Por enquanto envio para um contato por vez. Vou enviar para **{contact}**. "
                         f"(Para enviar também para **{contacts[1]}**, peça em seguida.)"
                     )
+                self._start_plan_draft(plan)
                 return (
                     plan.summary + " Posso prosseguir?",
                     {"pending_plan": plan.to_dict()},
@@ -285,16 +453,16 @@ class Orchestrator:
                         {},
                     )
 
-        # 2. Aprende com a mensagem (se módulo de memória disponível)
-        if 'memory' in self.modules:
-            learned = await self.modules['memory'].learn_from_message(message)
-            if learned:
-                logger.info(f"🧠 Aprendi: {', '.join(learned)}")
+        # 2. Aprende com a mensagem em segundo plano (fila de escrita, fora do caminho crítico)
+        await self._enqueue_memory_write(('learn', message))
 
-        # 3. Adiciona contexto de memória
+        # 3. Adiciona contexto de memória (iniciado junto com a classificação)
         memory_context = ""
-        if 'memory' in self.modules:
-            memory_context = await self.modules['memory'].get_context_for_ai()
+        if memory_task is not None:
+            try:
+                memory_context = await memory_task
+            except Exception as e:
+                logger.debug("Contexto de memória indisponível: %s", e)
 
         enriched_context = {**context}
         if memory_context:
@@ -305,11 +473,8 @@ class Orchestrator:
             intent, message, enriched_context, source, metadata
         )
 
-        # 5. Salva conversa
-        if 'memory' in self.modules:
-            await self.modules['memory'].save_conversation(
-                message, response, intent.type
-            )
+        # 5. Salva conversa (fila de escrita)
+        await self._enqueue_memory_write(('conversation', (message, response, intent.type)))
 
         return response, out_meta or {}
 
@@ -571,8 +736,10 @@ class Orchestrator:
         if not contact:
             return "Não foi possível executar: contato não definido no plano.", {}
 
-        # Step 1: compor mensagem (com tom do plano)
-        composed = await self._compose_message_via_ai(plan)
+        # Step 1: compor mensagem (com tom do plano); reaproveita o rascunho especulativo
+        composed = plan.composed_message or await self._take_plan_draft(plan)
+        if not composed:
+            composed = await self._compose_message_via_ai(plan)
         if not composed:
             return "Não consegui gerar a mensagem. Tente novamente.", {}
         plan.composed_message = composed
@@ -598,13 +765,65 @@ class Orchestrator:
             logger.exception("Erro ao executar plano: %s", e)
             return f"Erro ao enviar: {str(e)}", {}
 
+    def _start_plan_draft(self, plan: ExecutionPlan):
+        """
+        Começa a compor a mensagem do plano em segundo plano enquanto o usuário confirma.
+        Roda na classe background do LLMScheduler (não disputa vaga com mensagens interativas).
+        O rascunho é descartado ao recusar, ao expirar (PLAN_DRAFT_TTL_SECONDS) ou no stop().
+        """
+        if not self._plan_drafts_enabled or 'ai' not in self.modules:
+            return
+        with llm_work(PRIORITY_BACKGROUND, key=plan.target_contact or plan.plan_id):
+            task = asyncio.create_task(
+                self._compose_message_via_ai(plan), name=f"plan_draft_{plan.plan_id}"
+            )
+        plan.draft = task
+        plan.draft_expiry = asyncio.get_running_loop().call_later(
+            self._plan_draft_ttl, self._discard_plan_draft, plan.plan_id
+        )
+        self._plan_drafts[plan.plan_id] = plan
+
+    async def _take_plan_draft(self, plan: ExecutionPlan) -> Optional[str]:
+        """Aguarda e consome o rascunho do plano (None se não houver ou se falhou)"""
+        drafted = self._plan_drafts.pop(plan.plan_id, None) or plan
+        if drafted.draft_expiry is not None:
+            drafted.draft_expiry.cancel()
+            drafted.draft_expiry = None
+        task, drafted.draft = drafted.draft, None
+        plan.draft = None
+        if task is None or task.cancelled():
+            return None
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+        except Exception as e:
+            logger.debug("Rascunho do plano %s falhou: %s", plan.plan_id, e)
+            return None
+
+    def _discard_plan_draft(self, plan_id: str):
+        """Cancela o rascunho (e o prazo de validade) de um plano recusado/expirado"""
+        plan = self._plan_drafts.pop(plan_id, None)
+        if plan is None:
+            return
+        if plan.draft_expiry is not None:
+            plan.draft_expiry.cancel()
+            plan.draft_expiry = None
+        task, plan.draft = plan.draft, None
+        if task is not None and not task.done():
+            task.cancel()
+            logger.debug("Rascunho do plano %s descartado", plan_id)
+
     def _get_capabilities_response(self) -> str:
         """Retorna texto com as capacidades do JARVIS (para apresentação)."""
         try:
             from pathlib import Path
             path = Path(__file__).parent.parent / "docs" / "CAPACIDADES_JARVIS.md"
-            if path.exists():
-                return path.read_text(encoding="utf-8").strip()
+            text = get_resource_cache().read_text(path)
+            if text is not None:
+                return text.strip()
         except Exception as e:
             logger.debug("Não foi possível carregar CAPACIDADES_JARVIS.md: %s", e)
         return (
@@ -658,12 +877,20 @@ class Orchestrator:
             if not ai_module or not hasattr(ai_module, 'process'):
                 logger.debug("no_response: _compose_message_via_ai reason=no_ai_module")
                 return None
-            result = await ai_module.process(
-                message=base,
-                intent=Intent(type='conversation', confidence=1.0, entities={}),
-                context={},
-                metadata={}
-            )
+            if hasattr(ai_module, 'complete'):
+                # Prompt autocontido: com cache ligado a composição é determinística (temperature=0)
+                # e a mesma requisição vem do cache; sem cache, mantém a temperatura da IA
+                if self._compose_cache_ttl:
+                    result = await ai_module.complete(base, cache_ttl=self._compose_cache_ttl, temperature=0)
+                else:
+                    result = await ai_module.complete(base)
+            else:
+                result = await ai_module.process(
+                    message=base,
+                    intent=Intent(type='conversation', confidence=1.0, entities={}),
+                    context={},
+                    metadata={}
+                )
             if isinstance(result, tuple):
                 text = result[0]
             else:
@@ -681,6 +908,12 @@ class Orchestrator:
         self, intent: Intent, message: str, context: Dict, source: str, metadata: Dict
     ) -> tuple:
         """Roteia para o módulo apropriado. Retorna (resposta, metadata)."""
+        with span('orchestrator.route', intent=intent.type):
+            return await self._route_to_module_traced(intent, message, context, source, metadata)
+
+    async def _route_to_module_traced(
+        self, intent: Intent, message: str, context: Dict, source: str, metadata: Dict
+    ) -> tuple:
         # Mapeamento intenção -> módulo
         intent_to_module = {
             'search': 'search',
@@ -743,12 +976,21 @@ class Orchestrator:
             out_meta = {}
             if hasattr(module, 'process'):
                 req_meta = {**(metadata or {}), 'source': source}
-                result = await module.process(
-                    message=message,
-                    intent=intent,
-                    context=context,
-                    metadata=req_meta
-                )
+                sink = get_stream_sink()
+                streaming = sink is not None and hasattr(module, 'stream')
+                with span('module.process', module=module_name, intent=intent.type, stream=streaming or None):
+                    if streaming:
+                        call = lambda: self._stream_module(module, sink, message, intent, context, req_meta)
+                    else:
+                        call = lambda: module.process(
+                            message=message,
+                            intent=intent,
+                            context=context,
+                            metadata=req_meta
+                        )
+                    result = await self._get_bulkhead(module_name).run(
+                        call, side_effects=intent.type in SIDE_EFFECT_INTENTS
+                    )
                 if isinstance(result, tuple) and len(result) >= 2:
                     response, out_meta = result[0], (result[1] or {})
                 else:
@@ -769,10 +1011,29 @@ class Orchestrator:
             out_meta["last_intent"] = intent.type
             return response, out_meta
 
+        except (BulkheadRejectedException, BulkheadTimeoutException) as e:
+            # Módulo lotado ou passou do prazo do bulkhead: cai rápido para a IA ou para resposta pronta.
+            # TimeoutError interno do módulo não chega aqui: é erro do módulo (tratado abaixo)
+            reason = e.reason
+            logger.warning("Módulo %s indisponível (%s) para intent=%s", module_name, reason, intent.type)
+            if intent.type in SIDE_EFFECT_INTENTS:
+                # Ação com efeito (envio, lembrete...) não vira conversa com a IA: ela poderia repetir a ação
+                if reason == 'timeout':
+                    return "⏳ A ação ainda está em andamento e não sei se foi concluída. Confira antes de repetir.", {}
+                return "⏳ Estou com muitas solicitações no momento e a ação não foi executada. Tente novamente em instantes.", {}
+            if module_name != 'ai' and 'ai' in self.modules:
+                return await self._route_to_module(
+                    Intent(type='conversation', confidence=0.5, entities={}),
+                    message, context, source, metadata
+                )
+            if reason == 'timeout':
+                return "⏳ Isso está demorando mais que o normal. Tente novamente em instantes.", {}
+            return "⏳ Estou com muitas solicitações no momento. Tente novamente em instantes.", {}
+
         except Exception as e:
             logger.error(f"Erro no módulo {module_name}: {e}")
 
-            if module_name != 'ai' and 'ai' in self.modules:
+            if module_name != 'ai' and 'ai' in self.modules and intent.type not in SIDE_EFFECT_INTENTS:
                 return await self._route_to_module(
                     Intent(type='conversation', confidence=0.5, entities={}),
                     message, context, source, metadata
@@ -780,47 +1041,144 @@ class Orchestrator:
 
             return f"Desculpe, ocorreu um erro ao processar: {str(e)}", {}
     
-    async def check_proactive(self) -> Optional[Dict]:
+    async def _stream_module(
+        self, module, sink, message: str, intent: Intent, context: Dict, metadata: Dict
+    ) -> str:
+        """Repassa os deltas de module.stream() ao sink e retorna o texto completo"""
+        parts = []
+        async for delta in module.stream(
+            message=message, intent=intent, context=context, metadata=metadata
+        ):
+            if not delta:
+                continue
+            parts.append(delta)
+            await sink(delta)
+        return "".join(parts)
+
+    def _get_bulkhead(self, module_name: str) -> Bulkhead:
+        """Bulkhead do módulo (limites do código, campos sobrescritos pela seção "bulkheads" do config.json)"""
+        bulkhead = self._bulkheads.get(module_name)
+        if bulkhead is None:
+            overrides = self.config.get('bulkheads', {}) if hasattr(self.config, 'get') else {}
+            limits = load_bulkhead_limits(module_name, overrides if isinstance(overrides, dict) else {})
+            bulkhead = Bulkhead(module_name, limits)
+            self._bulkheads[module_name] = bulkhead
+        return bulkhead
+
+    def get_bulkhead_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Ocupação, rejeições e timeouts por módulo"""
+        return {name: b.get_stats() for name, b in self._bulkheads.items()}
+    
+    def schedule_task(self, time: datetime, message: str, source: str = 'user') -> ScheduledTask:
+        """Agenda uma tarefa proativa. Retorna handle cancelável (handle.cancel() ou cancel_task(id))."""
+        task = self._scheduler.schedule(time, message, source)
+        logger.info(f"⏰ Tarefa agendada para {time}: {message[:50]}...")
+        return task
+
+    def cancel_task(self, task_id: str) -> bool:
+        """Cancela uma tarefa agendada pelo id"""
+        return self._scheduler.cancel(task_id)
+
+    def set_proactive_handler(self, handler: Optional[Callable[[Dict], Awaitable[None]]]):
+        """Define quem recebe as ações proativas assim que vencem (ex.: Jarvis → on_proactive)"""
+        self._proactive_handler = handler
+
+    async def flush_pending_proactive(self):
+        """Entrega ao handler as ações que venceram antes de ele ser registrado"""
+        if self._proactive_handler is None:
+            return
+        pending, self._pending_proactive = self._pending_proactive, []
+        for action in pending:
+            await self._proactive_handler(action)
+
+    async def _dispatch_scheduled(self, task: ScheduledTask):
+        """Chamado pelo agendador no prazo da tarefa"""
+        action = task.to_action()
+        if self._proactive_handler is None:
+            self._pending_proactive.append(action)
+            return
+        await self._proactive_handler(action)
+    
+    async def _enqueue_memory_write(self, item: tuple) -> None:
         """
-        Verifica se há ações proativas a executar
-        
-        Returns:
-            Dict com ação proativa ou None
+        Enfileira escrita de memória: ('learn', message) ou ('conversation', (msg, resp, intent)).
+        Sem escritor ativo (orquestrador não iniciado) grava direto; fila cheia aplica backpressure.
         """
-        now = datetime.now()
-        
-        # Verifica lembretes agendados
-        for task in self._scheduled_tasks:
-            if task['time'] <= now and not task.get('executed'):
-                task['executed'] = True
-                return {
-                    'type': 'reminder',
-                    'message': task['message'],
-                    'source': task.get('source', 'system')
-                }
-        
-        # Verifica módulos por ações proativas
-        for name, module in self.modules.items():
-            if hasattr(module, 'check_proactive'):
+        if 'memory' not in self.modules:
+            return
+        writer = self._memory_writer_task
+        if writer is None or writer.done():
+            await self._write_memory_batch([item])
+            return
+        if self._memory_queue.full():
+            logger.warning("Fila de memória cheia (%d); aguardando escritor", self._memory_queue.maxsize)
+        await self._memory_queue.put(item)
+
+    async def _memory_writer(self):
+        """Drena a fila de memória em lotes (até MEMORY_WRITE_BATCH_SIZE itens por vez)."""
+        stopping = False
+        while not stopping:
+            try:
+                item = await self._memory_queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                while len(batch) < self._memory_batch_size:
+                    try:
+                        item = self._memory_queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                await self._write_memory_batch(batch)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Erro no escritor de memória: {e}")
+
+    async def _flush_memory_queue(self):
+        """Grava tudo o que restou na fila de memória (chamado em stop())."""
+        batch = []
+        while True:
+            try:
+                item = self._memory_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is not None:
+                batch.append(item)
+        if batch:
+            logger.debug("Gravando %d escritas de memória pendentes", len(batch))
+            await self._write_memory_batch(batch)
+
+    async def _write_memory_batch(self, batch: List[tuple]):
+        """Aplica um lote de escritas: aprendizado item a item, conversas numa única transação."""
+        memory = self.modules.get('memory')
+        if memory is None:
+            return
+        conversations = []
+        for kind, payload in batch:
+            if kind == 'learn':
                 try:
-                    proactive = await module.check_proactive()
-                    if proactive:
-                        return proactive
+                    learned = await memory.learn_from_message(payload)
+                    if learned:
+                        logger.info(f"🧠 Aprendi: {', '.join(learned)}")
                 except Exception as e:
-                    logger.debug(f"Erro verificando proativo em {name}: {e}")
-        
-        return None
-    
-    def schedule_task(self, time: datetime, message: str, source: str = 'user'):
-        """Agenda uma tarefa proativa"""
-        self._scheduled_tasks.append({
-            'time': time,
-            'message': message,
-            'source': source,
-            'executed': False
-        })
-        logger.info(f"⏰ Tarefa agendada para {time}: {message[:50]}...")
-    
+                    logger.error(f"Erro ao aprender com mensagem: {e}")
+            elif kind == 'conversation':
+                conversations.append(payload)
+        if not conversations:
+            return
+        try:
+            if hasattr(memory, 'save_conversations'):
+                await memory.save_conversations(conversations)
+            else:
+                for user_message, response, intent_type in conversations:
+                    await memory.save_conversation(user_message, response, intent_type)
+        except Exception as e:
+            logger.error(f"Erro ao salvar conversas: {e}")
+
     async def _task_worker(self):
         """Worker para processar fila de tarefas assíncronas"""
         while self._running:
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Proactive Engine - Motor proativo orientado a eventos
+Substitui o polling de 60s: módulos avisam pelo event bus quando terão algo
+(prazo) ou quando já têm algo (pronto), e o motor só acorda nesses momentos.
+
+Protocolo dos módulos:
+    await announce_deadline('calendar', datetime(...))  # verificar em tal horário
+    await announce_deadline('calendar', None)           # nada pendente
+    await announce_ready('whatsapp')                    # verificar agora
+
+No prazo/sinal o motor chama module.check_proactive() (em paralelo, com timeout)
+e despacha todas as ações retornadas (dict ou lista de dicts). Quem publica prazo:
+calendário (próximo lembrete) e WhatsApp (contatos monitorados).
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from .event_bus import Event, EventBus, EventType, emit, get_event_bus
+
+logger = logging.getLogger(__name__)
+
+
+async def announce_deadline(module: str, deadline: Optional[datetime]):
+    """Publica o próximo prazo proativo do módulo (None = nada pendente)"""
+    await emit(EventType.PROACTIVE_DEADLINE, {'module': module, 'deadline': deadline}, source=module)
+
+
+async def announce_ready(module: str):
+    """Publica que o módulo tem ação proativa pronta"""
+    await emit(EventType.PROACTIVE_READY, {'module': module}, source=module)
+
+
+class ProactiveEngine:
+    """
+    Motor proativo
+
+    - Prazos por módulo; dorme até o mais próximo (sem prazo = espera indefinida)
+    - Sinais de pronto/novo prazo acordam o loop na hora
+    - Na partida todo módulo com check_proactive é verificado uma vez (e republica o prazo)
+    """
+
+    def __init__(
+        self,
+        modules: Dict[str, Any],
+        dispatch: Callable[[Dict], Awaitable[None]],
+        check_timeout: float = 5.0,
+        bus: Optional[EventBus] = None,
+    ):
+        self._modules = modules
+        self._dispatch = dispatch
+        self._check_timeout = check_timeout
+        self._bus = bus
+        self._deadlines: Dict[str, datetime] = {}
+        self._ready: Set[str] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Assina os eventos e inicia o loop; cada módulo é verificado uma vez na partida"""
+        if self._task is not None and not self._task.done():
+            return
+        bus = self._bus or get_event_bus()
+        self._bus = bus
+        bus.subscribe(EventType.PROACTIVE_DEADLINE, self._on_deadline)
+        bus.subscribe(EventType.PROACTIVE_READY, self._on_ready)
+
+        self._ready.update(
+            name for name, module in self._modules.items() if hasattr(module, 'check_proactive')
+        )
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run(), name="proactive_engine")
+        logger.info("⚡ Motor proativo iniciado")
+
+    async def stop(self):
+        """Cancela assinaturas e o loop"""
+        if self._bus is not None:
+            self._bus.unsubscribe(EventType.PROACTIVE_DEADLINE, self._on_deadline)
+            self._bus.unsubscribe(EventType.PROACTIVE_READY, self._on_ready)
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._wakeup = None
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Prazo mais próximo entre os módulos (None se não houver)"""
+        return min(self._deadlines.values()) if self._deadlines else None
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _on_deadline(self, event: Event):
+        module = event.data.get('module')
+        if not module:
+            return
+        deadline = event.data.get('deadline')
+        if isinstance(deadline, str):
+            try:
+                deadline = datetime.fromisoformat(deadline)
+            except ValueError:
+                logger.debug(f"Prazo proativo inválido de {module}: {deadline}")
+                return
+        if deadline is None:
+            self._deadlines.pop(module, None)
+        else:
+            self._deadlines[module] = deadline
+        self._wake()
+
+    def _on_ready(self, event: Event):
+        module = event.data.get('module')
+        if module:
+            self._ready.add(module)
+            self._wake()
+
+    async def run(self):
+        """Verifica módulos prontos/vencidos e dorme até o próximo prazo ou sinal"""
+        while True:
+            try:
+                self._wakeup.clear()
+                now = datetime.now()
+                due = [name for name, deadline in self._deadlines.items() if deadline <= now]
+                for name in due:
+                    del self._deadlines[name]
+                names = sorted(self._ready.union(due))
+                self._ready.clear()
+
+                if names:
+                    for action in await self.check_modules(names):
+                        await self._safe_dispatch(action)
+                    continue
+
+                deadline = self.next_deadline()
+                timeout = None
+                if deadline is not None:
+                    timeout = max(0.0, (deadline - datetime.now()).total_seconds())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Erro no motor proativo: {e}")
+
+    async def check_modules(self, names: List[str]) -> List[Dict]:
+        """Chama check_proactive() dos módulos em paralelo; ações na ordem dos nomes"""
+        results = await asyncio.gather(*(self._check_one(name) for name in names))
+        return [action for actions in results for action in actions]
+
+    async def _check_one(self, name: str) -> List[Dict]:
+        module = self._modules.get(name)
+        if module is None or not hasattr(module, 'check_proactive'):
+            return []
+        try:
+            result = await asyncio.wait_for(module.check_proactive(), timeout=self._check_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"⏱️ check_proactive de {name} excedeu {self._check_timeout:.1f}s")
+            return []
+        except Exception as e:
+            logger.debug(f"Erro verificando proativo em {name}: {e}")
+            return []
+        if not result:
+            return []
+        return list(result) if isinstance(result, (list, tuple)) else [result]
+
+    async def _safe_dispatch(self, action: Dict):
+        try:
+            await self._dispatch(action)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Erro ao despachar ação proativa: {e}")
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Prompt Cache - Cache exato de chamadas determinísticas à IA
+Chave = hash de (modelo, mensagens, temperatura, ferramentas, extras). Persistido em
+SQLite (WAL, compartilhado entre processos), com TTL por entrada e limite de tamanho
+(remove as menos usadas recentemente).
+
+Opt-in por chamada: só quem passa um TTL usa o cache (compor mensagem, traduzir...).
+Código assíncrono usa aget/aset: o SQLite roda numa thread própria, fora do event loop.
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .metrics import inc_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "cache" / "prompt_cache.db"
+
+
+def prompt_cache_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float] = None,
+    tools: Optional[List[Dict[str, Any]]] = None,
+    **extra,
+) -> str:
+    """Hash estável da requisição (JSON com chaves ordenadas)"""
+    payload = {
+        'model': model,
+        'messages': messages,
+        'temperature': temperature,
+        'tools': tools or None,
+        **extra,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class PromptCache:
+    """
+    Cache exato em SQLite
+
+    - get(key) -> resposta ou None (expiradas contam como miss)
+    - set(key, value, ttl) grava e aplica o limite de entradas
+    - aget/aset: mesmas operações numa thread dedicada (para corrotinas)
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 5000):
+        self.path = Path(path) if path else DEFAULT_DB_PATH
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS prompt_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_prompt_cache_access ON prompt_cache(last_access)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Resposta cacheada (None se não houver ou se expirou)"""
+        now = time.time()
+        value = None
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM prompt_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        value = row[0]
+                        conn.execute("UPDATE prompt_cache SET last_access = ? WHERE key = ?", (now, key))
+                    else:
+                        conn.execute("DELETE FROM prompt_cache WHERE key = ?", (key,))
+                    conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Prompt cache indisponível: {e}")
+            return None
+        self._record(value is not None)
+        return value
+
+    def set(self, key: str, value: str, ttl: float):
+        """Grava resposta válida por ttl segundos"""
+        if not value or ttl <= 0:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO prompt_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, now + ttl, now),
+                )
+                self._evict(conn, now)
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Falha ao gravar prompt cache: {e}")
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() fora do event loop"""
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.get, key)
+
+    async def aset(self, key: str, value: str, ttl: float):
+        """set() fora do event loop"""
+        if not value or ttl <= 0:
+            return
+        await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.set, key, value, ttl)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Uma thread: gravações na ordem em que foram pedidas
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='jarvis-prompt-cache')
+        return self._executor
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM prompt_cache WHERE expires_at <= ?", (now,))
+        (count,) = conn.execute("SELECT COUNT(*) FROM prompt_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM prompt_cache WHERE key IN "
+                "(SELECT key FROM prompt_cache ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM prompt_cache")
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses, taxa de acerto e entradas"""
+        total = self.hits + self.misses
+        try:
+            with self._lock:
+                (entries,) = self._connect().execute("SELECT COUNT(*) FROM prompt_cache").fetchone()
+        except sqlite3.Error:
+            entries = None
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': entries,
+        }
+
+    def _record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        inc_cache_lookup('prompt', 'hit' if hit else 'miss')
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Instância global
+_prompt_cache: Optional[PromptCache] = None
+
+
+def get_prompt_cache() -> PromptCache:
+    """Retorna instância global do cache de prompts"""
+    global _prompt_cache
+    if _prompt_cache is None:
+        _prompt_cache = PromptCache(
+            path=os.getenv('PROMPT_CACHE_PATH') or None,
+            max_entries=int(os.getenv('PROMPT_CACHE_MAX_ENTRIES', '5000')),
+        )
+    return _prompt_cache
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Resource Cache - Cache de arquivos validado por mtime/tamanho
+Prompts, documentos e JSONs de config saem da memória; edições no disco são
+percebidas na próxima leitura (os.stat por acesso, ou watchdog se instalado).
+
+Uso:
+    cache = get_resource_cache()
+    prompt = cache.read_text(path)          # None se não existir
+    monitors = cache.read_json(path, {})    # objeto compartilhado: não mutar
+    cache.load_dotenv(BASE_DIR / '.env')    # só relê o .env se mudou
+
+Autor: JARVIS Team
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# watchdog é opcional: com ele, arquivos em pastas observadas nem fazem os.stat
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class _Entry:
+    """Conteúdo cacheado + assinatura do arquivo quando foi lido"""
+    signature: Tuple[int, int]  # (mtime_ns, size)
+    value: Any
+
+
+class _InvalidateHandler(FileSystemEventHandler):
+    """Invalida entradas do cache quando o watchdog reporta mudança"""
+
+    def __init__(self, cache: 'ResourceCache'):
+        super().__init__()
+        self._cache = cache
+
+    def on_any_event(self, event):
+        self._cache.invalidate(getattr(event, 'src_path', None))
+        dest = getattr(event, 'dest_path', None)
+        if dest:
+            self._cache.invalidate(dest)
+
+
+class ResourceCache:
+    """
+    Cache central de recursos em disco
+
+    - Entradas por (caminho, tipo): 'text', 'json', 'dotenv'
+    - Revalidação por (mtime, tamanho) a cada acesso
+    - watch(pasta): usa watchdog (se disponível) e dispensa o stat nessa pasta
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+        self._watched: Set[str] = set()
+        self._observer = None
+
+    @staticmethod
+    def _key(path: PathLike) -> str:
+        return os.path.abspath(str(path))
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _is_watched(self, path: str) -> bool:
+        return any(path.startswith(d + os.sep) for d in self._watched)
+
+    def _get(self, path: PathLike, kind: str, loader) -> Tuple[bool, Any]:
+        """(existe, valor) — recarrega com loader(path) quando a assinatura muda"""
+        key = self._key(path)
+        with self._lock:
+            entry = self._entries.get((key, kind))
+            if entry is not None and self._is_watched(key):
+                return True, entry.value
+        signature = self._signature(key)
+        if signature is None:
+            self.invalidate(key)
+            return False, None
+        if entry is not None and entry.signature == signature:
+            return True, entry.value
+        value = loader(key)
+        with self._lock:
+            self._entries[(key, kind)] = _Entry(signature=signature, value=value)
+        return True, value
+
+    def read_text(self, path: PathLike, encoding: str = 'utf-8') -> Optional[str]:
+        """Conteúdo do arquivo (None se não existir)"""
+        _, value = self._get(path, 'text', lambda p: Path(p).read_text(encoding=encoding))
+        return value
+
+    def read_json(self, path: PathLike, default: Any = None) -> Any:
+        """JSON parseado (default se não existir). O objeto é compartilhado: não mutar."""
+        exists, value = self._get(
+            path, 'json', lambda p: json.loads(Path(p).read_text(encoding='utf-8'))
+        )
+        return value if exists else default
+
+    def write_json(self, path: PathLike, data: Any, indent: int = 2):
+        """Grava JSON (arquivo temporário + replace) e atualiza o cache"""
+        key = self._key(path)
+        tmp = f"{key}.tmp"
+        Path(tmp).write_text(json.dumps(data, ensure_ascii=False, indent=indent), encoding='utf-8')
+        os.replace(tmp, key)
+        signature = self._signature(key)
+        with self._lock:
+            self._entries.pop((key, 'text'), None)
+            if signature is not None:
+                self._entries[(key, 'json')] = _Entry(signature=signature, value=data)
+
+    def load_dotenv(self, path: PathLike, override: bool = False) -> bool:
+        """Executa dotenv.load_dotenv só quando o .env mudou desde a última carga"""
+        def _load(p: str) -> bool:
+            try:
+                from dotenv import load_dotenv
+            except ImportError:
+                return False
+            return bool(load_dotenv(p, override=override))
+
+        exists, loaded = self._get(path, 'dotenv', _load)
+        return bool(exists and loaded)
+
+    def invalidate(self, path: Optional[PathLike] = None):
+        """Descarta entradas de um caminho (ou todas)"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            key = self._key(path)
+            for entry_key in [k for k in self._entries if k[0] == key]:
+                del self._entries[entry_key]
+
+    def watch(self, directory: PathLike) -> bool:
+        """Observa uma pasta com watchdog; retorna False se watchdog não estiver instalado"""
+        if not WATCHDOG_AVAILABLE:
+            return False
+        key = self._key(directory)
+        if key in self._watched:
+            return True
+        try:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            self._observer.schedule(_InvalidateHandler(self), key, recursive=False)
+        except Exception as e:
+            logger.debug("Não foi possível observar %s: %s", key, e)
+            return False
+        with self._lock:
+            self._watched.add(key)
+        return True
+
+    def stop(self):
+        """Para o observador do watchdog (se ativo)"""
+        observer, self._observer = self._observer, None
+        self._watched.clear()
+        if observer is not None:
+            observer.stop()
+
+
+# Instância global
+_resource_cache: Optional[ResourceCache] = None
+
+
+def get_resource_cache() -> ResourceCache:
+    """Retorna instância global do cache de recursos"""
+    global _resource_cache
+    if _resource_cache is None:
+        _resource_cache = ResourceCache()
+    return _resource_cache
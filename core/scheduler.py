@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Scheduler - Agendador de tarefas por min-heap
+Tarefas proativas disparam no horário exato: o loop dorme até o próximo prazo
+e acorda antes quando uma tarefa mais cedo é agendada.
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledTask:
+    """Handle de uma tarefa agendada (cancelável)"""
+    time: datetime
+    message: str
+    source: str = 'user'
+    task_id: str = field(default_factory=lambda: f"task_{uuid.uuid4().hex[:8]}")
+    data: Dict[str, Any] = field(default_factory=dict)
+    cancelled: bool = False
+    executed: bool = False
+
+    def cancel(self) -> bool:
+        """Cancela a tarefa. Retorna False se ela já foi executada."""
+        if self.executed:
+            return False
+        self.cancelled = True
+        return True
+
+    def to_action(self) -> Dict[str, Any]:
+        """Ação proativa no formato de check_proactive()"""
+        return {
+            'type': self.data.get('type', 'reminder'),
+            'message': self.message,
+            'source': self.source,
+            'task_id': self.task_id,
+        }
+
+
+class TaskScheduler:
+    """
+    Agendador baseado em heap
+
+    - schedule(): O(log n), retorna handle cancelável
+    - Tarefas canceladas saem do heap quando chegam ao topo (remoção preguiçosa)
+    - run(): dorme até o próximo prazo e chama on_due(task) para cada tarefa vencida
+    """
+
+    def __init__(self, on_due: Optional[Callable[[ScheduledTask], Awaitable[None]]] = None):
+        self._heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._counter = itertools.count()
+        self._by_id: Dict[str, ScheduledTask] = {}
+        self._on_due = on_due
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, time: datetime, message: str, source: str = 'user', **data) -> ScheduledTask:
+        """Agenda uma tarefa e acorda o loop se ela for a mais próxima"""
+        task = ScheduledTask(time=time, message=message, source=source, data=data)
+        earliest = self._peek()
+        heapq.heappush(self._heap, (time.timestamp(), next(self._counter), task))
+        self._by_id[task.task_id] = task
+        if self._wakeup is not None and (earliest is None or time < earliest.time):
+            self._wakeup.set()
+        return task
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancela uma tarefa pelo id"""
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return False
+        return task.cancel()
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[ScheduledTask]:
+        """Remove e retorna as tarefas vencidas (em ordem de prazo)"""
+        now_ts = (now or datetime.now()).timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, _, task = heapq.heappop(self._heap)
+            self._by_id.pop(task.task_id, None)
+            if task.cancelled:
+                continue
+            task.executed = True
+            due.append(task)
+        return due
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Prazo da próxima tarefa ativa (None se não houver)"""
+        task = self._peek()
+        return task.time if task else None
+
+    def _peek(self) -> Optional[ScheduledTask]:
+        while self._heap and self._heap[0][2].cancelled:
+            _, _, task = heapq.heappop(self._heap)
+            self._by_id.pop(task.task_id, None)
+        return self._heap[0][2] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def start(self):
+        """Inicia o loop do agendador (exige on_due)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.run(), name="task_scheduler")
+
+    async def stop(self):
+        """Para o loop; tarefas pendentes continuam no heap"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._wakeup = None
+
+    async def run(self):
+        """Dorme até o próximo prazo (ou até schedule() acordar) e despacha as tarefas vencidas"""
+        while True:
+            try:
+                for task in self.pop_due():
+                    if self._on_due is not None:
+                        try:
+                            await self._on_due(task)
+                        except Exception as e:
+                            logger.error(f"Erro ao despachar tarefa {task.task_id}: {e}")
+
+                self._wakeup.clear()
+                deadline = self.next_deadline()
+                timeout = None
+                if deadline is not None:
+                    timeout = max(0.0, (deadline - datetime.now()).total_seconds())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Semantic Cache - Cache semântico de respostas da IA
+Baseado no cache FAISS legado (_backup_limpeza/legado/src/cache/semantic.py):
+hash exato primeiro, depois similaridade de cosseno entre embeddings.
+
+- Escopo por (source, system prompt): prompts diferentes nunca compartilham respostas;
+  perguntas iguais de contatos diferentes sim
+- Follow-ups ("e o segundo?", "explica isso melhor") dependem da conversa: nunca entram no cache
+- FAISS (IndexFlatIP) quando instalado; senão busca bruta com NumPy
+- TTL por entrada e limite de entradas por escopo
+- Persistido em data/cache/semantic/<escopo>.npz (run_jarvis_message é um processo por mensagem)
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import inc_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+try:
+    import faiss
+    HAS_FAISS = True
+except ImportError:
+    faiss = None
+    HAS_FAISS = False
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache" / "semantic"
+
+# Perguntas que só fazem sentido com a conversa anterior (texto já normalizado por _clean_text)
+_FOLLOW_UP_PATTERN = re.compile(
+    r"^(?:e|mas|então|entao|também|tambem|ok e)\s"
+    r"|\b(?:ele|ela|eles|elas|dele|dela|deles|delas|nele|nela|isso|isto|disso|disto|nisso|nisto"
+    r"|esse|essa|esses|essas|desse|dessa|nesse|nessa|aquele|aquela|aquilo|daquele|daquela"
+    r"|anterior|acima|outro|outra|primeiro|primeira|segundo|segunda|último|última|ultimo|ultima"
+    r"|de novo|novamente|continue|continua|mais detalhes)\b"
+)
+
+Embedder = Callable[[str], Awaitable[Sequence[float]]]
+
+
+@dataclass
+class CacheEntry:
+    """Pergunta/resposta cacheada"""
+    question_hash: str
+    question: str
+    answer: str
+    created_at: float
+    expires_at: float
+
+
+class _ScopeIndex:
+    """Vetores normalizados + entradas de um escopo"""
+
+    def __init__(self):
+        self.vectors = None  # np.ndarray (n, dim) float32
+        self.entries: List[CacheEntry] = []
+        self.by_hash: Dict[str, int] = {}
+        self._faiss = None
+
+    def _rebuild(self):
+        self.by_hash = {e.question_hash: i for i, e in enumerate(self.entries)}
+        self._faiss = None
+        if HAS_FAISS and self.vectors is not None and len(self.entries):
+            self._faiss = faiss.IndexFlatIP(self.vectors.shape[1])
+            self._faiss.add(self.vectors)
+
+    def search(self, vec) -> Tuple[float, int]:
+        """(similaridade, índice) do vizinho mais próximo; (-1, -1) se vazio"""
+        if self.vectors is None or not len(self.entries) or vec.shape[0] != self.vectors.shape[1]:
+            return -1.0, -1
+        if self._faiss is not None:
+            scores, ids = self._faiss.search(vec.reshape(1, -1), 1)
+            return float(scores[0][0]), int(ids[0][0])
+        scores = self.vectors @ vec
+        idx = int(np.argmax(scores))
+        return float(scores[idx]), idx
+
+    def add(self, vec, entry: CacheEntry, max_entries: int):
+        if self.vectors is not None and self.vectors.shape[1] != vec.shape[0]:
+            # Modelo de embedding mudou: recomeça o escopo
+            self.vectors, self.entries = None, []
+        row = vec.reshape(1, -1)
+        self.vectors = row if self.vectors is None else np.vstack([self.vectors, row])
+        self.entries.append(entry)
+        self.prune(time.time(), max_entries)
+
+    def snapshot(self) -> Tuple[Optional['np.ndarray'], List[CacheEntry]]:
+        """Cópia de vetores e entradas para gravar fora do loop"""
+        vectors = self.vectors.copy() if self.vectors is not None else None
+        return vectors, list(self.entries)
+
+    def prune(self, now: float, max_entries: int):
+        """Remove expiradas e as mais antigas além do limite"""
+        keep = [i for i, e in enumerate(self.entries) if e.expires_at > now][-max_entries:]
+        if len(keep) != len(self.entries):
+            self.entries = [self.entries[i] for i in keep]
+            self.vectors = self.vectors[keep] if keep else None
+        self._rebuild()
+
+
+class SemanticCache:
+    """
+    Cache semântico de respostas
+
+    Uso:
+        cache = SemanticCache(embed=ai.get_embedding)
+        scope = SemanticCache.scope_key('whatsapp', system_prompt)
+        answer, vec = await cache.lookup(pergunta, scope)
+        if answer is None:
+            ...
+            await cache.store(pergunta, resposta, scope, vec)
+    """
+
+    def __init__(
+        self,
+        embed: Embedder,
+        threshold: float = 0.92,
+        ttl_hours: float = 24,
+        max_entries: int = 1000,
+        min_chars: int = 12,
+        cache_dir: Optional[Path] = None,
+    ):
+        self._embed = embed
+        self.threshold = threshold
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.min_chars = min_chars
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self._scopes: Dict[str, _ScopeIndex] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def available() -> bool:
+        """NumPy é obrigatório (FAISS é opcional)"""
+        return HAS_NUMPY
+
+    @staticmethod
+    def scope_key(source: str, system_prompt: str) -> str:
+        """Escopo do cache: origem + hash do system prompt"""
+        digest = hashlib.sha256(f"{source}\n{system_prompt}".encode('utf-8')).hexdigest()[:16]
+        return f"{source}_{digest}"
+
+    @staticmethod
+    def _clean_text(text: str) -> str:
+        text = (text or "").lower().strip()
+        text = re.sub(r'[^\w\s]', '', text)
+        return re.sub(r'\s+', ' ', text)
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+    @classmethod
+    def depends_on_conversation(cls, question: str) -> bool:
+        """Follow-up ou referência ao que já foi dito: a resposta vale só para aquela conversa"""
+        return bool(_FOLLOW_UP_PATTERN.search(cls._clean_text(question)))
+
+    def cacheable(self, question: str) -> bool:
+        """Perguntas curtas ("sim", "ok") dependem do contexto: nunca entram no cache"""
+        return self.available() and len(self._clean_text(question)) >= self.min_chars
+
+    async def lookup(self, question: str, scope: str):
+        """
+        Busca resposta para a pergunta no escopo.
+        Retorna (resposta ou None, vetor da pergunta ou None) — o vetor é reaproveitado em store().
+        """
+        if not self.cacheable(question):
+            return None, None
+        index = await self._get_scope(scope)
+        now = time.time()
+        clean = self._clean_text(question)
+
+        idx = index.by_hash.get(self._hash(clean))
+        if idx is not None and index.entries[idx].expires_at > now:
+            self._record(True)
+            logger.info("📦 Cache semântico HIT (hash exato)")
+            return index.entries[idx].answer, None
+
+        vec = await self._vector(clean)
+        if vec is not None:
+            similarity, idx = index.search(vec)
+            if idx >= 0 and similarity >= self.threshold and index.entries[idx].expires_at > now:
+                self._record(True)
+                logger.info(f"📦 Cache semântico HIT (sim={similarity:.3f})")
+                return index.entries[idx].answer, vec
+
+        self._record(False)
+        return None, vec
+
+    async def store(self, question: str, answer: str, scope: str, vec=None):
+        """Guarda a resposta (use só para turnos sem ferramentas e bem-sucedidos)"""
+        if not answer or not self.cacheable(question):
+            return
+        clean = self._clean_text(question)
+        if vec is None:
+            vec = await self._vector(clean)
+            if vec is None:
+                return
+        now = time.time()
+        index = await self._get_scope(scope)
+        entry = CacheEntry(
+            question_hash=self._hash(clean),
+            question=question[:200],
+            answer=answer,
+            created_at=now,
+            expires_at=now + self.ttl_seconds,
+        )
+        existing = index.by_hash.get(entry.question_hash)
+        if existing is not None:
+            index.entries[existing] = entry
+        else:
+            index.add(vec, entry, self.max_entries)
+        # Cópia do escopo: o índice pode mudar no loop enquanto o executor grava
+        vectors, entries = index.snapshot()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._save_scope, scope, vectors, entries)
+        except Exception as e:
+            logger.debug(f"Não foi possível salvar cache semântico: {e}")
+
+    def stats(self) -> Dict:
+        """Hits, misses, taxa de acerto e entradas por escopo carregado"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            'entries': {scope: len(index.entries) for scope, index in self._scopes.items()},
+            'backend': 'faiss' if HAS_FAISS else 'numpy',
+        }
+
+    def _record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        inc_cache_lookup('semantic', 'hit' if hit else 'miss')
+
+    async def _vector(self, text: str):
+        try:
+            values = await self._embed(text)
+        except Exception as e:
+            logger.debug(f"Embedding falhou: {e}")
+            return None
+        if values is None or not len(values):
+            return None
+        vec = np.asarray(values, dtype='float32').reshape(-1)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def _scope_path(self, scope: str) -> Path:
+        return self.cache_dir / f"{scope}.npz"
+
+    async def _get_scope(self, scope: str) -> _ScopeIndex:
+        index = self._scopes.get(scope)
+        if index is None:
+            # np.load do escopo fora do event loop; outro pedido pode ter carregado enquanto isso
+            loaded = await asyncio.get_running_loop().run_in_executor(None, self._load_scope, scope)
+            index = self._scopes.setdefault(scope, loaded)
+        return index
+
+    def _load_scope(self, scope: str) -> _ScopeIndex:
+        index = _ScopeIndex()
+        path = self._scope_path(scope)
+        if not path.exists():
+            return index
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                vectors = data['vectors'].astype('float32')
+                entries = [CacheEntry(**e) for e in json.loads(str(data['entries']))]
+            if len(entries) == len(vectors) and len(entries):
+                index.vectors, index.entries = vectors, entries
+            index.prune(time.time(), self.max_entries)
+        except Exception as e:
+            logger.warning(f"⚠️ Cache semântico {scope} ignorado: {e}")
+            return _ScopeIndex()
+        return index
+
+    def _save_scope(self, scope: str, vectors, entries: List[CacheEntry]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._scope_path(scope)
+        tmp = path.with_suffix('.tmp')
+        if vectors is None:
+            vectors = np.zeros((0, 0), dtype='float32')
+        with open(tmp, 'wb') as f:
+            np.savez(f, vectors=vectors, entries=np.array(json.dumps([asdict(e) for e in entries])))
+        os.replace(tmp, path)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming - Entrega de tokens da IA até as interfaces
+O destino dos deltas (sink) viaja por contextvar, então Jarvis → Orquestrador →
+AIModule → JarvisAI não precisam repassar parâmetros extras.
+
+Uso:
+    async for delta in jarvis.process_stream("Olá"):
+        print(delta, end="", flush=True)
+
+Autor: JARVIS Team
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+StreamSink = Callable[[str], Awaitable[None]]
+
+_stream_sink: ContextVar[Optional[StreamSink]] = ContextVar('jarvis_stream_sink', default=None)
+
+
+def get_stream_sink() -> Optional[StreamSink]:
+    """Sink ativo (None = resposta não é transmitida)"""
+    return _stream_sink.get()
+
+
+@contextmanager
+def stream_to(sink: Optional[StreamSink]) -> Iterator[None]:
+    """Direciona os deltas de texto gerados neste contexto para sink (None desliga)"""
+    token = _stream_sink.set(sink)
+    try:
+        yield
+    finally:
+        _stream_sink.reset(token)
+
+
+async def stream_call(call: Callable[[], Awaitable[object]]) -> AsyncIterator[object]:
+    """
+    Executa call() com um sink de fila e produz os deltas conforme chegam.
+    O último item produzido é o resultado final de call() embrulhado em StreamResult.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def sink(delta: str):
+        queue.put_nowait(delta)
+
+    async def run():
+        with stream_to(sink):
+            return await call()
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            while not queue.empty():
+                yield queue.get_nowait()
+            yield StreamResult(task.result())
+            return
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+class StreamResult:
+    """Valor final de stream_call (distingue o resultado dos deltas de texto)"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
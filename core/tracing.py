@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Tracing - Spans leves por requisição
+Cada etapa abre um span (contextvar); ao fechar o span raiz a árvore inteira
+é exportada como JSON compacto (nome, duração em ms, atributos, filhos).
+
+Uso:
+    with span('orchestrator.route', module='search') as s:
+        ...
+        s.set(tokens=123)
+
+Desligue com JARVIS_TRACING=0.
+
+Autor: JARVIS Team
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING_ENABLED = os.getenv('JARVIS_TRACING', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('jarvis_current_span', default=None)
+_exporters: List[Callable[[Dict[str, Any]], None]] = []
+
+
+@dataclass
+class Span:
+    """Uma etapa cronometrada da requisição"""
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start: float = field(default_factory=time.perf_counter)
+    end: Optional[float] = None
+    children: List['Span'] = field(default_factory=list)
+    error: Optional[str] = None
+
+    def set(self, **attributes):
+        """Adiciona atributos (valores None são ignorados)"""
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return round((end - self.start) * 1000, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Árvore compacta: só inclui attrs/error/children quando existem"""
+        data: Dict[str, Any] = {'name': self.name, 'ms': self.duration_ms}
+        if self.attributes:
+            data['attrs'] = self.attributes
+        if self.error:
+            data['error'] = self.error
+        if self.children:
+            data['children'] = [child.to_dict() for child in self.children]
+        return data
+
+
+class _NoopSpan:
+    """Span usado com tracing desligado"""
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """
+    Abre um span filho do span atual (ou raiz, se não houver).
+    Tasks criadas dentro do span herdam o contexto e penduram seus spans nele.
+    """
+    if not TRACING_ENABLED:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    current = Span(name=name)
+    current.set(**attributes)
+    if parent is not None:
+        parent.children.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter()
+        _current_span.reset(token)
+        if parent is None:
+            _export(current)
+
+
+def current_span() -> Optional[Span]:
+    """Span ativo no contexto atual"""
+    return _current_span.get()
+
+
+def add_span_exporter(exporter: Callable[[Dict[str, Any]], None]):
+    """Registra destino das árvores de spans (recebe o dict da árvore raiz)"""
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+def remove_span_exporter(exporter: Callable[[Dict[str, Any]], None]):
+    """Remove destino registrado"""
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def format_trace(tree: Dict[str, Any]) -> str:
+    """JSON compacto de uma árvore exportada"""
+    return json.dumps(tree, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def _export(root: Span):
+    tree = root.to_dict()
+    tree['trace_id'] = uuid.uuid4().hex[:12]
+    if not _exporters:
+        logger.debug("trace %s", format_trace(tree))
+        return
+    for exporter in list(_exporters):
+        try:
+            exporter(tree)
+        except Exception as e:
+            logger.debug(f"Exportador de trace falhou: {e}")
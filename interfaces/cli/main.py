@@ -13,7 +13,7 @@ import sys
 from datetime import datetime
 from typing import Optional
 
-from .components import Colors, clear_screen, print_header, print_box, print_typing
+from .components import Colors, clear_screen, print_header, print_box
 
 
 class JarvisCLI:
@@ -145,17 +145,25 @@ class JarvisCLI:
         # Mostra indicador de processamento
         print(f"\n{Colors.CYAN}🤖 {self.jarvis.name}:{Colors.END} ", end="", flush=True)
         
-        # Processa
-        response = await self.jarvis.process(message, source='cli')
+        # Processa em streaming: tokens aparecem conforme a IA gera
+        deltas = self._render_stream(self.jarvis.process_stream(message, source='cli'))
         
-        # Exibe resposta com efeito de digitação
-        await print_typing(response)
-        
-        # Fala resposta se em modo voz
+        # Em modo voz, fala cada frase assim que termina
+        voice_module = None
         if speak_response and self._voice_mode:
             voice_module = self.jarvis.orchestrator.modules.get('voice')
-            if voice_module:
-                await voice_module.speak(response)
+        if voice_module and hasattr(voice_module, 'speak_stream'):
+            await voice_module.speak_stream(deltas)
+        else:
+            async for _ in deltas:
+                pass
+        print()
+    
+    async def _render_stream(self, deltas):
+        """Imprime os deltas conforme chegam e os repassa adiante"""
+        async for delta in deltas:
+            print(delta, end='', flush=True)
+            yield delta
     
     async def _greet(self):
         """Mensagem de boas-vindas"""
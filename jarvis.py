@@ -218,7 +218,7 @@ async def run_mcp_mode(args):
 🛠️ Ferramentas: {tools}
 🤖 Modelo: {ai.model}
 🔊 TTS: {'Ativo' if tts else 'Inativo'}
-⏱️ Histórico: {len(ai.conversation_history)} mensagens
+⏱️ Histórico: {len(ai.get_history())} mensagens
 """)
                     continue
                 
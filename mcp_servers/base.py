@@ -25,6 +25,10 @@ class Tool:
     description: str
     parameters: Dict[str, Any] = field(default_factory=dict)
     required: List[str] = field(default_factory=list)
+    # Ferramentas com efeito colateral (enviar, escrever, matar processo) nunca rodam em paralelo
+    side_effects: bool = False
+    # Timeout próprio em segundos (None = padrão do cliente)
+    timeout: Optional[float] = None
     
     def to_dict(self) -> Dict:
         return {
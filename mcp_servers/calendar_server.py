@@ -40,7 +40,8 @@ class CalendarServer(MCPServer):
                     "description": {"type": "string", "description": "Descrição do evento (opcional)"},
                     "location": {"type": "string", "description": "Local do evento (opcional)"}
                 },
-                required=["title", "start_time"]
+                required=["title", "start_time"],
+                side_effects=True
             ),
             self._handle_create_event
         )
@@ -69,7 +70,8 @@ class CalendarServer(MCPServer):
                     "time": {"type": "string", "description": "Data/hora do lembrete (ISO format)"},
                     "recurring": {"type": "string", "description": "Recorrência: daily, weekly, monthly (opcional)"}
                 },
-                required=["message", "time"]
+                required=["message", "time"],
+                side_effects=True
             ),
             self._handle_create_reminder
         )
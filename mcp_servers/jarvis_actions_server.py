@@ -46,6 +46,7 @@ class JarvisActionsServer(MCPServer):
                     }
                 },
                 required=["contact"],
+                side_effects=True,
             ),
             self._whatsapp_monitor,
         )
@@ -66,6 +67,7 @@ class JarvisActionsServer(MCPServer):
                     },
                 },
                 required=["contact"],
+                side_effects=True,
             ),
             self._whatsapp_autoreply_enable,
         )
@@ -82,6 +84,7 @@ class JarvisActionsServer(MCPServer):
                     }
                 },
                 required=[],
+                side_effects=True,
             ),
             self._whatsapp_autoreply_disable,
         )
@@ -102,6 +105,7 @@ class JarvisActionsServer(MCPServer):
                     },
                 },
                 required=["contact", "tone"],
+                side_effects=True,
             ),
             self._whatsapp_autopilot_set_tone,
         )
@@ -140,6 +144,7 @@ class JarvisActionsServer(MCPServer):
                     }
                 },
                 required=[],
+                side_effects=True,
             ),
             self._whatsapp_monitor_disable,
         )
@@ -160,6 +165,7 @@ class JarvisActionsServer(MCPServer):
                     },
                 },
                 required=["contact", "message"],
+                side_effects=True,
             ),
             self._whatsapp_send,
         )
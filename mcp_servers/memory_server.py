@@ -18,6 +18,7 @@ from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.async_db import AsyncDatabase
 from mcp_servers.base import MCPServer, Tool
 
 logger = logging.getLogger(__name__)
@@ -80,7 +81,8 @@ class MemoryServer(MCPServer):
                         "description": "Categoria: user_info, facts, preferences, identity"
                     }
                 },
-                required=["key", "value"]
+                required=["key", "value"],
+                side_effects=True
             ),
             self.remember
         )
@@ -120,7 +122,8 @@ class MemoryServer(MCPServer):
                         "description": "Categoria"
                     }
                 },
-                required=["key"]
+                required=["key"],
+                side_effects=True
             ),
             self.forget
         )
@@ -178,7 +181,8 @@ class MemoryServer(MCPServer):
                         "description": "Resposta do assistente"
                     }
                 },
-                required=["user_message", "assistant_response"]
+                required=["user_message", "assistant_response"],
+                side_effects=True
             ),
             self.save_conversation
         )
@@ -204,61 +208,25 @@ class MemoryServer(MCPServer):
     # === DATABASE ===
     
     async def _init_database(self):
-        """Inicializa conexão com banco"""
+        """Inicializa conexão com banco (acesso fora do event loop, ver core.async_db)"""
         try:
-            from dotenv import load_dotenv
-            load_dotenv(Path(__file__).parent.parent / '.env')
+            from core.resource_cache import get_resource_cache
+            get_resource_cache().load_dotenv(Path(__file__).parent.parent / '.env')
         except:
             pass
         
-        db_type = os.getenv('DATABASE_TYPE', 'sqlite')
-        
-        if db_type == 'mysql':
-            await self._init_mysql()
-        else:
-            await self._init_sqlite()
-    
-    async def _init_mysql(self):
-        """Conecta ao MySQL"""
-        try:
-            import mysql.connector
-            
-            self._db = mysql.connector.connect(
-                host=os.getenv('MYSQL_HOST', '127.0.0.1'),
-                port=int(os.getenv('MYSQL_PORT', 3306)),
-                user=os.getenv('MYSQL_USER', 'root'),
-                password=os.getenv('MYSQL_PASSWORD', ''),
-                database=os.getenv('MYSQL_DATABASE', 'jarvis_db')
-            )
-            self._db_type = 'mysql'
-            
-            await self._create_tables()
-            logger.info("✅ MySQL conectado")
-            
-        except Exception as e:
-            logger.warning(f"MySQL falhou: {e}, usando SQLite")
-            await self._init_sqlite()
-    
-    async def _init_sqlite(self):
-        """Conecta ao SQLite"""
-        import sqlite3
-        
-        db_path = Path(__file__).parent.parent / 'data' / 'jarvis.db'
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        self._db = sqlite3.connect(str(db_path))
-        self._db.row_factory = sqlite3.Row
-        self._db_type = 'sqlite'
-        
+        self._db = await AsyncDatabase.open(
+            os.getenv('DATABASE_TYPE', 'sqlite'),
+            sqlite_path=Path(__file__).parent.parent / 'data' / 'jarvis.db'
+        )
+        self._db_type = self._db.dialect
         await self._create_tables()
-        logger.info(f"✅ SQLite: {db_path}")
     
     async def _create_tables(self):
         """Cria tabelas necessárias"""
-        cursor = self._db.cursor()
-        
         if self._db_type == 'mysql':
-            cursor.execute("""
+            await self._db.executescript([
+                """
                 CREATE TABLE IF NOT EXISTS jarvis_memory (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     category VARCHAR(50) NOT NULL,
@@ -268,18 +236,19 @@ class MemoryServer(MCPServer):
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                     UNIQUE KEY unique_memory (category, key_name)
                 )
-            """)
-            
-            cursor.execute("""
+                """,
+                """
                 CREATE TABLE IF NOT EXISTS jarvis_conversations (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     user_message TEXT,
                     assistant_response TEXT,
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-            """)
+                """,
+            ])
         else:
-            cursor.execute("""
+            await self._db.executescript([
+                """
                 CREATE TABLE IF NOT EXISTS jarvis_memory (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     category TEXT NOT NULL,
@@ -289,31 +258,24 @@ class MemoryServer(MCPServer):
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE(category, key_name)
                 )
-            """)
-            
-            cursor.execute("""
+                """,
+                """
                 CREATE TABLE IF NOT EXISTS jarvis_conversations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_message TEXT,
                     assistant_response TEXT,
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
-            """)
-        
-        self._db.commit()
+                """,
+            ])
     
     async def _load_all_memories(self):
         """Carrega todas as memórias para o cache"""
         try:
-            cursor = self._db.cursor()
-            cursor.execute("SELECT category, key_name, value FROM jarvis_memory")
-            rows = cursor.fetchall()
+            rows = await self._db.fetchall("SELECT category, key_name, value FROM jarvis_memory")
             
             for row in rows:
-                if self._db_type == 'mysql':
-                    category, key, value = row
-                else:
-                    category, key, value = row['category'], row['key_name'], row['value']
+                category, key, value = row['category'], row['key_name'], row['value']
                 
                 try:
                     value = json.loads(value)
@@ -340,22 +302,18 @@ class MemoryServer(MCPServer):
             self._cache[category][key] = value
             
             # Salva no banco
-            cursor = self._db.cursor()
-            
             if self._db_type == 'mysql':
-                cursor.execute("""
+                await self._db.execute("""
                     INSERT INTO jarvis_memory (category, key_name, value)
-                    VALUES (%s, %s, %s)
-                    ON DUPLICATE KEY UPDATE value = %s, updated_at = NOW()
+                    VALUES (?, ?, ?)
+                    ON DUPLICATE KEY UPDATE value = ?, updated_at = NOW()
                 """, (category, key, value, value))
             else:
-                cursor.execute("""
+                await self._db.execute("""
                     INSERT OR REPLACE INTO jarvis_memory (category, key_name, value, updated_at)
                     VALUES (?, ?, ?, datetime('now'))
                 """, (category, key, value))
             
-            self._db.commit()
-            
             return f"✅ Memorizado: {key} = {value} (categoria: {category})"
             
         except Exception as e:
@@ -384,20 +342,10 @@ class MemoryServer(MCPServer):
                 del self._cache[category][key]
             
             # Remove do banco
-            cursor = self._db.cursor()
-            
-            if self._db_type == 'mysql':
-                cursor.execute(
-                    "DELETE FROM jarvis_memory WHERE category = %s AND key_name = %s",
-                    (category, key)
-                )
-            else:
-                cursor.execute(
-                    "DELETE FROM jarvis_memory WHERE category = ? AND key_name = ?",
-                    (category, key)
-                )
-            
-            self._db.commit()
+            await self._db.execute(
+                "DELETE FROM jarvis_memory WHERE category = ? AND key_name = ?",
+                (category, key)
+            )
             
             return f"✅ Esquecido: {key}"
             
@@ -439,24 +387,12 @@ class MemoryServer(MCPServer):
     async def get_conversation_history(self, limit: int = 10) -> str:
         """Retorna histórico de conversas"""
         try:
-            cursor = self._db.cursor()
-            
-            if self._db_type == 'mysql':
-                cursor.execute("""
-                    SELECT user_message, assistant_response, timestamp 
-                    FROM jarvis_conversations 
-                    ORDER BY timestamp DESC 
-                    LIMIT %s
-                """, (limit,))
-            else:
-                cursor.execute("""
-                    SELECT user_message, assistant_response, timestamp 
-                    FROM jarvis_conversations 
-                    ORDER BY timestamp DESC 
-                    LIMIT ?
-                """, (limit,))
-            
-            rows = cursor.fetchall()
+            rows = await self._db.fetchall("""
+                SELECT user_message, assistant_response, timestamp 
+                FROM jarvis_conversations 
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            """, (limit,))
             
             if not rows:
                 return "📭 Histórico vazio"
@@ -464,10 +400,7 @@ class MemoryServer(MCPServer):
             lines = ["📜 **Histórico de Conversas**\n"]
             
             for row in reversed(rows):
-                if self._db_type == 'mysql':
-                    user_msg, assistant_msg, ts = row
-                else:
-                    user_msg, assistant_msg, ts = row['user_message'], row['assistant_response'], row['timestamp']
+                user_msg, assistant_msg = row['user_message'], row['assistant_response']
                 
                 lines.append(f"👤 {user_msg[:100]}...")
                 lines.append(f"🤖 {assistant_msg[:100]}...")
@@ -481,20 +414,10 @@ class MemoryServer(MCPServer):
     async def save_conversation(self, user_message: str, assistant_response: str) -> str:
         """Salva conversa no histórico"""
         try:
-            cursor = self._db.cursor()
-            
-            if self._db_type == 'mysql':
-                cursor.execute("""
-                    INSERT INTO jarvis_conversations (user_message, assistant_response)
-                    VALUES (%s, %s)
-                """, (user_message, assistant_response))
-            else:
-                cursor.execute("""
-                    INSERT INTO jarvis_conversations (user_message, assistant_response)
-                    VALUES (?, ?)
-                """, (user_message, assistant_response))
-            
-            self._db.commit()
+            await self._db.execute("""
+                INSERT INTO jarvis_conversations (user_message, assistant_response)
+                VALUES (?, ?)
+            """, (user_message, assistant_response))
             
             return "✅ Conversa salva"
             
@@ -515,6 +438,13 @@ class MemoryServer(MCPServer):
             return f"🔍 Nada encontrado para '{query}'"
         
         return f"🔍 **Resultados para '{query}'**\n\n" + "\n".join(results[:20])
+    
+    def stop(self):
+        """Para o server e fecha o banco (depois das escritas pendentes)"""
+        super().stop()
+        if self._db:
+            self._db.close()
+            self._db = None
 
 
 # === MAIN ===
@@ -42,8 +42,8 @@ class SearchServer(MCPServer):
     def _load_env(self):
         """Carrega variáveis de ambiente"""
         try:
-            from dotenv import load_dotenv
-            load_dotenv(Path(__file__).parent.parent / '.env')
+            from core.resource_cache import get_resource_cache
+            get_resource_cache().load_dotenv(Path(__file__).parent.parent / '.env')
         except:
             pass
         
@@ -150,15 +150,19 @@ class SearchServer(MCPServer):
         try:
             from duckduckgo_search import DDGS
             
-            results = []
+            def _search():
+                with DDGS() as ddgs:
+                    return [
+                        {
+                            'title': r.get('title', ''),
+                            'body': r.get('body', ''),
+                            'href': r.get('href', '')
+                        }
+                        for r in ddgs.text(query, max_results=max_results)
+                    ]
             
-            with DDGS() as ddgs:
-                for r in ddgs.text(query, max_results=max_results):
-                    results.append({
-                        'title': r.get('title', ''),
-                        'body': r.get('body', ''),
-                        'href': r.get('href', '')
-                    })
+            # DDGS é síncrono: roda em thread para não travar outras ferramentas
+            results = await asyncio.get_running_loop().run_in_executor(None, _search)
             
             if not results:
                 return f"🔍 Nenhum resultado encontrado para '{query}'"
@@ -179,6 +183,12 @@ class SearchServer(MCPServer):
     
     async def wikipedia_search(self, query: str, sentences: int = 3) -> str:
         """Pesquisa na Wikipedia"""
+        # Biblioteca wikipedia é síncrona (HTTP bloqueante): roda em thread
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self._wikipedia_search_sync, query, sentences
+        )
+    
+    def _wikipedia_search_sync(self, query: str, sentences: int) -> str:
         try:
             import wikipedia
             wikipedia.set_lang('pt')
@@ -92,7 +92,8 @@ class ToolsServer(MCPServer):
                         "description": "Diretório de trabalho (opcional)"
                     }
                 },
-                required=["command"]
+                required=["command"],
+                side_effects=True
             ),
             self.run_command
         )
@@ -156,7 +157,8 @@ class ToolsServer(MCPServer):
                         "description": "Se True, adiciona ao final. Se False, sobrescreve."
                     }
                 },
-                required=["path", "content"]
+                required=["path", "content"],
+                side_effects=True
             ),
             self.write_file
         )
@@ -172,7 +174,8 @@ class ToolsServer(MCPServer):
                         "description": "Caminho do diretório a criar"
                     }
                 },
-                required=["path"]
+                required=["path"],
+                side_effects=True
             ),
             self.create_directory
         )
@@ -188,7 +191,8 @@ class ToolsServer(MCPServer):
                         "description": "Caminho do arquivo/pasta a deletar"
                     }
                 },
-                required=["path"]
+                required=["path"],
+                side_effects=True
             ),
             self.delete_file
         )
@@ -219,7 +223,8 @@ class ToolsServer(MCPServer):
                         "description": "Argumentos opcionais (ex: URL para chrome)"
                     }
                 },
-                required=["app_name"]
+                required=["app_name"],
+                side_effects=True
             ),
             self.open_application
         )
@@ -255,7 +260,8 @@ class ToolsServer(MCPServer):
                         "description": "Nome ou PID do processo"
                     }
                 },
-                required=["process"]
+                required=["process"],
+                side_effects=True
             ),
             self.kill_process
         )
@@ -89,8 +89,8 @@ class WhatsAppServer(MCPServer):
     def _load_env(self):
         """Carrega configurações"""
         try:
-            from dotenv import load_dotenv
-            load_dotenv(Path(__file__).parent.parent / '.env')
+            from core.resource_cache import get_resource_cache
+            get_resource_cache().load_dotenv(Path(__file__).parent.parent / '.env')
         except:
             pass
         
@@ -115,7 +115,8 @@ class WhatsAppServer(MCPServer):
                         "description": "Texto da mensagem"
                     }
                 },
-                required=["to", "message"]
+                required=["to", "message"],
+                side_effects=True
             ),
             self.send_whatsapp
         )
@@ -198,7 +199,8 @@ class WhatsAppServer(MCPServer):
                         "description": "Mensagem de resposta"
                     }
                 },
-                required=["contact", "message"]
+                required=["contact", "message"],
+                side_effects=True
             ),
             self.reply_whatsapp
         )
@@ -9,7 +9,10 @@ Versão: 3.0.0
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import AsyncIterator, Dict, Any, Optional, List
+
+from core.context_budget import ContextAssembler, history_from_messages
+from core.llm_pool import get_llm_pool
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,9 @@ class AIModule:
         self._engine = None
         self._running = False
         self.status = '🔴'
+        self._context_assembler = ContextAssembler(
+            budget=int(self.config.get('CONTEXT_TOKEN_BUDGET', 6000) or 6000)
+        )
         
         # Prompt de sistema padrão
         self.system_prompt = """Você é JARVIS, um assistente virtual inteligente inspirado no J.A.R.V.I.S. do Homem de Ferro.
@@ -92,7 +98,8 @@ Regras:
             if not api_key:
                 logger.warning("OPENAI_API_KEY não configurada")
                 return
-            self._client = openai.OpenAI(api_key=api_key)
+            # Cliente assíncrono compartilhado (sem thread por chamada)
+            self._client = get_llm_pool().get_client('openai', api_key=api_key)
             self._model = self.config.get('OPENAI_MODEL', 'gpt-4o-mini')
             self._engine = None
             self._jarvis_ai = None
@@ -104,6 +111,8 @@ Regras:
     
     async def stop(self):
         """Para o módulo"""
+        if self._jarvis_ai is not None:
+            await self._jarvis_ai.close()
         self._running = False
         self.status = '🔴'
     
@@ -126,7 +135,8 @@ Regras:
         # core.ai_engine.JarvisAI (sem src)
         if getattr(self, '_jarvis_ai', None):
             try:
-                r = await self._jarvis_ai.process(message, metadata=metadata or {})
+                ai_metadata = self._ai_metadata(intent, metadata, context)
+                r = await self._jarvis_ai.process(message, user_id=self._user_id(ai_metadata), metadata=ai_metadata)
                 return r.text if hasattr(r, 'text') else str(r)
             except Exception as e:
                 logger.error("Erro JarvisAI: %s", e)
@@ -137,6 +147,58 @@ Regras:
         # Fallback cliente OpenAI direto
         return await self._process_direct(message, context)
     
+    async def stream(self, message: str, intent, context: Dict, metadata: Dict) -> AsyncIterator[str]:
+        """
+        Versão em streaming de process(): produz deltas de texto.
+        Engine antigo (src) não transmite: produz a resposta inteira de uma vez.
+        """
+        if not self._running:
+            yield "Módulo de IA não está ativo."
+            return
+        
+        if getattr(self, '_jarvis_ai', None):
+            ai_metadata = self._ai_metadata(intent, metadata, context)
+            async for delta in self._jarvis_ai.stream(message, user_id=self._user_id(ai_metadata), metadata=ai_metadata):
+                yield delta
+            return
+        if self._engine:
+            yield await self._process_with_engine(message, context)
+            return
+        async for delta in self._stream_direct(message, context):
+            yield delta
+    
+    @staticmethod
+    def _user_id(metadata: Dict) -> str:
+        """Chave do histórico no JarvisAI: JID do contato, senão a origem (cli, voice)"""
+        return metadata.get('jid') or metadata.get('source') or 'default'
+    
+    @staticmethod
+    def _ai_metadata(intent, metadata: Optional[Dict], context: Optional[Dict] = None) -> Dict:
+        """
+        Metadata para o JarvisAI: intenção classificada e confiança (subconjunto de ferramentas e
+        camada de modelo), tom do autopilot do contato, resumo da conversa com o contato e,
+        para o status, a lista do autopilot.
+        """
+        intent_type = getattr(intent, 'type', intent)
+        if not intent_type:
+            return metadata or {}
+        out = {
+            **(metadata or {}),
+            'intent': intent_type,
+            'intent_confidence': getattr(intent, 'confidence', None),
+        }
+        autopilot_list = (context or {}).get('autopilot_list') or []
+        jid = out.get('jid')
+        if jid and 'tone' not in out:
+            entry = next((a for a in autopilot_list if a.get('jid') == jid), None)
+            if entry:
+                out['tone'] = entry.get('tone')
+        if intent_type == 'whatsapp_autopilot_status':
+            out['autopilot_list'] = autopilot_list
+        if (context or {}).get('conversation_summary'):
+            out['conversation_summary'] = context['conversation_summary']
+        return out
+    
     async def _process_with_engine(self, message: str, context: Dict) -> str:
         """Processa usando engine existente"""
         try:
@@ -166,42 +228,90 @@ Regras:
             logger.error(f"Erro no engine: {e}")
             return f"Desculpe, ocorreu um erro: {str(e)}"
     
+    def _direct_messages(self, message: str, context: Dict) -> List[Dict]:
+        """Mensagens para o cliente OpenAI direto (system + memória + histórico + atual), no orçamento de tokens"""
+        assembled = self._context_assembler.assemble(
+            self.system_prompt,
+            message,
+            history=history_from_messages(context.get('history', [])[-10:]),
+            memory=context.get('memory', ''),
+        )
+        return assembled.messages
+    
+    async def _direct_chat(self, messages: List[Dict], temperature: float = 0.7):
+        """chat.completions.create com o cliente compartilhado, dentro dos limites do pool"""
+        return await get_llm_pool().create_chat(
+            'ai_module',
+            self._client,
+            model=self._model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=1000
+        )
+    
     async def _process_direct(self, message: str, context: Dict) -> str:
         """Processa usando cliente OpenAI direto"""
         try:
-            # Contexto de memória
-            memory_context = context.get('memory', '')
-            
-            # System prompt com memória integrada
-            system_content = self.system_prompt
-            if memory_context:
-                system_content = f"{self.system_prompt}\n\n=== MEMÓRIA ===\n{memory_context}\n"
-            
-            messages = [{"role": "system", "content": system_content}]
-            
-            # Adiciona histórico
-            for msg in context.get('history', [])[-10:]:
-                messages.append(msg)
-            
-            # Adiciona mensagem atual
-            messages.append({"role": "user", "content": message})
+            response = await self._direct_chat(self._direct_messages(message, context))
+            return response.choices[0].message.content
             
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self._client.chat.completions.create(
+        except Exception as e:
+            logger.error(f"Erro OpenAI: {e}")
+            return f"Desculpe, ocorreu um erro ao processar: {str(e)}"
+    
+    async def _stream_direct(self, message: str, context: Dict) -> AsyncIterator[str]:
+        """Streaming com o cliente OpenAI direto"""
+        try:
+            async with get_llm_pool().slot('ai_module'):
+                stream = await self._client.chat.completions.create(
                     model=self._model,
-                    messages=messages,
+                    messages=self._direct_messages(message, context),
                     temperature=0.7,
-                    max_tokens=1000
+                    max_tokens=1000,
+                    stream=True
                 )
-            )
-            
-            return response.choices[0].message.content
-            
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"Erro OpenAI (stream): {e}")
+            yield f"Desculpe, ocorreu um erro ao processar: {str(e)}"
+    
+    async def complete(
+        self, prompt: str, cache_ttl: Optional[float] = None, temperature: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Gera texto a partir de um prompt autocontido (sem histórico nem ferramentas).
+        cache_ttl (segundos) opta pelo cache exato de prompts, só aplicado com temperature=0.
+        """
+        if not self._running:
+            return None
+        messages = [{"role": "user", "content": prompt}]
+        if getattr(self, '_jarvis_ai', None):
+            return await self._jarvis_ai.complete(messages, temperature=temperature, cache_ttl=cache_ttl)
+        if self._engine:
+            return await self._process_with_engine(prompt, {})
+        
+        if not self._client:
+            return None
+        
+        from core.prompt_cache import get_prompt_cache, prompt_cache_key
+        temperature = 0.7 if temperature is None else temperature
+        key = None
+        if cache_ttl and temperature == 0:
+            key = prompt_cache_key(self._model, messages, temperature, max_tokens=1000)
+            cached = await get_prompt_cache().aget(key)
+            if cached is not None:
+                return cached
+        try:
+            response = await self._direct_chat(messages, temperature=temperature)
         except Exception as e:
             logger.error(f"Erro OpenAI: {e}")
-            return f"Desculpe, ocorreu um erro ao processar: {str(e)}"
+            return None
+        text = (response.choices[0].message.content or "").strip() or None
+        if key and text:
+            await get_prompt_cache().aset(key, text, ttl=cache_ttl)
+        return text
     
     async def generate_simple(self, prompt: str) -> str:
         """
@@ -54,6 +54,19 @@ class CalendarModule(BaseModule):
         self.status = '🔴'
         logger.info("Módulo de calendário parado")
     
+    async def check_proactive(self) -> List[Dict[str, Any]]:
+        """Lembretes vencidos como ações proativas (chamado no prazo publicado pelo scheduler)"""
+        due = await self.reminder_scheduler.check_reminders()
+        return [
+            {
+                'type': 'reminder',
+                'message': reminder.message,
+                'source': 'calendar',
+                'reminder_id': reminder.id,
+            }
+            for reminder in due
+        ]
+    
     async def process(
         self,
         message: str,
@@ -7,13 +7,13 @@ Autor: JARVIS Team
 Versão: 3.1.0
 """
 
-import asyncio
 from typing import List, Optional, Dict, Any, Callable
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
 from core.logger import get_logger
 from core.event_bus import get_event_bus, EventType, Event
+from core.proactive_engine import announce_deadline
 
 logger = get_logger(__name__)
 
@@ -52,6 +52,19 @@ class Reminder:
         
         return False
     
+    def next_trigger_time(self) -> Optional[datetime]:
+        """Quando should_trigger() passa a ser verdadeiro (None se nunca mais)"""
+        if not self.enabled:
+            return None
+        if self.last_triggered is None:
+            return self.time
+        if not self.recurring:
+            return None
+        days = {'daily': 1, 'weekly': 7, 'monthly': 30}.get(self.recurring)
+        if days is None:
+            return None
+        return max(self.time, self.last_triggered + timedelta(days=days))
+    
     def get_next_occurrence(self) -> datetime:
         """Calcula próxima ocorrência"""
         if not self.recurring:
@@ -74,13 +87,16 @@ class Reminder:
 class ReminderScheduler:
     """
     Agendador de lembretes
+
+    Não tem loop próprio: publica o próximo horário (announce_deadline) e o motor
+    proativo chama check_reminders() nesse horário, via CalendarModule.check_proactive().
     """
     
-    def __init__(self):
+    def __init__(self, module: str = 'calendar'):
+        self.module = module
         self._reminders: Dict[str, Reminder] = {}
         self._next_id = 1
         self._running = False
-        self._task: Optional[asyncio.Task] = None
     
     async def start(self):
         """Inicia o scheduler"""
@@ -88,40 +104,38 @@ class ReminderScheduler:
             return
         
         self._running = True
-        self._task = asyncio.create_task(self._scheduler_loop())
+        await self._announce()
         logger.info("Reminder scheduler iniciado")
     
     async def stop(self):
         """Para o scheduler"""
-        self._running = False
-        if self._task:
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
+        if self._running:
+            self._running = False
+            await announce_deadline(self.module, None)
         logger.info("Reminder scheduler parado")
     
-    async def _scheduler_loop(self):
-        """Loop principal do scheduler"""
-        while self._running:
-            try:
-                await self._check_reminders()
-                await asyncio.sleep(60)  # Verifica a cada minuto
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Erro no scheduler loop: {e}", exc_info=True)
-                await asyncio.sleep(60)
+    def next_trigger_time(self) -> Optional[datetime]:
+        """Próximo horário em que algum lembrete dispara"""
+        times = [t for t in (r.next_trigger_time() for r in self._reminders.values()) if t]
+        return min(times) if times else None
     
-    async def _check_reminders(self):
-        """Verifica lembretes que devem ser acionados"""
+    async def _announce(self):
+        if self._running:
+            await announce_deadline(self.module, self.next_trigger_time())
+    
+    async def check_reminders(self) -> List[Reminder]:
+        """Aciona os lembretes vencidos, republica o próximo prazo e devolve os acionados"""
         now = datetime.now()
+        due = []
         
         for reminder in self._reminders.values():
             if reminder.should_trigger(now):
                 await self._trigger_reminder(reminder)
                 reminder.last_triggered = now
+                due.append(reminder)
+        
+        await self._announce()
+        return due
     
     async def _trigger_reminder(self, reminder: Reminder):
         """Aciona um lembrete"""
@@ -155,6 +169,7 @@ class ReminderScheduler:
         )
         
         self._reminders[reminder_id] = reminder
+        await self._announce()
         
         logger.info(f"Lembrete criado: {message} para {time}")
         return reminder
@@ -163,6 +178,7 @@ class ReminderScheduler:
         """Deleta lembrete"""
         if reminder_id in self._reminders:
             del self._reminders[reminder_id]
+            await self._announce()
             logger.info(f"Lembrete deletado: {reminder_id}")
             return True
         return False
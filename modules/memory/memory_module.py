@@ -15,6 +15,8 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from pathlib import Path
 
+from core.async_db import AsyncDatabase
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +79,9 @@ class MemoryModule:
         """Para o módulo"""
         # Salva tudo antes de parar
         await self._save_all()
+        if self._db:
+            self._db.close()
+            self._db = None
         self._running = False
         self.status = '🔴'
     
@@ -275,115 +280,67 @@ class MemoryModule:
     # ==========================================
     
     async def _init_database(self):
-        """Inicializa conexão com banco de dados"""
+        """Inicializa conexão com banco de dados (acesso fora do event loop, ver core.async_db)"""
         try:
-            # Tenta MySQL primeiro
-            db_type = os.getenv('DATABASE_TYPE', 'sqlite')
-            
-            if db_type == 'mysql':
-                await self._init_mysql()
-            else:
-                await self._init_sqlite()
-                
+            self._db = await AsyncDatabase.open(
+                os.getenv('DATABASE_TYPE', 'sqlite'),
+                sqlite_path=Path(os.getenv('SQLITE_PATH', './data/jarvis.db'))
+            )
+            self._db_type = self._db.dialect
+            await self._create_tables()
         except Exception as e:
             logger.warning(f"⚠️ Erro ao conectar banco: {e}")
-            await self._init_sqlite()  # Fallback para SQLite
-    
-    async def _init_mysql(self):
-        """Inicializa MySQL"""
-        try:
-            import mysql.connector
-            
-            config = {
-                'host': os.getenv('MYSQL_HOST', '127.0.0.1'),
-                'port': int(os.getenv('MYSQL_PORT', 3306)),
-                'user': os.getenv('MYSQL_USER', 'root'),
-                'password': os.getenv('MYSQL_PASSWORD', ''),
-                'database': os.getenv('MYSQL_DATABASE', 'jarvis_db'),
-            }
-            
-            self._db = mysql.connector.connect(**config)
-            self._db_type = 'mysql'
-            
-            # Cria tabelas
-            await self._create_tables_mysql()
-            
-            logger.info("✅ MySQL conectado")
-            
-        except Exception as e:
-            logger.warning(f"⚠️ MySQL falhou: {e}")
-            raise
-    
-    async def _init_sqlite(self):
-        """Inicializa SQLite"""
-        import sqlite3
-        
-        db_path = Path(os.getenv('SQLITE_PATH', './data/jarvis.db'))
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        self._db = sqlite3.connect(str(db_path))
-        self._db.row_factory = sqlite3.Row
-        self._db_type = 'sqlite'
-        
-        await self._create_tables_sqlite()
-        
-        logger.info(f"✅ SQLite: {db_path}")
-    
-    async def _create_tables_mysql(self):
-        """Cria tabelas no MySQL"""
-        cursor = self._db.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jarvis_memory (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                category VARCHAR(50) NOT NULL,
-                key_name VARCHAR(100) NOT NULL,
-                value TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                UNIQUE KEY unique_memory (category, key_name)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jarvis_conversations (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_message TEXT,
-                jarvis_response TEXT,
-                intent VARCHAR(50),
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        self._db.commit()
+            self._db = None
+            self._db_type = None
     
-    async def _create_tables_sqlite(self):
-        """Cria tabelas no SQLite"""
-        cursor = self._db.cursor()
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jarvis_memory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                category TEXT NOT NULL,
-                key_name TEXT NOT NULL,
-                value TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(category, key_name)
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS jarvis_conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_message TEXT,
-                jarvis_response TEXT,
-                intent TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        self._db.commit()
+    async def _create_tables(self):
+        """Cria tabelas (DDL de cada banco)"""
+        if self._db_type == 'mysql':
+            await self._db.executescript([
+                """
+                CREATE TABLE IF NOT EXISTS jarvis_memory (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    category VARCHAR(50) NOT NULL,
+                    key_name VARCHAR(100) NOT NULL,
+                    value TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    UNIQUE KEY unique_memory (category, key_name)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS jarvis_conversations (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_message TEXT,
+                    jarvis_response TEXT,
+                    intent VARCHAR(50),
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+            ])
+        else:
+            await self._db.executescript([
+                """
+                CREATE TABLE IF NOT EXISTS jarvis_memory (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    category TEXT NOT NULL,
+                    key_name TEXT NOT NULL,
+                    value TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(category, key_name)
+                )
+                """,
+                """
+                CREATE TABLE IF NOT EXISTS jarvis_conversations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_message TEXT,
+                    jarvis_response TEXT,
+                    intent TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """,
+            ])
     
     async def _save_memory(self, category: str, key: str, value: Any):
         """Salva memória no banco"""
@@ -391,23 +348,20 @@ class MemoryModule:
             return
         
         try:
-            cursor = self._db.cursor()
             value_str = json.dumps(value) if isinstance(value, (dict, list)) else str(value)
             
             if self._db_type == 'mysql':
-                cursor.execute("""
+                await self._db.execute("""
                     INSERT INTO jarvis_memory (category, key_name, value)
-                    VALUES (%s, %s, %s)
-                    ON DUPLICATE KEY UPDATE value = %s, updated_at = NOW()
+                    VALUES (?, ?, ?)
+                    ON DUPLICATE KEY UPDATE value = ?, updated_at = NOW()
                 """, (category, key, value_str, value_str))
             else:
-                cursor.execute("""
+                await self._db.execute("""
                     INSERT OR REPLACE INTO jarvis_memory (category, key_name, value, updated_at)
                     VALUES (?, ?, ?, datetime('now'))
                 """, (category, key, value_str))
             
-            self._db.commit()
-            
         except Exception as e:
             logger.error(f"Erro ao salvar memória: {e}")
     
@@ -417,34 +371,19 @@ class MemoryModule:
             return None
         
         try:
-            cursor = self._db.cursor()
-            
             if category:
-                if self._db_type == 'mysql':
-                    cursor.execute(
-                        "SELECT value FROM jarvis_memory WHERE category = %s AND key_name = %s",
-                        (category, key)
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT value FROM jarvis_memory WHERE category = ? AND key_name = ?",
-                        (category, key)
-                    )
+                row = await self._db.fetchone(
+                    "SELECT value FROM jarvis_memory WHERE category = ? AND key_name = ?",
+                    (category, key)
+                )
             else:
-                if self._db_type == 'mysql':
-                    cursor.execute(
-                        "SELECT value FROM jarvis_memory WHERE key_name = %s",
-                        (key,)
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT value FROM jarvis_memory WHERE key_name = ?",
-                        (key,)
-                    )
+                row = await self._db.fetchone(
+                    "SELECT value FROM jarvis_memory WHERE key_name = ?",
+                    (key,)
+                )
             
-            row = cursor.fetchone()
             if row:
-                value = row[0] if self._db_type == 'mysql' else row['value']
+                value = row['value']
                 try:
                     return json.loads(value)
                 except:
@@ -462,20 +401,10 @@ class MemoryModule:
             return
         
         try:
-            cursor = self._db.cursor()
-            
-            if self._db_type == 'mysql':
-                cursor.execute(
-                    "DELETE FROM jarvis_memory WHERE category = %s AND key_name = %s",
-                    (category, key)
-                )
-            else:
-                cursor.execute(
-                    "DELETE FROM jarvis_memory WHERE category = ? AND key_name = ?",
-                    (category, key)
-                )
-            
-            self._db.commit()
+            await self._db.execute(
+                "DELETE FROM jarvis_memory WHERE category = ? AND key_name = ?",
+                (category, key)
+            )
             
         except Exception as e:
             logger.error(f"Erro ao deletar memória: {e}")
@@ -486,15 +415,10 @@ class MemoryModule:
             return
         
         try:
-            cursor = self._db.cursor()
-            cursor.execute("SELECT category, key_name, value FROM jarvis_memory")
-            rows = cursor.fetchall()
+            rows = await self._db.fetchall("SELECT category, key_name, value FROM jarvis_memory")
             
             for row in rows:
-                if self._db_type == 'mysql':
-                    category, key, value = row
-                else:
-                    category, key, value = row['category'], row['key_name'], row['value']
+                category, key, value = row['category'], row['key_name'], row['value']
                 
                 try:
                     value = json.loads(value)
@@ -536,20 +460,24 @@ class MemoryModule:
             return
         
         try:
-            cursor = self._db.cursor()
-            
-            if self._db_type == 'mysql':
-                cursor.execute("""
-                    INSERT INTO jarvis_conversations (user_message, jarvis_response, intent)
-                    VALUES (%s, %s, %s)
-                """, (user_message, jarvis_response, intent))
-            else:
-                cursor.execute("""
-                    INSERT INTO jarvis_conversations (user_message, jarvis_response, intent)
-                    VALUES (?, ?, ?)
-                """, (user_message, jarvis_response, intent))
-            
-            self._db.commit()
+            await self._db.execute("""
+                INSERT INTO jarvis_conversations (user_message, jarvis_response, intent)
+                VALUES (?, ?, ?)
+            """, (user_message, jarvis_response, intent))
             
         except Exception as e:
             logger.error(f"Erro ao salvar conversa: {e}")
+
+    async def save_conversations(self, items: List[tuple]):
+        """Salva um lote de conversas [(user_message, jarvis_response, intent)] numa única transação"""
+        if not self._db or not items:
+            return
+        
+        try:
+            await self._db.executemany("""
+                INSERT INTO jarvis_conversations (user_message, jarvis_response, intent)
+                VALUES (?, ?, ?)
+            """, items)
+            
+        except Exception as e:
+            logger.error(f"Erro ao salvar conversas: {e}")
@@ -26,8 +26,8 @@ class TranslationModule:
     def detect(self, text: str) -> Language:
         return self.translator.detect_language(text)
 
-    def translate(self, text: str, target_lang: str = 'pt', source_lang: Optional[str] = None) -> str:
-        return self.translator.translate(text, target_lang=target_lang, source_lang=source_lang)
+    async def translate(self, text: str, target_lang: str = 'pt', source_lang: Optional[str] = None) -> str:
+        return await self.translator.translate(text, target_lang=target_lang, source_lang=source_lang)
 
     async def process(self, message: str, intent, context: Dict, metadata: Dict) -> str:
         msg_lower = message.lower().strip()
@@ -44,6 +44,6 @@ class TranslationModule:
                 target = 'pt'
             if not to_translate:
                 return "Use: 'traduzir [texto] para [pt/en/es]'"
-            result = self.translate(to_translate, target_lang=target)
+            result = await self.translate(to_translate, target_lang=target)
             return f"🌐 **Tradução** ({target}):\n{result}"
         return "Comandos: 'detectar idioma', 'traduzir [texto] para [pt/en/es]'"
@@ -43,7 +43,7 @@ class Translator:
         best = max(scores.items(), key=lambda x: x[1])
         return best[0] if best[1] > 0 else Language.UNKNOWN
 
-    def translate(self, text: str, target_lang: str = 'pt', source_lang: Optional[str] = None) -> str:
+    async def translate(self, text: str, target_lang: str = 'pt', source_lang: Optional[str] = None) -> str:
         if not text or not text.strip():
             return ""
         target_lang = target_lang.lower()[:2]
@@ -51,15 +51,29 @@ class Translator:
         target_name = lang_names.get(target_lang, target_lang)
         if self._openai_available:
             try:
-                from openai import OpenAI
-                client = OpenAI(api_key=_config_get(self.config, 'OPENAI_API_KEY'))
+                from core.prompt_cache import get_prompt_cache, prompt_cache_key
                 prompt = f"Traduza o seguinte texto para {target_name}. Responda apenas com a tradução.\n\n{text}"
-                resp = client.chat.completions.create(
-                    model=_config_get(self.config, 'OPENAI_MODEL', 'gpt-4o-mini'),
-                    messages=[{'role': 'user', 'content': prompt}],
+                model = _config_get(self.config, 'OPENAI_MODEL', 'gpt-4o-mini')
+                messages = [{'role': 'user', 'content': prompt}]
+                # Tradução é determinística (temperature=0): repetidas saem do cache
+                ttl = float(_config_get(self.config, 'TRANSLATION_CACHE_TTL_SECONDS', 604800) or 0)
+                key = prompt_cache_key(model, messages, 0, max_tokens=1000) if ttl else None
+                cached = await get_prompt_cache().aget(key) if key else None
+                if cached is not None:
+                    return cached
+                from core.llm_pool import get_llm_pool
+                resp = await get_llm_pool().chat(
+                    'translation',
+                    api_key=_config_get(self.config, 'OPENAI_API_KEY'),
+                    model=model,
+                    messages=messages,
+                    temperature=0,
                     max_tokens=1000
                 )
-                return (resp.choices[0].message.content or text).strip()
+                translated = (resp.choices[0].message.content or "").strip()
+                if key and translated:
+                    await get_prompt_cache().aset(key, translated, ttl=ttl)
+                return translated or text.strip()
             except Exception as e:
                 logger.warning("Tradução API falhou: %s", e)
         return f"[Tradução para {target_name} requer OPENAI_API_KEY. Original: {text[:80]}...]"
@@ -10,6 +10,8 @@ import os
 from typing import Optional
 from pathlib import Path
 
+from core.llm_pool import get_llm_pool
+
 logger = logging.getLogger(__name__)
 
 
@@ -88,13 +90,14 @@ class Transcriber:
     async def _init_whisper_api(self):
         """Inicializa cliente da API Whisper"""
         try:
-            from openai import OpenAI
-            
             api_key = os.getenv('OPENAI_API_KEY')
             if not api_key:
                 raise ValueError("OPENAI_API_KEY não configurada")
             
-            self._client = OpenAI(api_key=api_key)
+            # Cliente assíncrono compartilhado do processo
+            self._client = get_llm_pool().get_client('openai', api_key=api_key)
+            if self._client is None:
+                raise ImportError("openai não instalado")
             self._use_api = True
             self._initialized = True
             logger.info("Whisper API inicializado")
@@ -212,17 +215,13 @@ class Transcriber:
             f.write(audio_data)
         
         try:
-            loop = asyncio.get_event_loop()
-            
             with open(temp_path, 'rb') as audio_file:
-                result = await loop.run_in_executor(
-                    None,
-                    lambda: self._client.audio.transcriptions.create(
+                async with get_llm_pool().slot('voice'):
+                    result = await self._client.audio.transcriptions.create(
                         model="whisper-1",
                         file=audio_file,
                         language=self.language
                     )
-                )
             
             return result.text.strip()
             
@@ -10,13 +10,17 @@ Versão: 3.0.0
 import asyncio
 import logging
 import os
-from typing import Optional, Callable, Dict, Any
+import re
+from typing import Optional, Callable, Dict, Any, AsyncIterator
 
 logger = logging.getLogger(__name__)
 
 # Desativa todo o módulo de voz (TTS/STT/Listener) para evitar COM/comtypes no shutdown (run_jarvis_message).
 JARVIS_DISABLE_VOICE = os.getenv('JARVIS_DISABLE_VOICE', '').strip().lower() in ('1', 'true', 'yes')
 
+# Fim de frase para fala incremental (pontuação seguida de espaço, ou quebra de linha)
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+|\n+')
+
 
 class VoiceModule:
     """
@@ -129,6 +133,38 @@ class VoiceModule:
             logger.error(f"Erro ao falar: {e}")
             return False
     
+    async def speak_stream(self, deltas: AsyncIterator[str]) -> str:
+        """
+        Fala uma resposta em streaming: cada frase é falada assim que termina,
+        enquanto o restante ainda está sendo gerado. Retorna o texto completo.
+        """
+        sentences: asyncio.Queue = asyncio.Queue()
+        
+        async def _speaker():
+            while True:
+                sentence = await sentences.get()
+                if sentence is None:
+                    return
+                await self.speak(sentence)
+        
+        speaker = asyncio.create_task(_speaker())
+        buffer = ""
+        full = []
+        try:
+            async for delta in deltas:
+                full.append(delta)
+                buffer += delta
+                *complete, buffer = SENTENCE_BOUNDARY.split(buffer)
+                for sentence in complete:
+                    if sentence.strip():
+                        sentences.put_nowait(sentence.strip())
+            if buffer.strip():
+                sentences.put_nowait(buffer.strip())
+        finally:
+            sentences.put_nowait(None)
+            await speaker
+        return "".join(full)
+    
     async def listen(self, timeout: float = 10.0) -> Optional[str]:
         """
         Escuta e transcreve áudio
@@ -10,11 +10,18 @@ import re
 import asyncio
 import aiohttp
 import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 
+from core.proactive_engine import announce_deadline, announce_ready
+
 logger = logging.getLogger(__name__)
 
+MONITORS_PATH = Path(__file__).parent.parent.parent / "config" / "monitors.json"
+_MAX_SEEN_MESSAGES = 1000
+
 try:
     from core.contact_resolver import resolve_contact, DEFAULT_ACCEPT_THRESHOLD
 except ImportError:
@@ -24,8 +31,8 @@ except ImportError:
 
 def _load_env():
     try:
-        from dotenv import load_dotenv
-        load_dotenv(Path(__file__).parent.parent.parent / '.env')
+        from core.resource_cache import get_resource_cache
+        get_resource_cache().load_dotenv(Path(__file__).parent.parent.parent / '.env')
     except Exception:
         pass
     return os.getenv('WHATSAPP_API_URL', 'http://localhost:3001')
@@ -45,6 +52,8 @@ class WhatsAppModule:
         self.config = config
         self.api_url = _load_env()
         self._contacts_cache: Dict[str, str] = {}
+        self._monitor_interval = float(os.getenv('WHATSAPP_MONITOR_CHECK_SECONDS', '300'))
+        self._seen_messages: 'OrderedDict[str, None]' = OrderedDict()
         self._running = False
         self.status = '🔴'
 
@@ -52,11 +61,60 @@ class WhatsAppModule:
         logger.info("📱 Iniciando módulo WhatsApp...")
         self._running = True
         self.status = '🟢'
+        await self._announce_monitor()
         logger.info("✅ Módulo WhatsApp pronto (API: %s)", self.api_url)
 
     async def stop(self):
         self._running = False
         self.status = '🔴'
+        await announce_deadline('whatsapp', None)
+
+    def _monitored_jids(self) -> List[str]:
+        """JIDs monitorados em config/monitors.json (vazio se desativado)"""
+        try:
+            from core.resource_cache import get_resource_cache
+            data = get_resource_cache().read_json(MONITORS_PATH)
+        except Exception as e:
+            logger.debug("Não foi possível ler monitores: %s", e)
+            return []
+        contacts_block = (data or {}).get("contacts") if isinstance(data, dict) else None
+        if not isinstance(contacts_block, dict) or not contacts_block.get("enabled", True):
+            return []
+        return list(contacts_block.get("jids") or [])
+
+    async def _announce_monitor(self):
+        """Próxima verificação só existe com contato monitorado (sem monitor, nenhum despertar)"""
+        deadline = None
+        if self._running and self._monitor_interval > 0 and self._monitored_jids():
+            deadline = datetime.now() + timedelta(seconds=self._monitor_interval)
+        await announce_deadline('whatsapp', deadline)
+
+    async def check_proactive(self) -> List[Dict[str, Any]]:
+        """Mensagens novas (não lidas) dos contatos monitorados como ações proativas"""
+        jids = set(self._monitored_jids())
+        actions: List[Dict[str, Any]] = []
+        if jids and self._monitor_interval > 0:
+            result = await self._api_request("GET", "/messages/unread")
+            for msg in result.get("messages", []) if "error" not in result else []:
+                jid = msg.get('from') or msg.get('jid')
+                if jid not in jids:
+                    continue
+                text = msg.get('message') or msg.get('body', '')
+                msg_id = str(msg.get('id') or f"{jid}:{msg.get('timestamp')}:{text}")
+                if msg_id in self._seen_messages:
+                    continue
+                self._seen_messages[msg_id] = None
+                if len(self._seen_messages) > _MAX_SEEN_MESSAGES:
+                    self._seen_messages.popitem(last=False)
+                sender = msg.get('pushName') or jid
+                actions.append({
+                    'type': 'whatsapp_message',
+                    'message': f"Nova mensagem de {sender}: {text[:200]}",
+                    'source': 'whatsapp',
+                    'jid': jid,
+                })
+        await self._announce_monitor()
+        return actions
 
     async def _api_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
         url = f"{self.api_url}{endpoint}"
@@ -615,22 +673,24 @@ class WhatsAppModule:
         name = resolved_name or contact
         # Persistir em config/monitors.json se existir (formato: contacts.jids)
         try:
-            monitors_path = Path(__file__).parent.parent.parent / "config" / "monitors.json"
-            if monitors_path.exists():
-                import json
-                data = json.loads(monitors_path.read_text(encoding="utf-8"))
+            from core.resource_cache import get_resource_cache
+            cache = get_resource_cache()
+            data = cache.read_json(MONITORS_PATH)
+            if isinstance(data, dict):
                 contacts_block = data.get("contacts") or {}
                 if isinstance(contacts_block, dict):
                     jids = list(contacts_block.get("jids") or [])
                     if jid not in jids:
+                        # Objeto do cache é compartilhado: grava uma cópia atualizada
                         jids.append(jid)
-                        data.setdefault("contacts", {})["jids"] = jids
-                        monitors_path.write_text(
-                            json.dumps(data, ensure_ascii=False, indent=2),
-                            encoding="utf-8",
+                        cache.write_json(
+                            MONITORS_PATH,
+                            {**data, "contacts": {**contacts_block, "jids": jids}},
                         )
         except Exception as e:
             logger.debug("Não foi possível salvar monitor: %s", e)
+        # Primeira verificação já, e a partir dela o prazo periódico
+        await announce_ready('whatsapp')
         msg = f"✅ Vou monitorar a conversa de **{name}**."
         if confirm_msg:
             msg = f"{confirm_msg}\n{msg}"
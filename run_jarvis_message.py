@@ -53,6 +53,14 @@ def log_timing(stage: str, **extra):
     print(f"[timing] {stage} +{elapsed_ms}ms{suffix}", file=sys.stderr, flush=True)
 
 
+def log_trace(tree: dict):
+    """Árvore de spans da requisição (core.tracing) em uma linha [trace] no stderr"""
+    if not TIMING_ENABLED:
+        return
+    from core.tracing import format_trace
+    print(f"[trace] {format_trace(tree)}", file=sys.stderr, flush=True)
+
+
 def hard_exit(code: int = 0):
     try:
         sys.stdout.flush()
@@ -75,13 +83,35 @@ def main():
     args = p.parse_args()
     log_timing('args_parsed')
 
+    emitted = []  # exatamente um JSON por execução
+
     def output(obj):
-        print(json.dumps(obj, ensure_ascii=False))
+        print(json.dumps(obj, ensure_ascii=False), flush=True)
+        emitted.append(obj)
+
+    def emit_result(result):
+        # B) Se run() devolveu dict com "action" (ex.: autopilot off), emitir direto
+        if isinstance(result, dict) and 'action' in result:
+            output(result)
+            log_timing('response_emitted', action=result.get('action', '?'),
+                       reason=result.get('reason', ''))
+        elif result is not None and (not isinstance(result, str) or result.strip()):
+            output({'action': 'reply', 'response': result, 'cached': False})
+            log_timing('response_emitted', action='reply')
+        else:
+            # Pipeline retornou None ou string vazia — autopilot estava ON mas IA não gerou texto
+            reason = 'no_response'
+            if isinstance(result, str) and not result.strip():
+                reason = 'empty_response'
+            output({'action': 'ignore', 'response': '', 'reason': reason})
+            log_timing('response_emitted', action='ignore', reason=reason)
 
     async def run():
         from core.config import Config
         from core.context_manager import ContextManager
         from core.jarvis import Jarvis
+        from core.tracing import add_span_exporter
+        add_span_exporter(log_trace)
         log_timing('context_loaded')
 
         # Mensagem vinda do WhatsApp: decidir reply/ignore por JID (ou por nome se jid não veio)
@@ -137,6 +167,8 @@ def main():
                            if (is_whatsapp and ctx) else (args.jid or ""))
         log_timing('jid_normalized', has_context_jid=str(bool(jid_for_context)).lower())
 
+        # Processo de uma mensagem: o "sim" do plano chega em outro processo, rascunho seria descartado
+        os.environ.setdefault('PLAN_DRAFT_ENABLED', '0')
         jarvis = Jarvis()
         try:
             log_timing('jarvis_start_begin')
@@ -178,7 +210,9 @@ def main():
                 except Exception:
                     pass
             if is_whatsapp and response is not None and (not isinstance(response, str) or response.strip()):
-                return {'action': 'reply', 'response': response, 'mode': 'autopilot'}
+                response = {'action': 'reply', 'response': response, 'mode': 'autopilot'}
+            # Resposta sai antes do stop(): resumos de conversa pendentes não atrasam o WhatsApp
+            emit_result(response)
             return response
         finally:
             log_timing('jarvis_stop_begin')
@@ -187,24 +221,8 @@ def main():
 
     try:
         result = asyncio.run(asyncio.wait_for(run(), timeout=SCRIPT_TIMEOUT_MS / 1000))
-        # B) Se run() devolveu dict com "action" (ex.: autopilot off), emitir direto
-        if isinstance(result, dict) and 'action' in result:
-            output(result)
-            log_timing('response_emitted', action=result.get('action', '?'),
-                       reason=result.get('reason', ''))
-        elif result is not None and (not isinstance(result, str) or result.strip()):
-            if isinstance(result, dict) and result.get('action') == 'reply':
-                output(result)
-            else:
-                output({'action': 'reply', 'response': result, 'cached': False})
-            log_timing('response_emitted', action='reply')
-        else:
-            # Pipeline retornou None ou string vazia — autopilot estava ON mas IA não gerou texto
-            reason = 'no_response'
-            if isinstance(result, str) and not result.strip():
-                reason = 'empty_response'
-            output({'action': 'ignore', 'response': '', 'reason': reason})
-            log_timing('response_emitted', action='ignore', reason=reason)
+        if not emitted:
+            emit_result(result)
         log_timing('script_end', exit_code=0)
         hard_exit(0)
     except asyncio.TimeoutError:
@@ -216,24 +234,27 @@ def main():
                     file=sys.stderr,
                     flush=True,
                 )
-        output({
-            'action': 'ignore',
-            'response': '',
-            'reason': 'timeout',
-            'error': f'run_jarvis_message timeout após {SCRIPT_TIMEOUT_MS}ms'
-        })
-        log_timing('response_emitted', action='ignore', reason='timeout')
+        # Resposta já emitida: o timeout foi no encerramento (resumos pendentes)
+        if not emitted:
+            output({
+                'action': 'ignore',
+                'response': '',
+                'reason': 'timeout',
+                'error': f'run_jarvis_message timeout após {SCRIPT_TIMEOUT_MS}ms'
+            })
+            log_timing('response_emitted', action='ignore', reason='timeout')
         log_timing('script_end', exit_code=0)
         hard_exit(0)
     except Exception as e:
         log_timing('exception', error=str(e)[:120])
-        output({
-            'action': 'ignore',
-            'response': '',
-            'reason': 'error',
-            'error': str(e)
-        })
-        log_timing('response_emitted', action='ignore', reason='error')
+        if not emitted:
+            output({
+                'action': 'ignore',
+                'response': '',
+                'reason': 'error',
+                'error': str(e)
+            })
+            log_timing('response_emitted', action='ignore', reason='error')
         log_timing('script_end', exit_code=0)
         hard_exit(0)
 
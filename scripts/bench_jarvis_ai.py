@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de JarvisAI (latência e vazão) contra o mock local ou qualquer endpoint compatível.
+Uso:
+    python scripts/mock_llm_server.py --latency normal:300,60 &
+    python scripts/bench_jarvis_ai.py --requests 200 --concurrency 16 [--stream] [--tools]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+JARVIS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(JARVIS_DIR))
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+async def run(args):
+    from core.ai_engine import JarvisAI
+
+    mcp = None
+    if args.tools:
+        from core.mcp_client import JarvisMCPClient
+        mcp = JarvisMCPClient()
+        await mcp._load_server('search', 'SearchServer', 'search_server')
+
+    ai = JarvisAI(mcp)
+    if ai.client is None:
+        print("Erro: defina OPENAI_API_KEY (qualquer valor serve para o mock)", file=sys.stderr)
+        sys.exit(1)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, first_tokens, errors = [], [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        message = f"{args.message} #{i}"
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                if args.stream:
+                    first = None
+                    async for _ in ai.stream(message):
+                        if first is None:
+                            first = time.perf_counter() - t0
+                    first_tokens.append(first or 0.0)
+                else:
+                    response = await ai.process(message)
+                    if not response.success:
+                        errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    ms = [v * 1000 for v in latencies]
+    print(f"Endpoint: {os.getenv('OPENAI_BASE_URL', 'api.openai.com')}")
+    print(f"Requisições: {args.requests} | concorrência {args.concurrency} | erros {errors}")
+    print(f"Vazão: {args.requests / elapsed:.1f} req/s em {elapsed:.2f}s")
+    print(
+        f"Latência (ms): p50 {percentile(ms, 50):.0f} | p95 {percentile(ms, 95):.0f} | "
+        f"p99 {percentile(ms, 99):.0f} | média {statistics.mean(ms):.0f}"
+    )
+    if first_tokens:
+        ttft = [v * 1000 for v in first_tokens]
+        print(f"Primeiro token (ms): p50 {percentile(ttft, 50):.0f} | p95 {percentile(ttft, 95):.0f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark JarvisAI")
+    ap.add_argument("--requests", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--message", default="Qual a capital da França?")
+    ap.add_argument("--stream", action="store_true", help="Mede via stream() (inclui tempo até o primeiro token)")
+    ap.add_argument("--tools", action="store_true", help="Carrega o SearchServer para ciclos de ferramentas")
+    ap.add_argument("--base-url", default="http://127.0.0.1:8765/v1", help="Endpoint (default: mock local)")
+    args = ap.parse_args()
+
+    os.environ.setdefault('OPENAI_BASE_URL', args.base_url)
+    os.environ.setdefault('OPENAI_API_KEY', 'mock')
+    # Cache semântico mascararia a latência do endpoint
+    os.environ.setdefault('SEMANTIC_CACHE_ENABLED', '0')
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor local compatível com a API OpenAI (chat completions + embeddings) para benchmarks offline.
+Respostas determinísticas ou roteirizadas, tool_calls roteirizadas, latência configurável,
+streaming (SSE) e injeção de erros. Nada sai da máquina.
+
+Uso:
+    python scripts/mock_llm_server.py --port 8765 --latency normal:300,60 --token-delay 15
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=mock python run_jarvis_message.py --message "oi"
+
+Roteiro (--script regras.json): lista de regras avaliadas em ordem sobre a última mensagem do usuário
+    [
+      {"match": "clima|tempo", "tool_calls": [{"name": "get_weather", "arguments": {"city": "São Paulo"}}]},
+      {"match": "clima|tempo", "after_tool": true, "response": "Faz 25°C em São Paulo."},
+      {"match": ".*", "response": "Olá! Sou o Jarvis simulado."}
+    ]
+Regras com tool_calls só valem quando a última mensagem é do usuário; "after_tool": true só
+depois de resultados de ferramentas. Sem regra, a resposta é derivada da mensagem (estável).
+
+Latência (ms): fixed:200 | uniform:100,400 | normal:300,60 | lognormal:5.6,0.4
+Erros: --error-rate 0.05 --error-status 429,500 (429 inclui Retry-After)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+
+def parse_latency(spec: str):
+    """'normal:300,60' -> função que sorteia atraso em segundos"""
+    kind, _, params = (spec or 'fixed:0').partition(':')
+    values = [float(v) for v in params.split(',') if v.strip()] or [0.0]
+    if kind == 'fixed':
+        return lambda rng: values[0] / 1000
+    if kind == 'uniform':
+        low, high = values[0], values[1] if len(values) > 1 else values[0]
+        return lambda rng: rng.uniform(low, high) / 1000
+    if kind == 'normal':
+        mean, std = values[0], values[1] if len(values) > 1 else 0.0
+        return lambda rng: max(0.0, rng.gauss(mean, std)) / 1000
+    if kind == 'lognormal':
+        mu, sigma = values[0], values[1] if len(values) > 1 else 0.0
+        return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+    raise ValueError(f"Distribuição de latência desconhecida: {spec}")
+
+
+class MockLLM:
+    """Estado do servidor: roteiro, gerador aleatório semeado e contadores"""
+
+    def __init__(self, args):
+        self.rules: List[Dict] = []
+        if args.script:
+            self.rules = json.loads(Path(args.script).read_text(encoding='utf-8'))
+        self.latency = parse_latency(args.latency)
+        self.token_delay = args.token_delay / 1000
+        self.error_rate = args.error_rate
+        self.error_status = [int(s) for s in args.error_status.split(',') if s.strip()]
+        self.embedding_dim = args.embedding_dim
+        self.rng = random.Random(args.seed)
+        self.stats = {'requests': 0, 'chat': 0, 'stream': 0, 'embeddings': 0, 'errors': 0, 'tool_calls': 0}
+
+    # === Respostas ===
+
+    def _pick(self, messages: List[Dict]) -> Dict:
+        """{'content': str} ou {'tool_calls': [...]} para a conversa"""
+        last = messages[-1] if messages else {}
+        after_tool = last.get('role') == 'tool'
+        user_text = next(
+            (str(m.get('content') or '') for m in reversed(messages) if m.get('role') == 'user'), ''
+        )
+        for rule in self.rules:
+            if not re.search(rule.get('match', '.*'), user_text, re.IGNORECASE):
+                continue
+            if bool(rule.get('after_tool')) != after_tool:
+                continue
+            if rule.get('tool_calls') and not after_tool:
+                return {'tool_calls': rule['tool_calls']}
+            if 'response' in rule:
+                return {'content': rule['response']}
+        if after_tool:
+            results = [str(m.get('content') or '')[:200] for m in messages if m.get('role') == 'tool']
+            return {'content': "Resultado das ferramentas: " + " | ".join(results[-3:])}
+        digest = hashlib.sha256(user_text.encode('utf-8')).hexdigest()[:8]
+        return {'content': f"Resposta simulada ({digest}) para: {user_text[:120]}"}
+
+    @staticmethod
+    def _tokens(text: str) -> int:
+        return max(1, math.ceil(len(text or '') / 4))
+
+    @staticmethod
+    def _tool_call_objects(tool_calls: List[Dict]) -> List[Dict]:
+        return [
+            {
+                'id': f"call_{uuid.uuid4().hex[:12]}",
+                'type': 'function',
+                'function': {
+                    'name': tc['name'],
+                    'arguments': json.dumps(tc.get('arguments', {}), ensure_ascii=False),
+                },
+            }
+            for tc in tool_calls
+        ]
+
+    def _usage(self, messages: List[Dict], completion: str) -> Dict:
+        prompt = sum(self._tokens(str(m.get('content') or '')) + 4 for m in messages)
+        completion_tokens = self._tokens(completion)
+        return {
+            'prompt_tokens': prompt,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt + completion_tokens,
+        }
+
+    # === Handlers ===
+
+    def _maybe_fail(self) -> Optional[web.Response]:
+        if self.error_rate and self.error_status and self.rng.random() < self.error_rate:
+            self.stats['errors'] += 1
+            status = self.rng.choice(self.error_status)
+            headers = {'Retry-After': '1'} if status == 429 else {}
+            return web.json_response(
+                {'error': {'message': f'Erro injetado ({status})', 'type': 'mock_error', 'code': status}},
+                status=status,
+                headers=headers,
+            )
+        return None
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        self.stats['requests'] += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency(self.rng))
+        failure = self._maybe_fail()
+        if failure is not None:
+            return failure
+
+        messages = body.get('messages') or []
+        model = body.get('model', 'mock')
+        choice = self._pick(messages)
+        tool_calls = self._tool_call_objects(choice['tool_calls']) if 'tool_calls' in choice else None
+        content = choice.get('content') or ''
+        if tool_calls:
+            self.stats['tool_calls'] += len(tool_calls)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:16]}"
+        created = int(time.time())
+
+        if body.get('stream'):
+            self.stats['stream'] += 1
+            return await self._stream(request, body, completion_id, created, model, messages, content, tool_calls)
+
+        self.stats['chat'] += 1
+        message = {'role': 'assistant', 'content': content if not tool_calls else None}
+        if tool_calls:
+            message['tool_calls'] = tool_calls
+        return web.json_response({
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': created,
+            'model': model,
+            'choices': [{
+                'index': 0,
+                'message': message,
+                'finish_reason': 'tool_calls' if tool_calls else 'stop',
+            }],
+            'usage': self._usage(messages, content),
+        })
+
+    async def _stream(self, request, body, completion_id, created, model, messages, content, tool_calls):
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+        await response.prepare(request)
+
+        async def send(delta: Dict, finish_reason: Optional[str] = None, usage: Optional[Dict] = None):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': created,
+                'model': model,
+                'choices': [] if usage else [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            if usage:
+                chunk['usage'] = usage
+            await response.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+
+        await send({'role': 'assistant', 'content': ''})
+        if tool_calls:
+            for index, tc in enumerate(tool_calls):
+                await send({'tool_calls': [{
+                    'index': index, 'id': tc['id'], 'type': 'function',
+                    'function': {'name': tc['function']['name'], 'arguments': tc['function']['arguments']},
+                }]})
+        else:
+            for piece in re.findall(r'\S+\s*', content) or ['']:
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+                await send({'content': piece})
+        await send({}, finish_reason='tool_calls' if tool_calls else 'stop')
+        if (body.get('stream_options') or {}).get('include_usage'):
+            await send({}, usage=self._usage(messages, content))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    def _embedding(self, text: str) -> List[float]:
+        """Vetor determinístico (mesmo texto -> mesmo vetor), normalizado"""
+        seed = int.from_bytes(hashlib.sha256(text.encode('utf-8')).digest()[:8], 'big')
+        rng = random.Random(seed)
+        vec = [rng.gauss(0, 1) for _ in range(self.embedding_dim)]
+        norm = math.sqrt(sum(v * v for v in vec)) or 1.0
+        return [v / norm for v in vec]
+
+    async def embeddings(self, request: web.Request) -> web.Response:
+        self.stats['requests'] += 1
+        self.stats['embeddings'] += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency(self.rng) / 4)
+        failure = self._maybe_fail()
+        if failure is not None:
+            return failure
+        inputs = body.get('input')
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        data = [
+            {'object': 'embedding', 'index': i, 'embedding': self._embedding(str(text))}
+            for i, text in enumerate(inputs)
+        ]
+        tokens = sum(self._tokens(str(t)) for t in inputs)
+        return web.json_response({
+            'object': 'list',
+            'data': data,
+            'model': body.get('model', 'mock-embedding'),
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+        })
+
+    async def models(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'object': 'list',
+            'data': [{'id': 'gpt-4o-mini', 'object': 'model', 'owned_by': 'mock'}],
+        })
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+
+def build_app(mock: MockLLM) -> web.Application:
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', mock.chat_completions)
+    app.router.add_post('/v1/embeddings', mock.embeddings)
+    app.router.add_get('/v1/models', mock.models)
+    app.router.add_get('/stats', mock.get_stats)
+    return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Servidor mock compatível com OpenAI")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--script", help="JSON com regras de resposta/tool_calls")
+    ap.add_argument("--latency", default="fixed:0", help="Distribuição da latência até a resposta (ms)")
+    ap.add_argument("--token-delay", type=float, default=0.0, help="Atraso entre chunks do stream (ms)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Fração de requisições com erro (0-1)")
+    ap.add_argument("--error-status", default="429,500", help="Status HTTP dos erros injetados")
+    ap.add_argument("--embedding-dim", type=int, default=1536)
+    ap.add_argument("--seed", type=int, default=42, help="Semente (latência e erros reproduzíveis)")
+    args = ap.parse_args()
+
+    try:
+        parse_latency(args.latency)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    mock = MockLLM(args)
+    print(f"Mock LLM em http://{args.host}:{args.port}/v1 (latência {args.latency}, erros {args.error_rate:.0%})")
+    web.run_app(build_app(mock), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
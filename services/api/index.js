@@ -228,6 +228,31 @@ function extractTimingLines(stderrText = '') {
     .filter((line) => line.startsWith('[timing]'));
 }
 
+function extractTrace(stderrText = '') {
+  const lines = String(stderrText)
+    .split(/\r?\n/)
+    .map((line) => line.trim())
+    .filter((line) => line.startsWith('[trace] '));
+  if (lines.length === 0) return null;
+  try {
+    return JSON.parse(lines[lines.length - 1].slice('[trace] '.length));
+  } catch {
+    return null;
+  }
+}
+
+// Primeira linha JSON válida do stdout (ignora linhas de log acidentais)
+function firstJsonLine(text = '') {
+  const lines = String(text).split(/\r?\n/).map(l => l.trim()).filter(Boolean);
+  for (const line of lines) {
+    if (!line.startsWith('{')) continue;
+    try {
+      return JSON.parse(line);
+    } catch { /* não é JSON, tentar próxima */ }
+  }
+  return null;
+}
+
 function tailText(text = '', limit = 500) {
   const content = String(text || '').trim();
   if (!content) return '';
@@ -274,6 +299,16 @@ async function processPythonAI(message, jid, displayName, timeoutMs = WEBHOOK_PR
 
     python.stdout.on('data', (data) => {
       stdout += data.toString();
+      if (done) return;
+      // A resposta sai antes do encerramento do Python (resumos de conversa pendentes):
+      // responde na primeira linha JSON completa, sem esperar o processo fechar
+      const complete = stdout.slice(0, stdout.lastIndexOf('\n') + 1);
+      const parsed = firstJsonLine(complete);
+      if (parsed) {
+        done = true;
+        clearTimeout(timeout);
+        resolve({ ...parsed, __timing: extractTimingLines(stderr), __trace: extractTrace(stderr) });
+      }
     });
 
     python.stderr.on('data', (data) => {
@@ -285,25 +320,18 @@ async function processPythonAI(message, jid, displayName, timeoutMs = WEBHOOK_PR
       done = true;
       clearTimeout(timeout);
       const timing = extractTimingLines(stderr);
+      const trace = extractTrace(stderr);
       // Robustez: parse apenas a PRIMEIRA linha JSON válida do stdout
       // (ignora linhas de log acidentais que possam ter ido pro stdout)
       if (code === 0) {
-        const lines = stdout.split(/\r?\n/).map(l => l.trim()).filter(Boolean);
-        let parsed = null;
-        for (const line of lines) {
-          if (!line.startsWith('{')) continue;
-          try {
-            parsed = JSON.parse(line);
-            break;
-          } catch { /* não é JSON, tentar próxima */ }
-        }
+        const parsed = firstJsonLine(stdout);
         if (parsed) {
-          resolve({ ...parsed, __timing: timing });
+          resolve({ ...parsed, __timing: timing, __trace: trace });
         } else if (stdout.trim()) {
           // Fallback: se nenhuma linha era JSON, retorna como texto
-          resolve({ response: stdout.trim(), cached: false, __timing: timing });
+          resolve({ response: stdout.trim(), cached: false, __timing: timing, __trace: trace });
         } else {
-          resolve({ action: 'ignore', response: '', reason: 'empty_stdout', __timing: timing });
+          resolve({ action: 'ignore', response: '', reason: 'empty_stdout', __timing: timing, __trace: trace });
         }
       } else {
         reject(new Error(tailText(stderr) || `Python exited with code ${code}`));
@@ -595,6 +623,13 @@ fastify.post('/webhook', async (request, reply) => {
         steps: pythonTiming.slice(-10)
       });
     }
+    if (result?.__trace) {
+      fastify.log.info({
+        msg: 'Python trace',
+        messageId: messageId || '(sem message_id)',
+        trace: result.__trace
+      });
+    }
 
     state.stats.processed++;
 
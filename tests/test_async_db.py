@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: AsyncDatabase (SQLite/MySQL fora do event loop).
+
+Prova que:
+  1) No MySQL os placeholders "?" viram "%s" (mas "?" dentro de literal fica); no SQLite nada muda.
+  2) DATABASE_TYPE=mysql sem MySQL disponível cai para SQLite no caminho pedido.
+  3) Comandos rodam na thread do banco e as linhas voltam como dict.
+
+Uso:
+  python -m pytest -q tests/test_async_db.py
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.async_db import AsyncDatabase  # noqa: E402
+
+
+def test_placeholder_rewrite_for_mysql_only():
+    """Só placeholders fora de aspas são convertidos, e só no MySQL."""
+    sql = "SELECT * FROM t WHERE a = ? AND b LIKE '%?%' AND c = \"it's?\" AND d IN (?, ?)"
+    mysql = AsyncDatabase('mysql', executor=None, connect=None)
+    assert mysql._sql(sql) == (
+        "SELECT * FROM t WHERE a = %s AND b LIKE '%?%' AND c = \"it's?\" AND d IN (%s, %s)"
+    )
+    assert mysql._sql("UPDATE t SET s = 'don''t?' WHERE id = ?") == "UPDATE t SET s = 'don''t?' WHERE id = %s"
+    sqlite = AsyncDatabase('sqlite', executor=None, connect=None)
+    assert sqlite._sql(sql) == sql
+
+
+def test_mysql_unavailable_falls_back_to_sqlite():
+    """Sem mysql-connector (ou sem servidor) abre o SQLite e funciona fora do loop."""
+    tmpdir = Path(tempfile.mkdtemp())
+    saved = dict(os.environ)
+    os.environ.update({'MYSQL_HOST': '127.0.0.1', 'MYSQL_PORT': '1'})  # porta fechada
+    try:
+        async def _scenario():
+            db = await AsyncDatabase.open(db_type='mysql', sqlite_path=tmpdir / 'jarvis.db')
+            try:
+                await db.executescript(["CREATE TABLE t (id INTEGER PRIMARY KEY, texto TEXT)"])
+                inserted = await db.executemany("INSERT INTO t (texto) VALUES (?)", [('a',), ('b?',)])
+                rows = await db.fetchall("SELECT id, texto FROM t WHERE texto LIKE '%?%' OR id = ?", (1,))
+                thread = await db.run(lambda conn: threading.current_thread().name)
+                return db.dialect, inserted, rows, thread
+            finally:
+                db.close()
+
+        dialect, inserted, rows, thread = asyncio.run(_scenario())
+        assert dialect == 'sqlite'
+        assert (tmpdir / 'jarvis.db').exists()
+        assert inserted == 2
+        assert rows == [{'id': 1, 'texto': 'a'}, {'id': 2, 'texto': 'b?'}]
+        assert thread.startswith('jarvis-sqlite')
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+        shutil.rmtree(tmpdir, ignore_errors=True)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: Bulkhead (isolamento por módulo).
+
+Prova que:
+  1) Em execução + fila no limite -> rejeita na hora (queue_full), sem chamar o módulo.
+  2) Espera pela vaga além do timeout -> rejeita (queue_timeout), sem chamar o módulo.
+  3) Execução além do prazo -> BulkheadTimeoutException.
+  4) Com side_effects=True a execução nunca é cancelada pelo prazo.
+  5) TimeoutError do próprio módulo passa como está (erro do módulo, não prazo do bulkhead).
+  6) Limites vêm do código; config.json só sobrescreve os campos que informar.
+
+Uso:
+  python -m pytest -q tests/test_bulkhead.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.bulkhead import DEFAULT_BULKHEAD_LIMITS, Bulkhead, BulkheadLimits, load_bulkhead_limits  # noqa: E402
+from core.exceptions import BulkheadRejectedException, BulkheadTimeoutException  # noqa: E402
+
+
+async def _rejection(bulkhead: Bulkhead, call) -> str:
+    try:
+        await bulkhead.run(call)
+    except BulkheadRejectedException as e:
+        return e.details['reason']
+    raise AssertionError("chamada deveria ter sido rejeitada")
+
+
+def test_queue_full_rejects_immediately():
+    """Sem vaga nem lugar na fila: rejeita sem executar."""
+    bulkhead = Bulkhead('test', BulkheadLimits(timeout=1.0, max_in_flight=1, max_queue=0))
+    started = []
+
+    async def _slow():
+        await asyncio.sleep(0.1)
+
+    async def _never():
+        started.append('never')
+
+    async def _scenario():
+        busy = asyncio.ensure_future(bulkhead.run(_slow))
+        await asyncio.sleep(0)
+        reason = await _rejection(bulkhead, _never)
+        await busy
+        return reason
+
+    assert asyncio.run(_scenario()) == 'queue_full'
+    assert started == []
+    assert bulkhead.stats.rejected == 1 and bulkhead.stats.calls == 1
+
+
+def test_queue_timeout_rejects():
+    """Esperou a vaga além do timeout: rejeita e a chamada nunca começa."""
+    bulkhead = Bulkhead('test', BulkheadLimits(timeout=0.05, max_in_flight=1, max_queue=1))
+    started = []
+
+    async def _busy():
+        await asyncio.sleep(0.2)
+
+    async def _late():
+        started.append('late')
+
+    async def _scenario():
+        busy = asyncio.ensure_future(bulkhead.run(_busy, side_effects=True))
+        await asyncio.sleep(0)
+        reason = await _rejection(bulkhead, _late)
+        await busy
+        return reason
+
+    assert asyncio.run(_scenario()) == 'queue_timeout'
+    assert started == []
+    assert bulkhead.get_stats()['queued'] == 0
+
+
+def test_execution_deadline():
+    """Execução que passa do prazo recebe BulkheadTimeoutException e libera a vaga."""
+    bulkhead = Bulkhead('test', BulkheadLimits(timeout=0.05, max_in_flight=1, max_queue=0))
+
+    async def _stuck():
+        await asyncio.sleep(1)
+
+    async def _scenario():
+        try:
+            await bulkhead.run(_stuck)
+        except BulkheadTimeoutException as e:
+            return e.reason
+        return 'ok'
+
+    assert asyncio.run(_scenario()) == 'timeout'
+    assert bulkhead.stats.timeouts == 1
+    assert bulkhead.get_stats()['in_flight'] == 0
+
+
+def test_side_effects_never_cancelled():
+    """Envio (side_effects) que passa do prazo termina normalmente."""
+    bulkhead = Bulkhead('test', BulkheadLimits(timeout=0.05, max_in_flight=1, max_queue=0))
+    sent = []
+
+    async def _send():
+        await asyncio.sleep(0.15)
+        sent.append('msg')
+        return 'enviado'
+
+    assert asyncio.run(bulkhead.run(_send, side_effects=True)) == 'enviado'
+    assert sent == ['msg']
+    assert bulkhead.stats.timeouts == 0
+
+
+def test_module_timeout_is_not_bulkhead_timeout():
+    """Módulo que levanta TimeoutError dentro do prazo: erro do módulo, não timeout do bulkhead."""
+    bulkhead = Bulkhead('test', BulkheadLimits(timeout=1.0, max_in_flight=1, max_queue=0))
+
+    async def _http_timeout():
+        raise asyncio.TimeoutError("timeout do HTTP interno")
+
+    async def _scenario():
+        try:
+            await bulkhead.run(_http_timeout)
+        except BulkheadTimeoutException:
+            return 'bulkhead'
+        except TimeoutError:
+            return 'module'
+        return 'ok'
+
+    assert asyncio.run(_scenario()) == 'module'
+    assert bulkhead.stats.timeouts == 0 and bulkhead.stats.errors == 1
+
+
+def test_limits_defaults_with_field_overrides():
+    """Sem config vale o padrão do código; config sobrescreve só os campos dados."""
+    assert load_bulkhead_limits('ai') == DEFAULT_BULKHEAD_LIMITS['ai']
+    limits = load_bulkhead_limits('ai', {'ai': {'timeout': 40}})
+    assert limits.timeout == 40
+    assert limits.max_in_flight == DEFAULT_BULKHEAD_LIMITS['ai'].max_in_flight
+    assert load_bulkhead_limits('translation', {'default': {'max_queue': 2}}) == BulkheadLimits(max_queue=2)
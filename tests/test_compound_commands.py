@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: comandos compostos no Orchestrator.
+
+Prova que:
+  1) Parte que referencia a anterior ("monitore a conversa") fica na mesma cadeia; parte sem
+     relação vira cadeia própria.
+  2) Partes com o mesmo contato ficam na mesma cadeia mesmo sem serem vizinhas (sem artigo, sem caixa).
+  3) Cada parte é classificada uma única vez: _process_compound repassa a intenção já calculada
+     (exceto para parte cujo contexto mudou com o contato da anterior).
+
+O classificador é substituído por um falso que lê o contato de "para X"/"de X" (sem rede).
+
+Uso:
+  python -m pytest -q tests/test_compound_commands.py
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.intent_classifier import Intent  # noqa: E402
+from core.orchestrator import Orchestrator  # noqa: E402
+
+
+class FakeClassifier:
+    """classify: contato depois de 'para'/'de'/'do'/'da'; conta as chamadas por parte"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def classify(self, message, context=None):
+        self.calls.append(message)
+        match = re.search(r"\b(?:para|de|do|da)\s+(.+)$", message)
+        entities = {'contact': match.group(1)} if match else {}
+        return Intent(type='whatsapp_send' if 'mande' in message else 'search', confidence=0.9, entities=entities)
+
+
+def _orchestrator() -> Orchestrator:
+    orchestrator = Orchestrator.__new__(Orchestrator)
+    orchestrator.intent_classifier = FakeClassifier()
+    orchestrator.modules = {}
+    return orchestrator
+
+
+def test_reference_words_chain_parts():
+    """'monitore a conversa' depende do envio anterior; a busca é independente."""
+    orchestrator = _orchestrator()
+    parts = ["mande oi para Ana", "monitore a conversa", "pesquise o clima"]
+    groups, intents = asyncio.run(orchestrator._compound_dependency_groups(parts, {}))
+    assert groups == [[0, 1], [2]]
+    assert [i.type for i in intents] == ['whatsapp_send', 'search', 'search']
+
+
+def test_shared_contact_chains_non_adjacent_parts():
+    """Mesmo contato ('a Ana' e 'ana') em partes não vizinhas: mesma cadeia, ordem preservada."""
+    orchestrator = _orchestrator()
+    parts = ["mande oi para a Ana", "pesquise o clima", "leia as mensagens da ana"]
+    groups, _ = asyncio.run(orchestrator._compound_dependency_groups(parts, {}))
+    assert groups == [[0, 2], [1]]
+
+
+def test_compound_parts_classified_once():
+    """_process_compound não reclassifica: só a parte cujo contexto mudou passa sem intenção."""
+    orchestrator = _orchestrator()
+    received = {}
+
+    async def _fake_classified(message, context, source, metadata, memory_task=None, intent=None):
+        received[message] = intent
+        return f"ok: {message}", ({'last_contact': 'Ana'} if 'Ana' in message else {})
+
+    orchestrator._process_one_classified = _fake_classified
+    parts = ["mande oi para Ana", "monitore a conversa", "pesquise o clima"]
+    results = asyncio.run(orchestrator._process_compound(parts, {}, 'cli', {}))
+
+    assert [r[0] for r in results] == [f"ok: {p}" for p in parts]
+    assert orchestrator.intent_classifier.calls == parts  # uma classificação por parte
+    assert received["mande oi para Ana"].entities == {'contact': 'Ana'}
+    assert received["pesquise o clima"].type == 'search'
+    assert received["monitore a conversa"] is None  # contexto ganhou last_contact: reclassifica
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: ConversationStore (histórico do JarvisAI por usuário/JID).
+
+Prova que:
+  1) Cada chave guarda só os seus turnos, limitados a max_turns.
+  2) Passando de max_users, sai a chave usada há mais tempo (LRU); get() conta como uso.
+  3) Com path, o histórico sobrevive a um novo processo (mesma ordem de LRU).
+  4) Dois processos no mesmo arquivo não apagam os turnos um do outro (relê e mescla).
+  5) Com loop rodando, append não grava no loop; flush() espera a gravação (sem .tmp sobrando).
+
+Uso:
+  python -m pytest -q tests/test_conversation_store.py
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.conversation_store import ConversationStore  # noqa: E402
+
+
+def test_turns_per_key_are_isolated_and_bounded():
+    """Turnos de A não aparecem em B; só os max_turns mais recentes ficam."""
+    store = ConversationStore(max_turns=2, max_users=10)
+    for i in range(3):
+        store.append('A', f"pergunta {i}", f"resposta {i}")
+    store.append('B', 'oi', 'olá')
+
+    assert [t['user'] for t in store.get('A')] == ['pergunta 1', 'pergunta 2']
+    assert [t['user'] for t in store.get('B')] == ['oi']
+    assert store.get('C') == []
+    assert store.stats()['turns'] == 3
+
+
+def test_lru_eviction():
+    """Terceiro contato com max_users=2 descarta o menos recente (get renova a chave)."""
+    store = ConversationStore(max_turns=5, max_users=2)
+    store.append('A', 'a', 'a')
+    store.append('B', 'b', 'b')
+    store.get('A')  # A passa a ser o mais recente
+    store.append('C', 'c', 'c')
+
+    assert store.get('B') == []
+    assert store.get('A') and store.get('C')
+    assert len(store) == 2
+    assert store.evicted == 1
+
+
+def test_persistence_round_trip():
+    """Novo ConversationStore no mesmo path recupera turnos e ordem de LRU."""
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = Path(tmpdir) / 'ai_conversations.json'
+        store = ConversationStore(max_turns=5, max_users=2, path=path)
+        store.append('A', 'a', 'a')
+        store.append('B', 'b', 'b')
+        store.append('A', 'a2', 'a2')  # B vira o menos recente
+
+        reloaded = ConversationStore(max_turns=5, max_users=2, path=path)
+        assert [t['user'] for t in reloaded.get('A')] == ['a', 'a2']
+        reloaded.append('C', 'c', 'c')
+        assert reloaded.get('B') == []
+        assert reloaded.stats()['persistent'] is True
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_concurrent_stores_merge_on_save():
+    """Duas instâncias no mesmo path (dois run_jarvis_message): arquivo fica com os turnos de ambas."""
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = Path(tmpdir) / 'ai_conversations.json'
+        first = ConversationStore(max_turns=5, max_users=10, path=path)
+        second = ConversationStore(max_turns=5, max_users=10, path=path)
+        first.append('A', 'a1', 'a1')
+        second.append('B', 'b1', 'b1')
+        second.append('A', 'a2', 'a2')  # second não conhecia a1
+        first.clear('C')  # limpar chave alheia não apaga o resto
+
+        reloaded = ConversationStore(max_turns=5, max_users=10, path=path)
+        assert [t['user'] for t in reloaded.get('A')] == ['a1', 'a2']
+        assert [t['user'] for t in reloaded.get('B')] == ['b1']
+        assert not path.with_suffix('.tmp').exists()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_async_save_and_flush():
+    """Dentro do loop a gravação vai para a thread; flush() garante o arquivo antes de sair."""
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = Path(tmpdir) / 'ai_conversations.json'
+        store = ConversationStore(max_turns=5, max_users=10, path=path)
+
+        async def _scenario():
+            for i in range(5):
+                store.append('A', f"p{i}", f"r{i}")
+            assert not path.exists()  # nada gravado de forma síncrona
+            await store.flush()
+
+        asyncio.run(_scenario())
+        data = json.loads(path.read_text(encoding='utf-8'))
+        assert [t['user'] for t in data['A']] == [f"p{i}" for i in range(5)]
+        assert not path.with_suffix('.tmp').exists()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: VectorStore e EmbeddingService.
+
+Prova que:
+  1) Vetores gravados por outra instância (outro processo) aparecem no próximo remap;
+     ids com \\x00 no fim sobrevivem à ida e volta.
+  2) Registro parcial no fim do arquivo é ignorado na leitura e cortado antes da próxima gravação.
+  3) Vetor com dimensão diferente da do armazenamento não é gravado.
+  4) Pedidos simultâneos vão num lote só, sem textos repetidos; texto já armazenado não vai ao backend.
+  5) Erro do backend chega a todos os chamadores do lote.
+
+O backend é falso (vetor derivado do tamanho do texto, sem rede).
+
+Uso:
+  python -m pytest -q tests/test_embeddings.py
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.embeddings import EmbeddingService, VectorStore, content_key  # noqa: E402
+
+
+class FakeBackend:
+    """embed() registra cada lote; vetor = [len(texto), 1, 0]"""
+
+    name = 'fake'
+    model = 'v1'
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches = []
+
+    async def embed(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("backend fora do ar")
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+
+def _key(n: int) -> bytes:
+    return bytes([n]) * 15 + b'\x00'  # termina em \x00 de propósito
+
+
+def _tmp_store():
+    tmpdir = Path(tempfile.mkdtemp())
+    return tmpdir, tmpdir / 'vectors.bin'
+
+
+def test_append_visible_to_other_instance_after_remap():
+    """B grava depois de A abrir; A enxerga o vetor de B ao gravar de novo (remap sob trava)."""
+    tmpdir, path = _tmp_store()
+    try:
+        a = VectorStore(path)
+        a.put_many([(_key(1), [1.0, 2.0])])
+        b = VectorStore(path)
+        assert np.allclose(b.get(_key(1)), [1.0, 2.0])
+        b.put_many([(_key(2), [3.0, 4.0])])
+        assert a.get(_key(2)) is None  # ainda não remapeou
+        a.put_many([(_key(3), [5.0, 6.0]), (_key(2), [9.0, 9.0])])
+        assert np.allclose(a.get(_key(2)), [3.0, 4.0])  # não duplicou nem sobrescreveu
+        assert len(a) == 3
+        assert path.stat().st_size == 3 * a._dtype().itemsize
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_partial_record_ignored_then_truncated():
+    """Bytes soltos no fim (escrita interrompida) não desalinham os registros."""
+    tmpdir, path = _tmp_store()
+    try:
+        store = VectorStore(path)
+        store.put_many([(_key(1), [1.0, 2.0])])
+        with open(path, 'ab') as f:
+            f.write(b'\x01\x02\x03\x04\x05')
+
+        reopened = VectorStore(path)
+        assert len(reopened) == 1
+        reopened.put_many([(_key(2), [3.0, 4.0])])
+        assert path.stat().st_size == 2 * reopened._dtype().itemsize
+
+        fresh = VectorStore(path)
+        assert np.allclose(fresh.get(_key(1)), [1.0, 2.0])
+        assert np.allclose(fresh.get(_key(2)), [3.0, 4.0])
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_dimension_mismatch_not_stored():
+    """Armazenamento criado com dimensão 2 recusa vetor de dimensão 3."""
+    tmpdir, path = _tmp_store()
+    try:
+        store = VectorStore(path)
+        store.put_many([(_key(1), [1.0, 2.0])])
+        store.put_many([(_key(2), [1.0, 2.0, 3.0])])
+        assert store.get(_key(2)) is None
+        assert len(store) == 1
+        assert VectorStore(path).dim == 2
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_batching_dedup_and_store_hits():
+    """Quatro chamadas simultâneas (com repetição) = um lote; depois tudo vem do armazenamento."""
+    tmpdir, path = _tmp_store()
+    try:
+        backend = FakeBackend()
+        service = EmbeddingService(backend, store=VectorStore(path), batch_window=0.01)
+
+        async def _scenario():
+            first = await asyncio.gather(
+                service.embed('bom dia'),
+                service.embed('boa noite'),
+                service.embed('bom dia'),
+                service.embed_many(['boa noite', '', 'olá']),
+            )
+            await asyncio.gather(*service._flushes)  # gravação no armazenamento
+            second = await service.embed_many(['bom dia', 'olá'])
+            return first, second
+
+        first, second = asyncio.run(_scenario())
+        assert backend.batches == [['bom dia', 'boa noite', 'olá']]
+        assert np.allclose(first[0], [7.0, 1.0, 0.0]) and np.allclose(first[2], first[0])
+        assert first[3][1] is None  # texto vazio
+        assert np.allclose(second[1], [3.0, 1.0, 0.0])
+        assert len(backend.batches) == 1
+        assert service.stats()['stored'] == 3
+        assert len(service.store) == 3 and service.store.get(content_key(service.model, 'olá')) is not None
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_backend_error_reaches_whole_batch():
+    """Falha do backend: embed() devolve None para todos do lote e nada fica pendente."""
+    service = EmbeddingService(FakeBackend(fail=True), store=None, batch_window=0.01)
+
+    async def _scenario():
+        return await asyncio.gather(service.embed('a'), service.embed('b'))
+
+    assert asyncio.run(_scenario()) == [None, None]
+    assert service._pending == {}
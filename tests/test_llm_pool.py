@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: singleflight do LLMClientPool.
+
+Prova que:
+  1) Chamadas idênticas simultâneas viram uma requisição e recebem a mesma resposta.
+  2) Cancelar um dos chamadores não derruba a requisição dos outros.
+  3) stream=True e coalesce=False (hedge) nunca são coalescidos.
+  4) Por padrão só temperatura 0 é coalescida (amostras independentes continuam independentes).
+
+Usa um cliente falso com a forma do AsyncOpenAI (client.chat.completions.create).
+
+Uso:
+  python -m pytest -q tests/test_llm_pool.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.llm_pool import LLMClientPool  # noqa: E402
+
+MESSAGES = [{'role': 'user', 'content': 'qual a capital da França?'}]
+
+
+class FakeClient:
+    """chat.completions.create conta as requisições e demora `delay` segundos"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(id=f"resp-{self.requests}", kwargs=kwargs)
+
+
+def _pool() -> LLMClientPool:
+    return LLMClientPool(max_concurrency=4, per_caller=4)
+
+
+def test_identical_calls_coalesce():
+    """Três chamadas iguais ao mesmo tempo: uma requisição, mesma resposta."""
+    pool, client = _pool(), FakeClient()
+
+    async def _scenario():
+        return await asyncio.gather(*(
+            pool.create_chat('ai', client, model='m', messages=MESSAGES, temperature=0)
+            for _ in range(3)
+        ))
+
+    responses = asyncio.run(_scenario())
+    assert client.requests == 1
+    assert all(r is responses[0] for r in responses)
+    assert pool.coalesced == 2
+    assert pool.stats()['in_flight'] == 0
+
+
+def test_different_calls_not_coalesced():
+    """Mensagens diferentes são requisições diferentes."""
+    pool, client = _pool(), FakeClient()
+
+    async def _scenario():
+        await asyncio.gather(
+            pool.create_chat('ai', client, model='m', messages=MESSAGES, temperature=0),
+            pool.create_chat('ai', client, model='m', messages=[{'role': 'user', 'content': 'outra'}], temperature=0),
+        )
+
+    asyncio.run(_scenario())
+    assert client.requests == 2
+    assert pool.coalesced == 0
+
+
+def test_cancelled_caller_keeps_shared_flight():
+    """Um chamador desiste; o outro ainda recebe a resposta da mesma requisição."""
+    pool, client = _pool(), FakeClient(delay=0.1)
+
+    async def _scenario():
+        first = asyncio.ensure_future(pool.create_chat('ai', client, model='m', messages=MESSAGES, temperature=0))
+        second = asyncio.ensure_future(pool.create_chat('ai', client, model='m', messages=MESSAGES, temperature=0))
+        await asyncio.sleep(0.02)
+        first.cancel()
+        result = await second
+        await asyncio.gather(first, return_exceptions=True)
+        return first, result
+
+    first, result = asyncio.run(_scenario())
+    assert first.cancelled()
+    assert result.id == 'resp-1'
+    assert client.requests == 1
+
+
+def test_stream_and_hedge_bypass_singleflight():
+    """stream=True e coalesce=False vão direto ao provedor (cancelamento aborta a requisição)."""
+    pool, client = _pool(), FakeClient()
+
+    async def _scenario():
+        await asyncio.gather(*(
+            pool.create_chat('ai', client, model='m', messages=MESSAGES, temperature=0, stream=True)
+            for _ in range(2)
+        ))
+        await asyncio.gather(*(
+            pool.create_chat('ai', client, coalesce=False, model='m', messages=MESSAGES, temperature=0)
+            for _ in range(2)
+        ))
+
+    asyncio.run(_scenario())
+    assert client.requests == 4
+    assert pool.coalesced == 0
+
+
+def test_sampled_calls_not_coalesced_by_default():
+    """temperature=0.7 (ou ausente) não compartilha resposta com o limite padrão."""
+    pool, client = _pool(), FakeClient()
+
+    async def _scenario():
+        await asyncio.gather(*(
+            pool.create_chat('ai', client, model='m', messages=MESSAGES, temperature=0.7)
+            for _ in range(2)
+        ))
+        await asyncio.gather(*(
+            pool.create_chat('ai', client, model='m', messages=MESSAGES)
+            for _ in range(2)
+        ))
+
+    asyncio.run(_scenario())
+    assert client.requests == 4
+    assert pool.coalesced == 0
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: LLMRouter (latência EWMA, failover e hedge).
+
+Prova que:
+  1) rank() prefere o destino de menor latência EWMA e muda de ideia quando o EWMA muda.
+  2) Destino com erro cai para o próximo na mesma chamada e, acima do limiar, entra em cooldown.
+  3) Hedge: primário lento dispara o backup; o perdedor cancelado é registrado como censurado
+     (nem sucesso nem erro) e sua latência só sobe.
+
+Usa clientes falsos com a forma do AsyncOpenAI (client.chat.completions.create).
+
+Uso:
+  python -m pytest -q tests/test_llm_router.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.llm_pool import LLMClientPool  # noqa: E402
+from core.llm_router import LLMRouter, ProviderTarget  # noqa: E402
+
+MESSAGES = [{'role': 'user', 'content': 'oi'}]
+
+
+class FakeClient:
+    """Responde depois de `delay` segundos (ou levanta erro se fail=True)"""
+
+    def __init__(self, label: str, delay: float = 0.0, fail: bool = False):
+        self.label = label
+        self.delay = delay
+        self.fail = fail
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.label} fora do ar")
+        return SimpleNamespace(id=self.label, model=kwargs.get('model'))
+
+
+def _router(*targets: ProviderTarget, **kwargs) -> LLMRouter:
+    return LLMRouter(list(targets), pool=LLMClientPool(max_concurrency=8, per_caller=8), **kwargs)
+
+
+def test_rank_follows_ewma_latency():
+    """Mais rápido primeiro; medições novas deslocam o EWMA e a escolha."""
+    fast = ProviderTarget('a', 'm', client=FakeClient('a'))
+    slow = ProviderTarget('b', 'm', client=FakeClient('b'))
+    router = _router(fast, slow, alpha=0.5)
+    router.record(fast, 0.2, ok=True)
+    router.record(slow, 0.1, ok=True)
+    assert router.pick() is slow
+
+    router.record(fast, 0.01, ok=True)  # 0.5*0.2 + 0.5*0.01 = 0.105
+    router.record(fast, 0.01, ok=True)  # 0.0575
+    assert abs(fast.ewma_latency - 0.0575) < 1e-9
+    assert [t.name for t in router.rank()] == ['a:m', 'b:m']
+
+
+def test_failover_and_cooldown():
+    """Primeiro destino falha: resposta vem do segundo e o primeiro vai para o fim (cooldown)."""
+    broken = ProviderTarget('a', 'm', client=FakeClient('a', fail=True))
+    backup = ProviderTarget('b', 'm', client=FakeClient('b'))
+    router = _router(broken, backup, alpha=0.5, error_threshold=0.4)
+    router.record(broken, 0.01, ok=True)
+    router.record(backup, 0.05, ok=True)
+
+    response, used = asyncio.run(router.chat('ai', model='x', messages=MESSAGES, temperature=0))
+    assert used is backup and response.id == 'b'
+    assert response.model == 'm'  # modelo do destino, não o pedido
+    assert broken.errors == 1 and broken.ewma_error == 0.5
+    assert [t.name for t in router.rank()] == ['b:m', 'a:m']
+
+
+def test_hedge_loser_recorded_as_censored():
+    """Backup ganha o hedge; primário cancelado conta como censurado, sem erro nem chamada."""
+    primary = ProviderTarget('a', 'm', client=FakeClient('a', delay=0.5))
+    backup = ProviderTarget('b', 'm', client=FakeClient('b', delay=0.01))
+    router = _router(primary, backup, hedge_delay=0.05)
+    router.record(primary, 0.02, ok=True)
+    router.record(backup, 0.03, ok=True)
+
+    async def _scenario():
+        result = await router.chat('ai', hedge=True, model='x', messages=MESSAGES, temperature=0)
+        await asyncio.sleep(0.02)  # perdedor processa o cancelamento
+        return result
+
+    response, used = asyncio.run(_scenario())
+    assert used is backup and response.id == 'b'
+    assert backup.hedges_won == 1
+    assert primary.censored == 1
+    assert primary.calls == 1 and primary.errors == 0  # só o record() inicial
+    assert primary.ewma_latency > 0.02  # pelo menos o tempo que ficou esperando
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: LLMScheduler (fila global de chamadas à IA).
+
+Prova que:
+  1) Com a vaga ocupada, a fila atende interactive > autopilot > background.
+  2) Dentro da classe, chaves (JIDs) são atendidas em round-robin.
+  3) Quem espera mais que `aging` passa na frente de classes maiores (sem inanição).
+  4) Cancelar quem está na fila não consome vaga.
+
+Uso:
+  python -m pytest -q tests/test_llm_scheduler.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.llm_scheduler import (  # noqa: E402
+    LLMScheduler,
+    PRIORITY_AUTOPILOT,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+)
+
+
+async def _use_slot(scheduler: LLMScheduler, order: list, label: str, priority: str, key: str):
+    async with scheduler.acquire(label, priority, key):
+        order.append(label)
+
+
+async def _run_queued(scheduler: LLMScheduler, requests, pause: float = 0.0) -> list:
+    """Ocupa a única vaga, enfileira os pedidos na ordem dada e devolve a ordem de atendimento"""
+    order: list = []
+    release = asyncio.Event()
+
+    async def _holder():
+        async with scheduler.acquire('holder'):
+            await release.wait()
+
+    holder = asyncio.ensure_future(_holder())
+    await asyncio.sleep(0)
+    tasks = []
+    for label, priority, key in requests:
+        tasks.append(asyncio.ensure_future(_use_slot(scheduler, order, label, priority, key)))
+        await asyncio.sleep(0)
+    if pause:
+        await asyncio.sleep(pause)
+    release.set()
+    await asyncio.gather(holder, *tasks)
+    return order
+
+
+def test_priority_order():
+    """Vaga liberada vai para a maior classe, não para quem chegou primeiro."""
+    scheduler = LLMScheduler(max_concurrency=1, per_caller=10, aging=60)
+    order = asyncio.run(_run_queued(scheduler, [
+        ('background', PRIORITY_BACKGROUND, 'k'),
+        ('autopilot', PRIORITY_AUTOPILOT, 'k'),
+        ('interactive', PRIORITY_INTERACTIVE, 'k'),
+    ]))
+    assert order == ['interactive', 'autopilot', 'background']
+    assert scheduler.running == 0 and scheduler.queued() == 0
+
+
+def test_round_robin_by_key():
+    """Contato falante (A) não segura o outro (B) na mesma classe."""
+    scheduler = LLMScheduler(max_concurrency=1, per_caller=10, aging=60)
+    order = asyncio.run(_run_queued(scheduler, [
+        ('a1', PRIORITY_AUTOPILOT, 'A'),
+        ('a2', PRIORITY_AUTOPILOT, 'A'),
+        ('a3', PRIORITY_AUTOPILOT, 'A'),
+        ('b1', PRIORITY_AUTOPILOT, 'B'),
+    ]))
+    assert order == ['a1', 'b1', 'a2', 'a3']
+
+
+def test_aging_prevents_starvation():
+    """Background que esperou mais que aging é atendido antes de interactive recente."""
+    scheduler = LLMScheduler(max_concurrency=1, per_caller=10, aging=0.05)
+
+    async def _scenario():
+        order: list = []
+        release = asyncio.Event()
+
+        async def _holder():
+            async with scheduler.acquire('holder'):
+                await release.wait()
+
+        holder = asyncio.ensure_future(_holder())
+        await asyncio.sleep(0)
+        old = asyncio.ensure_future(_use_slot(scheduler, order, 'background', PRIORITY_BACKGROUND, 'k'))
+        await asyncio.sleep(0.1)
+        new = asyncio.ensure_future(_use_slot(scheduler, order, 'interactive', PRIORITY_INTERACTIVE, 'k'))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, old, new)
+        return order
+
+    assert asyncio.run(_scenario()) == ['background', 'interactive']
+    stats = scheduler.stats()['classes']
+    assert stats[PRIORITY_BACKGROUND]['granted'] == 1
+    assert stats[PRIORITY_BACKGROUND]['max_wait_ms'] >= 50
+
+
+def test_cancelled_waiter_releases_queue():
+    """Pedido cancelado na fila sai dela e não fica com vaga."""
+    scheduler = LLMScheduler(max_concurrency=1, per_caller=10, aging=60)
+
+    async def _scenario():
+        order: list = []
+        release = asyncio.Event()
+
+        async def _holder():
+            async with scheduler.acquire('holder'):
+                await release.wait()
+
+        holder = asyncio.ensure_future(_holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(_use_slot(scheduler, order, 'gone', PRIORITY_INTERACTIVE, 'k'))
+        await asyncio.sleep(0)
+        assert scheduler.queued() == 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        assert scheduler.queued() == 0
+        release.set()
+        await holder
+        await _use_slot(scheduler, order, 'next', PRIORITY_BACKGROUND, 'k')
+        return order
+
+    assert asyncio.run(_scenario()) == ['next']
+    assert scheduler.running == 0
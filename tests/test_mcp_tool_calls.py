@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: execute_tool_calls do JarvisMCPClient.
+
+Prova que:
+  1) Ferramenta com side_effects que passa do timeout não é cancelada: segue rodando até o fim
+     e a IA recebe "resultado desconhecido, não repita".
+  2) Ferramenta sem side_effects é cancelada no timeout.
+  3) Ferramentas com side_effects rodam uma por vez, na ordem pedida; as demais em paralelo;
+     as respostas saem na ordem das chamadas.
+
+As ferramentas são falsas (registradas direto em all_tools, sem subir servers).
+
+Uso:
+  python -m pytest -q tests/test_mcp_tool_calls.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.mcp_client import JarvisMCPClient  # noqa: E402
+from mcp_servers.base import Tool  # noqa: E402
+
+
+def _client(**tools) -> JarvisMCPClient:
+    """tools: nome -> (handler, side_effects, timeout)"""
+    client = JarvisMCPClient()
+    for name, (handler, side_effects, timeout) in tools.items():
+        client.all_tools[name] = {
+            'server': 'fake',
+            'tool': Tool(name=name, description=name, side_effects=side_effects, timeout=timeout),
+            'handler': handler,
+        }
+    return client
+
+
+def test_side_effect_timeout_keeps_running():
+    """Envio lento: resposta de incerteza no prazo e o envio termina depois, uma vez só."""
+    sent = []
+
+    async def send(text):
+        await asyncio.sleep(0.15)
+        sent.append(text)
+        return "enviado"
+
+    client = _client(send=(send, True, 0.03))
+
+    async def _scenario():
+        result = await client.execute_tool_calls([('c1', 'send', {'text': 'oi'})])
+        running = len(client._detached_calls)
+        await asyncio.sleep(0.2)
+        return result, running
+
+    result, running = asyncio.run(_scenario())
+    assert result[0]['tool_call_id'] == 'c1' and result[0]['role'] == 'tool'
+    assert "resultado desconhecido" in result[0]['content'] and "NÃO repita" in result[0]['content']
+    assert running == 1
+    assert sent == ['oi']  # concluiu depois do timeout
+    assert client._detached_calls == set()
+
+
+def test_read_only_timeout_is_cancelled():
+    """Leitura lenta é cancelada e a IA recebe tempo esgotado."""
+    finished = []
+
+    async def read():
+        await asyncio.sleep(0.15)
+        finished.append(True)
+        return "dados"
+
+    client = _client(read=(read, False, 0.03))
+
+    async def _scenario():
+        result = await client.execute_tool_calls([('c1', 'read', {})])
+        await asyncio.sleep(0.2)
+        return result
+
+    result = asyncio.run(_scenario())
+    assert "Tempo esgotado" in result[0]['content']
+    assert finished == []
+    assert client._detached_calls == set()
+
+
+def test_side_effects_serial_reads_parallel():
+    """Duas escritas não se sobrepõem e seguem a ordem; leituras rodam juntas."""
+    events = []
+
+    def _tool(label):
+        async def handler():
+            events.append(f"{label}:start")
+            await asyncio.sleep(0.03)
+            events.append(f"{label}:end")
+            return label
+        return handler
+
+    client = _client(
+        w1=(_tool('w1'), True, None),
+        w2=(_tool('w2'), True, None),
+        r1=(_tool('r1'), False, None),
+        r2=(_tool('r2'), False, None),
+    )
+    calls = [('a', 'w1', {}), ('b', 'r1', {}), ('c', 'w2', {}), ('d', 'r2', {})]
+    result = asyncio.run(client.execute_tool_calls(calls))
+
+    assert [r['tool_call_id'] for r in result] == ['a', 'b', 'c', 'd']
+    assert [r['content'] for r in result] == ['w1', 'r1', 'w2', 'r2']
+    assert events.index('w1:end') < events.index('w2:start')
+    assert events.index('r2:start') < events.index('r1:end')  # leituras em paralelo
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: ProactiveEngine (prazos/sinais publicados pelos módulos).
+
+Prova que:
+  1) Lembrete criado publica o prazo; o motor acorda nele e despacha a ação.
+  2) Sem prazo nem sinal o motor não chama ninguém; announce_ready acorda na hora.
+  3) Módulos vencidos são verificados em paralelo; o lento estoura o timeout sem segurar os outros.
+
+Uso:
+  python -m pytest -q tests/test_proactive_engine.py
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.proactive_engine import ProactiveEngine, announce_ready  # noqa: E402
+from modules.calendar.reminder_scheduler import ReminderScheduler  # noqa: E402
+
+
+class CountingModule:
+    """check_proactive conta as chamadas e devolve `actions` depois de `delay` segundos"""
+
+    def __init__(self, actions=None, delay: float = 0.0):
+        self.actions = actions or []
+        self.delay = delay
+        self.calls = 0
+
+    async def check_proactive(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return list(self.actions)
+
+
+class ReminderModule:
+    """Casca mínima do CalendarModule: lembretes vencidos viram ações"""
+
+    def __init__(self):
+        self.reminder_scheduler = ReminderScheduler('calendar')
+
+    async def check_proactive(self):
+        due = await self.reminder_scheduler.check_reminders()
+        return [{'type': 'reminder', 'message': r.message, 'reminder_id': r.id} for r in due]
+
+
+async def _run_engine(modules, scenario, check_timeout: float = 1.0):
+    dispatched = []
+
+    async def _dispatch(action):
+        dispatched.append(action)
+
+    engine = ProactiveEngine(modules, dispatch=_dispatch, check_timeout=check_timeout)
+    await engine.start()
+    try:
+        await scenario(engine)
+    finally:
+        await engine.stop()
+    return dispatched
+
+
+def test_reminder_deadline_wakes_engine():
+    """Lembrete para daqui a 0,1s é despachado sem polling."""
+    module = ReminderModule()
+
+    async def _scenario(engine):
+        await module.reminder_scheduler.start()
+        await asyncio.sleep(0.02)
+        await module.reminder_scheduler.create_reminder('beber água', datetime.now() + timedelta(seconds=0.1))
+        assert engine.next_deadline() is not None
+        await asyncio.sleep(0.3)
+        await module.reminder_scheduler.stop()
+
+    dispatched = asyncio.run(_run_engine({'calendar': module}, _scenario))
+    assert [a['message'] for a in dispatched] == ['beber água']
+
+
+def test_idle_without_deadline_until_ready():
+    """Depois da verificação de partida, só announce_ready faz o motor chamar o módulo."""
+    module = CountingModule(actions=[{'type': 'suggestion', 'message': 'oi'}])
+
+    async def _scenario(engine):
+        await asyncio.sleep(0.05)
+        assert module.calls == 1  # verificação de partida
+        await asyncio.sleep(0.2)
+        assert module.calls == 1 and engine.next_deadline() is None
+        await announce_ready('idle')
+        await asyncio.sleep(0.05)
+        assert module.calls == 2
+
+    dispatched = asyncio.run(_run_engine({'idle': module}, _scenario))
+    assert len(dispatched) == 2
+
+
+def test_checks_run_concurrently_with_timeout():
+    """Módulo lento estoura o timeout; as ações do rápido saem todas no mesmo ciclo."""
+    slow = CountingModule(actions=[{'message': 'lento'}], delay=1.0)
+    fast = CountingModule(actions=[{'message': 'a'}, {'message': 'b'}], delay=0.05)
+
+    async def _scenario(engine):
+        started = time.monotonic()
+        actions = await engine.check_modules(['fast', 'slow'])
+        assert [a['message'] for a in actions] == ['a', 'b']
+        assert time.monotonic() - started < 0.5
+
+    asyncio.run(_run_engine({'slow': slow, 'fast': fast}, _scenario, check_timeout=0.2))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: PromptCache (cache exato de chamadas determinísticas).
+
+Prova que:
+  1) A chave não depende da ordem das chaves dos dicts, mas muda com modelo, mensagens,
+     temperatura, ferramentas e extras (max_tokens).
+  2) Entrada vale até o TTL; depois conta como miss e sai do banco.
+  3) Passando de max_entries, sai a entrada usada há mais tempo (get renova).
+  4) JarvisAI.complete só usa o cache com temperature=0 (amostras não são fixadas).
+
+Uso:
+  python -m pytest -q tests/test_prompt_cache.py
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import core.prompt_cache as prompt_cache_module  # noqa: E402
+from core.prompt_cache import PromptCache, prompt_cache_key  # noqa: E402
+
+MESSAGES = [{'role': 'user', 'content': 'Traduza: bom dia'}]
+
+
+def test_key_is_stable_and_covers_request():
+    """Mesma requisição -> mesma chave; qualquer campo diferente -> outra chave."""
+    base = prompt_cache_key('m', MESSAGES, 0, max_tokens=100)
+    reordered = prompt_cache_key('m', [{'content': 'Traduza: bom dia', 'role': 'user'}], 0, max_tokens=100)
+    assert base == reordered
+    variants = [
+        prompt_cache_key('outro', MESSAGES, 0, max_tokens=100),
+        prompt_cache_key('m', [{'role': 'user', 'content': 'Traduza: boa noite'}], 0, max_tokens=100),
+        prompt_cache_key('m', MESSAGES, 0.7, max_tokens=100),
+        prompt_cache_key('m', MESSAGES, 0, tools=[{'type': 'function', 'function': {'name': 'x'}}], max_tokens=100),
+        prompt_cache_key('m', MESSAGES, 0, max_tokens=200),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_ttl_expiry():
+    """Hit antes do TTL; depois dele, miss e entrada removida."""
+    tmpdir = tempfile.mkdtemp()
+    cache = PromptCache(path=Path(tmpdir) / 'prompt_cache.db')
+    try:
+        cache.set('k', 'valor', ttl=0.1)
+        assert cache.get('k') == 'valor'
+        time.sleep(0.15)
+        assert cache.get('k') is None
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 0}
+    finally:
+        cache.close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_size_bound_evicts_least_recently_used():
+    """max_entries=2: a terceira gravação remove a entrada acessada há mais tempo."""
+    tmpdir = tempfile.mkdtemp()
+    cache = PromptCache(path=Path(tmpdir) / 'prompt_cache.db', max_entries=2)
+    try:
+        cache.set('a', 'A', ttl=60)
+        time.sleep(0.01)
+        cache.set('b', 'B', ttl=60)
+        time.sleep(0.01)
+        assert cache.get('a') == 'A'  # a passa a ser o mais recente
+        time.sleep(0.01)
+        cache.set('c', 'C', ttl=60)
+        assert cache.get('b') is None
+        assert cache.get('a') == 'A' and cache.get('c') == 'C'
+    finally:
+        cache.close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def test_complete_caches_only_deterministic_calls():
+    """complete(temperature=0) repetido vai uma vez à API; temperature=0.7 vai sempre."""
+    tmpdir = tempfile.mkdtemp()
+    saved_env, saved_cache = dict(os.environ), prompt_cache_module._prompt_cache
+    prompt_cache_module._prompt_cache = PromptCache(path=Path(tmpdir) / 'prompt_cache.db')
+    try:
+        os.environ.setdefault('OPENAI_API_KEY', 'test')
+        os.environ['EMBEDDING_STORE'] = '0'
+        from core.ai_engine import JarvisAI
+        ai = JarvisAI()
+        calls = []
+
+        async def _fake_completion(messages, **kwargs):
+            calls.append(kwargs.get('temperature'))
+            message = SimpleNamespace(content=f"Texto {len(calls)}", tool_calls=None)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+        ai._chat_completion = _fake_completion
+
+        async def _scenario():
+            deterministic = [await ai.complete(MESSAGES, temperature=0, cache_ttl=60) for _ in range(2)]
+            sampled = [await ai.complete(MESSAGES, temperature=0.7, cache_ttl=60) for _ in range(2)]
+            return deterministic, sampled
+
+        deterministic, sampled = asyncio.run(_scenario())
+        assert deterministic == ['Texto 1', 'Texto 1']
+        assert sampled == ['Texto 2', 'Texto 3']
+        assert calls == [0, 0.7, 0.7]
+    finally:
+        prompt_cache_module._prompt_cache.close()
+        prompt_cache_module._prompt_cache = saved_cache
+        os.environ.clear()
+        os.environ.update(saved_env)
+        shutil.rmtree(tmpdir, ignore_errors=True)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: TaskScheduler (min-heap de tarefas proativas).
+
+Prova que:
+  1) pop_due devolve só as vencidas, em ordem de prazo (empate: ordem de agendamento).
+  2) Cancelada fica no heap até chegar ao topo (remoção preguiçosa): não sai em pop_due
+     nem conta em next_deadline; tarefa já executada não pode ser cancelada.
+  3) run() dorme até o prazo e schedule() de uma tarefa mais cedo acorda o loop.
+
+Uso:
+  python -m pytest -q tests/test_scheduler.py
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.scheduler import TaskScheduler  # noqa: E402
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def test_pop_due_in_deadline_order():
+    """Agendadas fora de ordem saem por prazo; empate mantém a ordem de agendamento."""
+    scheduler = TaskScheduler()
+    scheduler.schedule(NOW + timedelta(minutes=3), 'c')
+    scheduler.schedule(NOW + timedelta(minutes=1), 'a1')
+    scheduler.schedule(NOW + timedelta(minutes=10), 'futura')
+    scheduler.schedule(NOW + timedelta(minutes=1), 'a2')
+    scheduler.schedule(NOW + timedelta(minutes=2), 'b')
+
+    due = scheduler.pop_due(NOW + timedelta(minutes=5))
+    assert [t.message for t in due] == ['a1', 'a2', 'b', 'c']
+    assert all(t.executed for t in due)
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == NOW + timedelta(minutes=10)
+
+
+def test_lazy_cancel():
+    """Cancelar não mexe no heap; a tarefa é descartada quando chega ao topo."""
+    scheduler = TaskScheduler()
+    first = scheduler.schedule(NOW + timedelta(minutes=1), 'primeira')
+    second = scheduler.schedule(NOW + timedelta(minutes=2), 'segunda')
+
+    assert scheduler.cancel(first.task_id) is True
+    assert len(scheduler._heap) == 2  # ainda no heap
+    assert scheduler.next_deadline() == second.time  # topo cancelado é descartado aqui
+    assert len(scheduler._heap) == 1
+    assert scheduler.cancel(first.task_id) is False  # id já removido
+
+    third = scheduler.schedule(NOW + timedelta(minutes=3), 'terceira')
+    third.cancel()  # cancelamento pelo handle
+    due = scheduler.pop_due(NOW + timedelta(minutes=5))
+    assert [t.message for t in due] == ['segunda']
+    assert second.cancel() is False  # já executada
+    assert scheduler._heap == []
+
+
+def test_run_wakes_for_earlier_task():
+    """Loop dormindo até uma tarefa distante acorda para a que foi agendada antes dela."""
+    fired = []
+
+    async def _on_due(task):
+        fired.append(task.message)
+
+    scheduler = TaskScheduler(on_due=_on_due)
+
+    async def _scenario():
+        scheduler.start()
+        scheduler.schedule(datetime.now() + timedelta(hours=1), 'distante')
+        await asyncio.sleep(0.02)
+        scheduler.schedule(datetime.now() + timedelta(seconds=0.05), 'próxima')
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+    asyncio.run(_scenario())
+    assert fired == ['próxima']
+    assert scheduler.next_deadline() is not None  # a distante continua agendada
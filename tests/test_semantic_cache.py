@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste automatizado: cache semântico do JarvisAI.
+
+Prova que:
+  1) A mesma pergunta de dois contatos diferentes (JIDs com histórico próprio) é servida do cache.
+  2) Follow-up ("e a segunda maior cidade dela?") nem busca nem grava no cache.
+
+A chamada à IA é substituída por uma resposta fixa (sem rede); embeddings por um vetor de letras.
+
+Uso:
+  python -m pytest -q tests/test_semantic_cache.py
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from core.semantic_cache import SemanticCache  # noqa: E402
+
+QUESTION = "qual é a capital da frança?"
+
+
+async def _letters(text: str):
+    """Embedding de teste: frequência de letras (textos iguais -> vetores iguais)"""
+    vec = [0.0] * 26
+    for ch in text.lower():
+        if 'a' <= ch <= 'z':
+            vec[ord(ch) - ord('a')] += 1.0
+    return vec
+
+
+def _engine(cache_dir: Path):
+    saved = dict(os.environ)
+    os.environ.setdefault('OPENAI_API_KEY', 'test')
+    os.environ['EMBEDDING_STORE'] = '0'
+    try:
+        from core.ai_engine import JarvisAI
+        ai = JarvisAI()
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+    ai.semantic_cache = SemanticCache(embed=_letters, cache_dir=cache_dir)
+    calls = []
+
+    async def _fake_completion(messages, **kwargs):
+        calls.append(messages)
+        message = SimpleNamespace(content=f"Resposta {len(calls)}", tool_calls=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    ai._chat_completion = _fake_completion
+    return ai, calls
+
+
+def test_hit_across_users_and_follow_up_bypass():
+    """Contato B recebe a resposta cacheada de A; follow-up sempre vai à IA."""
+    tmpdir = Path(tempfile.mkdtemp())
+    try:
+        ai, calls = _engine(tmpdir)
+
+        async def _scenario():
+            meta_a = {'source': 'whatsapp', 'jid': 'a@s.whatsapp.net'}
+            meta_b = {'source': 'whatsapp', 'jid': 'b@s.whatsapp.net'}
+            await ai.process("me conta uma curiosidade sobre gatos", metadata=meta_b)  # B já tem histórico
+            first = await ai.process(QUESTION, metadata=meta_a)
+            second = await ai.process(QUESTION, metadata=meta_b)
+            lookups = ai.semantic_cache.hits + ai.semantic_cache.misses
+            follow_up = await ai.process("e a segunda maior cidade dela?", metadata=meta_a)
+            return first, second, follow_up, lookups
+
+        first, second, follow_up, lookups = asyncio.run(_scenario())
+        assert not first.cached
+        assert second.cached and second.text == first.text
+        assert len(calls) == 3  # curiosidade, pergunta de A, follow-up
+        assert not follow_up.cached
+        assert ai.semantic_cache.hits + ai.semantic_cache.misses == lookups  # follow-up não consultou
+        assert SemanticCache.depends_on_conversation("e a segunda maior cidade dela?")
+        assert not SemanticCache.depends_on_conversation(QUESTION)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)